@@ -1,22 +1,19 @@
 import logging
-from urllib.parse import urlparse
-import aiohttp
-import pytz
+from html import escape
 from aiogram import Router, F, Bot
 from aiogram.filters import Command
-from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, BufferedInputFile
+from aiogram.types import Message, CallbackQuery
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
-from aiohttp import ClientError, ClientConnectionError, ServerTimeoutError
-import socket
+from aiohttp import ClientError, ClientConnectionError, ClientResponseError, ServerTimeoutError
+from admin.keyboards.admin_inline import export_formats_keyboard
 from admin.keyboards.admin_reply import admin_keyboard
-import pandas as pd
-from io import BytesIO
-from datetime import datetime as dt
+from admin.services.export_jobs import EXPORTS, export_jobs
 from client.keyboards.reply import main_kb
-from data.url import url_users
+from client.services.user import get_users_page, get_users_stats
 from data.config import config_settings
 from utils.filters import ChatTypeFilter, IsGroupAdmin, ADMIN_CHAT_ID
+from utils.export import available_formats
+from utils.health import health_monitor
 
 logger = logging.getLogger(__name__)
 
@@ -28,139 +25,6 @@ admin_router.message.filter(
 )
 
 
-async def generate_excel_report():
-    """Генерирует отчёт в формате Excel с данными пользователей.
-
-    Returns:
-        BytesIO: Объект с Excel-файлом или None, если данные отсутствуют.
-
-    Raises:
-        Exception: Если произошла ошибка при запросе API или создании файла.
-    """
-    if not config_settings.BOT_API_KEY:
-        logger.error("BOT_API_KEY не установлен")
-        return None
-
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-        # Получаем всех пользователей
-        try:
-            async with session.get(
-                url_users,
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    logger.error(f"Ошибка при получении пользователей: {resp.status}, {error_text}")
-                    return None
-                users = await resp.json()
-                logger.info(f"Получено {len(users)} пользователей")
-        except Exception as e:
-            logger.exception(f"Ошибка запроса пользователей: {e}")
-            return None
-
-    if not users:
-        logger.info("Нет данных пользователей для отчета")
-        return None
-
-    # Создаем DataFrame
-    df = pd.DataFrame(users)
-
-    # Исключаем ненужные столбцы
-    columns_to_drop = ['id', 'password', 'groups', 'user_permissions']
-    df = df.drop(columns=columns_to_drop, errors='ignore')
-
-    # Применяем преобразования к полям
-    bool_columns = ['is_bot', 'is_staff', 'is_active', 'is_superuser']
-    for col in bool_columns:
-        if col in df.columns:
-            df[col] = df[col].apply(lambda x: 'Да' if x else 'Нет')
-
-    datetime_columns = ['date_joined', 'last_activity']
-    for col in datetime_columns:
-        if col in df.columns:
-            df[col] = df[col].apply(
-                lambda x: x[:19].replace('T', ' ') if isinstance(x, str) else None
-            )
-
-    # Форматируем birth_date
-    if 'birth_date' in df.columns:
-        df['birth_date'] = df['birth_date'].apply(
-            lambda x: x if isinstance(x, str) and x else None
-        )
-
-    # Переименовываем колонки для красивого отображения
-    column_mapping = {
-        'tg_id': 'TG ID',
-        'username': 'Никнейм',
-        'first_name': 'Имя (Telegram)',
-        'last_name': 'Фамилия (Telegram)',
-        'user_first_name': 'Имя (карта)',
-        'user_last_name': 'Фамилия (карта)',
-        'birth_date': 'Дата рождения',
-        'email': 'Email',
-        'phone_number': 'Номер телефона',
-        'is_bot': 'Бот',
-        'date_joined': 'Дата регистрации',
-        'last_activity': 'Последняя активность',
-        'is_staff': 'Админ',
-        'is_active': 'Активный',
-        'is_superuser': 'Суперюзер',
-        'role': 'Роль'
-    }
-    df.rename(columns=column_mapping, inplace=True)
-
-    # Ограничиваем колонки, чтобы включить только нужные
-    columns_to_keep = [
-        'TG ID', 'Никнейм', 'Имя (Telegram)', 'Фамилия (Telegram)',
-        'Имя (карта)', 'Фамилия (карта)', 'Дата рождения', 'Email', 'Номер телефона',
-        'Роль', 'Активный'
-    ]
-    df = df[[col for col in columns_to_keep if col in df.columns]]
-
-    # Создаем Excel-файл
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Пользователи')
-        worksheet = writer.sheets['Пользователи']
-
-        # Настройка выравнивания
-        alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-        for row in worksheet.iter_rows():
-            for cell in row:
-                cell.alignment = alignment
-
-        # Автоподбор ширины колонок
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2) * 1.2
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-
-        # Стилизация заголовков
-        header_font = Font(bold=True)
-        header_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        for cell in worksheet[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-
-    output.seek(0)
-    logger.info("Excel-отчет по всем пользователям успешно сгенерирован")
-    return output
-
 @admin_router.message(Command("admin"))
 async def admin_panel(message: Message, bot: Bot):
     """Открывает админ-панель для пользователя.
@@ -181,127 +45,210 @@ async def admin_panel(message: Message, bot: Bot):
 
 @admin_router.message(F.text == "📊 Статистика")
 async def show_statistics(message: Message):
-    """Отображает статистику пользователей и предлагает выгрузку в Excel.
+    """Отображает статистику пользователей и предлагает выгрузку пользователей и рассылок.
 
     Args:
         message (Message): Сообщение от пользователя с запросом статистики.
 
     Notes:
-        Выполняет запрос к API и строит инлайн-клавиатуру с кнопкой выгрузки.
+        Берёт готовые агрегаты с бэкенда (users/stats/, кэшируются на короткое время),
+        поэтому стоимость не зависит от числа пользователей. Список пользователей
+        открывается отдельно и загружается по одной странице.
     """
     try:
-        # Проверка соединения с сервером
-        try:
-            parsed_url = urlparse(url_users)
-            host = parsed_url.hostname
-            port = parsed_url.port or (80 if parsed_url.scheme == 'http' else 443)
-            with socket.create_connection((host, port), timeout=3):
-                pass
-        except (socket.timeout, ConnectionRefusedError, OSError) as e:
-            logger.error(f"Сервер недоступен: {e}")
+        # Статус из фоновой проверки: ответ мгновенный, без ожидания сети
+        if not health_monitor.available:
+            logger.error(f"Сервер недоступен: {health_monitor.error}")
             await message.answer("🔴 Сервер статистики временно недоступен. Попробуйте позже.")
             return
-        except Exception as e:
-            logger.error(f"Ошибка проверки соединения: {e}")
-            await message.answer("⚠️ Ошибка при проверке доступности сервера")
-            return
 
         if not config_settings.BOT_API_KEY:
             logger.error("BOT_API_KEY не установлен")
             await message.answer("⚠️ Ошибка конфигурации сервера")
             return
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            try:
-                async with session.get(
-                        url_users,
-                        headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-                ) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        logger.error(f"API error {resp.status}: {error_text}")
-                        await message.answer(f"⚠️ Ошибка сервера {resp.status}. Попробуйте позже.")
-                        return
-                    try:
-                        users = await resp.json()
-                    except ValueError as e:
-                        logger.error(f"Invalid JSON response: {e}")
-                        await message.answer("⚠️ Ошибка обработки данных сервера")
-                        return
-            except ServerTimeoutError as e:
-                logger.error(f"Timeout error: {e}")
-                await message.answer("⏳ Сервер не отвечает. Попробуйте позже.")
-                return
-            except ClientConnectionError as e:
-                logger.error(f"Connection error: {e}")
-                await message.answer("🔴 Не удалось подключиться к серверу")
-                return
-            except ClientError as e:
-                logger.error(f"Client error: {e}")
-                await message.answer("⚠️ Ошибка при запросе к серверу")
-                return
-
-        # Обработка данных
-        total_users = len(users)
-        active_users = sum(1 for user in users if user.get('is_active', False))
-
-        # Формируем список пользователей
-        users_list = "📋 <b>Список пользователей:</b>\n\n"
-        for i, user in enumerate(users, 1):
-            tg_id = user.get('tg_id')
-            username = user.get('username')
-            first_name = user.get('first_name')
-            last_name = user.get('last_name')
-
-            users_list += f"{i}. ID: <code>{tg_id}</code> {username} {first_name} {last_name}\n"
+        try:
+            stats = await get_users_stats()
+        except ClientResponseError as e:
+            logger.error(f"API error {e.status}: {e.message}")
+            await message.answer(f"⚠️ Ошибка сервера {e.status}. Попробуйте позже.")
+            return
+        except ValueError as e:
+            logger.error(f"Invalid JSON response: {e}")
+            await message.answer("⚠️ Ошибка обработки данных сервера")
+            return
+        except ServerTimeoutError as e:
+            logger.error(f"Timeout error: {e}")
+            await message.answer("⏳ Сервер не отвечает. Попробуйте позже.")
+            return
+        except ClientConnectionError as e:
+            logger.error(f"Connection error: {e}")
+            await message.answer("🔴 Не удалось подключиться к серверу")
+            return
+        except ClientError as e:
+            logger.error(f"Client error: {e}")
+            await message.answer("⚠️ Ошибка при запросе к серверу")
+            return
 
         builder = InlineKeyboardBuilder()
-        builder.add(InlineKeyboardButton(
-            text="📥 Выгрузить в Excel",
-            callback_data="export_users_excel"
-        ))
-
-        await message.answer(
-            f"📊 <b>Статистика бота</b>\n\n"
-            f"👥 Всего пользователей: <code>{total_users}</code>\n\n"
-            f"{users_list}",
-            reply_markup=builder.as_markup()
-        )
+        builder.button(text="📋 Список пользователей", callback_data="users_list")
+        builder.button(text="📥 Выгрузить пользователей", callback_data="export_formats:users")
+        builder.button(text="📥 Выгрузить рассылки", callback_data="export_formats:mailings")
+        builder.adjust(1)
+
+        await message.answer(format_users_stats(stats), reply_markup=builder.as_markup())
 
     except Exception as e:
         logger.error(f"Unexpected error in show_statistics: {e}", exc_info=True)
         await message.answer("⚠️ Непредвиденная ошибка при получении статистики")
 
 
-@admin_router.callback_query(F.data == "export_users_excel")
-async def export_users_excel(callback: CallbackQuery):
-    """Генерирует и отправляет отчёт пользователей в формате Excel.
+def format_users_stats(stats: dict) -> str:
+    """Формирует текст экрана статистики.
 
     Args:
-        callback (CallbackQuery): Callback-запрос от кнопки "Выгрузить в Excel".
+        stats (dict): Результат get_users_stats().
 
-    Notes:
-        Использует generate_excel_report для создания файла.
+    Returns:
+        str: HTML-текст; показатели, которых нет в статистике, выводятся прочерком.
+    """
+    def value(key: str) -> str:
+        return f"<code>{stats[key]}</code>" if stats.get(key) is not None else "—"
+
+    text = (
+        f"📊 <b>Статистика бота</b>\n\n"
+        f"👥 Всего пользователей: {value('total')}\n"
+        f"✅ Активных: {value('active')}\n"
+        f"🆕 Новых за сегодня: {value('new_today')}\n"
+        f"📅 Новых за неделю: {value('new_week')}"
+    )
+    if stats.get("subscriptions"):
+        text += "\n\n🔔 <b>Подписки:</b>\n" + "\n".join(
+            f"• {escape(str(item.get('name')))}: "
+            + (f"<code>{item['count']}</code>" if item.get("count") is not None else "—")
+            for item in stats["subscriptions"]
+        )
+    return text
+
+
+def users_page_keyboard(page: int, pages: int):
+    """Создаёт клавиатуру навигации по списку пользователей.
+
+    Args:
+        page (int): Текущая страница, начиная с 1.
+        pages (int): Всего страниц.
+
+    Returns:
+        InlineKeyboardMarkup: Кнопки "назад"/"вперёд" и номер страницы.
+    """
+    builder = InlineKeyboardBuilder()
+    if page > 1:
+        builder.button(text="◀️", callback_data=f"users_page:{page - 1}")
+    builder.button(text=f"{page}/{pages}", callback_data="users_page_current")
+    if page < pages:
+        builder.button(text="▶️", callback_data=f"users_page:{page + 1}")
+    builder.adjust(3)
+    return builder.as_markup()
+
+
+async def render_users_page(page: int):
+    """Загружает страницу пользователей и формирует текст с клавиатурой.
+
+    Args:
+        page (int): Номер страницы, начиная с 1.
+
+    Returns:
+        tuple[str, InlineKeyboardMarkup]: Текст страницы и клавиатура навигации.
+
+    Raises:
+        aiohttp.ClientError: При ошибке запроса к API.
+    """
+    page_size = config_settings.USERS_LIST_PAGE_SIZE
+    users, total = await get_users_page(page, page_size, fields=['tg_id', 'username', 'first_name', 'last_name'])
+    pages = max(1, -(-total // page_size))
+    lines = [
+        f"{number}. ID: <code>{user.get('tg_id')}</code> "
+        + escape(" ".join(str(user[field]) for field in ('username', 'first_name', 'last_name') if user.get(field)))
+        for number, user in enumerate(users, start=(page - 1) * page_size + 1)
+    ]
+    text = f"📋 <b>Список пользователей</b> ({total}):\n\n" + ("\n".join(lines) or "Пользователей нет")
+    return text, users_page_keyboard(page, pages)
+
+
+@admin_router.callback_query(F.data == "users_list")
+async def show_users_list(callback: CallbackQuery):
+    """Отправляет первую страницу списка пользователей отдельным сообщением.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос от кнопки "Список пользователей".
     """
     try:
+        text, keyboard = await render_users_page(1)
+    except ClientError as e:
+        logger.error(f"Ошибка загрузки списка пользователей: {e}")
+        await callback.answer("⚠️ Не удалось загрузить список пользователей", show_alert=True)
+        return
+    await callback.message.answer(text, reply_markup=keyboard)
+    await callback.answer()
+
+
+@admin_router.callback_query(F.data.startswith("users_page:"))
+async def show_users_page(callback: CallbackQuery):
+    """Листает список пользователей, редактируя то же сообщение.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос с номером страницы.
+    """
+    page = int(callback.data.split(":")[1])
+    try:
+        text, keyboard = await render_users_page(page)
+    except ClientError as e:
+        logger.error(f"Ошибка загрузки страницы {page} списка пользователей: {e}")
+        await callback.answer("⚠️ Не удалось загрузить страницу", show_alert=True)
+        return
+    await callback.message.edit_text(text, reply_markup=keyboard)
+    await callback.answer()
+
+
+@admin_router.callback_query(F.data == "users_page_current")
+async def users_page_current(callback: CallbackQuery):
+    """Кнопка с номером страницы ничего не делает, только закрывает часики."""
+    await callback.answer()
+
+
+@admin_router.callback_query(F.data.startswith("export_formats:"))
+async def choose_export_format(callback: CallbackQuery):
+    """Предлагает выбрать формат выгрузки (xlsx, CSV, Parquet).
+
+    Args:
+        callback (CallbackQuery): Callback-запрос вида export_formats:<выгрузка>.
+    """
+    name = callback.data.split(":")[1]
+    await callback.message.answer("Выберите формат файла:", reply_markup=export_formats_keyboard(name))
+    await callback.answer()
+
+
+@admin_router.callback_query(F.data.startswith("export:"))
+async def start_export(callback: CallbackQuery):
+    """Запускает фоновую выгрузку в выбранном формате.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос вида export:<выгрузка>:<формат>.
+
+    Notes:
+        Файл приходит отдельным сообщением, когда готов. Если данные не менялись
+        с прошлой выгрузки, повторно отправляется сохранённый файл (export_jobs).
+    """
+    _, name, fmt = callback.data.split(":")
+    spec = EXPORTS.get(name)
+    if spec is None or fmt not in available_formats():
+        await callback.answer("⚠️ Этот формат недоступен", show_alert=True)
+        return
+
+    if export_jobs.submit(spec, fmt, callback.bot, callback.message.chat.id):
         await callback.answer("⏳ Готовим отчет...")
-        excel_file = await generate_excel_report()
-
-        if excel_file:
-            await callback.message.answer_document(
-                BufferedInputFile(
-                    excel_file.getvalue(),
-                    filename=f"users_report_{dt.now(tz=pytz.timezone('Europe/Moscow')).strftime('%Y%m%d_%H%M%S')}.xlsx"
-                ),
-                caption="📊 Отчет по всем пользователям"
-            )
-        else:
-            await callback.message.answer("❌ Нет данных для выгрузки")
-    except Exception as e:
-        logger.error(f"Error in export_users_excel: {e}", exc_info=True)
-        await callback.message.answer("⚠️ Произошла ошибка при генерации отчета")
-    finally:
-        await callback.answer()
+    else:
+        await callback.answer("⏳ Отчет уже готовится, файл придёт сюда же")
 
 
 @admin_router.message(F.text == "Выход")
@@ -3,8 +3,8 @@ from aiogram.types import CallbackQuery, InlineKeyboardMarkup
 from aiogram.exceptions import TelegramBadRequest
 import aiohttp
 import logging
-from data.config import config_settings
 from data.url import url_promotions
+from utils.backend import backend_client
 from utils.filters import ChatTypeFilter, IsGroupAdmin, ADMIN_CHAT_ID
 from datetime import datetime
 
@@ -20,35 +20,31 @@ admin_promotion_router.message.filter(
 # Обновляет статус подтверждения акции через API
 async def update_promotion_approval(promotion_id: int, approve: bool) -> bool:
     endpoint = "approve" if approve else "reject"
-    url = f"{url_promotions}{promotion_id}/{endpoint}/"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = backend_client.url(url_promotions, promotion_id, endpoint)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers) as resp:
-                logger.debug(f"Запрос на {endpoint} для акции {promotion_id}: status={resp.status}")
-                if resp.status in (200, 204):
-                    logger.info(f"Акция {promotion_id} {'подтверждена' if approve else 'отклонена'} успешно")
-                    return True
-                else:
-                    logger.error(f"Ошибка при {'подтверждении' if approve else 'отклонении'} акции {promotion_id}: status={resp.status}, response={await resp.text()}")
-                    return False
+        async with backend_client.post(url) as resp:
+            logger.debug(f"Запрос на {endpoint} для акции {promotion_id}: status={resp.status}")
+            if resp.status in (200, 204):
+                logger.info(f"Акция {promotion_id} {'подтверждена' if approve else 'отклонена'} успешно")
+                return True
+            else:
+                logger.error(f"Ошибка при {'подтверждении' if approve else 'отклонении'} акции {promotion_id}: status={resp.status}, response={await resp.text()}")
+                return False
     except aiohttp.ClientError as e:
         logger.error(f"Ошибка при {'подтверждении' if approve else 'отклонении'} акции {promotion_id}: {e}")
         return False
 
 # Получает данные акции по ID через API
 async def get_promotion_details(promotion_id: int) -> dict:
-    url = f"{url_promotions}{promotion_id}/"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = backend_client.url(url_promotions, promotion_id)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    logger.info(f"Данные акции {promotion_id} успешно получены")
-                    return await resp.json()
-                else:
-                    logger.error(f"Ошибка при получении данных акции {promotion_id}: status={resp.status}")
-                    return None
+        async with backend_client.get(url) as resp:
+            if resp.status == 200:
+                logger.info(f"Данные акции {promotion_id} успешно получены")
+                return await resp.json()
+            else:
+                logger.error(f"Ошибка при получении данных акции {promotion_id}: status={resp.status}")
+                return None
     except aiohttp.ClientError as e:
         logger.error(f"Ошибка при получении данных акции {promotion_id}: {e}")
         return None
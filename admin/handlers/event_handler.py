@@ -9,9 +9,10 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.filters import StateFilter
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 from aiogram.fsm.context import FSMContext
-from data.config import config_settings
 from admin.keyboards.admin_reply import events_management_keyboard, admin_keyboard, cancel_keyboard, edit_event_keyboard
+from data.config import config_settings
 from data.url import url_event
+from utils.backend import backend_client
 from utils.filters import ChatTypeFilter, IsGroupAdmin, ADMIN_CHAT_ID
 from utils.photo import download_photo_from_telegram, validate_photo
 from utils.calendar import get_calendar, get_time_keyboard, format_datetime
@@ -68,8 +69,7 @@ class DeleteEventForm(StatesGroup):
 # =================================================================================================
 
 async def create_new_event(event_data: dict, photo_file_id: str, bot: Bot) -> dict:
-    url = f"{url_event}"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = url_event
     form_data = aiohttp.FormData()
     
     for key, value in event_data.items():
@@ -93,22 +93,21 @@ async def create_new_event(event_data: dict, photo_file_id: str, bot: Bot) -> di
         raise Exception(f"Не удалось загрузить фото: {str(e)}")
     
     try:
-        async with aiohttp.ClientSession() as session:
-            logger.debug(f"Sending request to create event: {event_data}")
-            async with session.post(url, headers=headers, data=form_data) as response:
-                response_text = await response.text()
-                if response.status == 201:
-                    logger.info(f"Event created successfully: {event_data['title']}")
-                    return await response.json()
-                logger.error(f"Failed to create event, status={response.status}, body={response_text}")
-                return None
+        logger.debug(f"Sending request to create event: {event_data}")
+        async with backend_client.post(url, data=form_data) as response:
+            response_text = await response.text()
+            if response.status == 201:
+                backend_client.invalidate(url_event)
+                logger.info(f"Event created successfully: {event_data['title']}")
+                return await response.json()
+            logger.error(f"Failed to create event, status={response.status}, body={response_text}")
+            return None
     except aiohttp.ClientError as e:
         logger.error(f"Network error creating event: {e}")
         return None
 
 async def update_event(event_id: int, updated_fields: dict, bot: Bot = None) -> dict:
-    url = f"{url_event}{event_id}/"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = backend_client.url(url_event, event_id)
     form_data = aiohttp.FormData()
     
     for key, value in updated_fields.items():
@@ -131,29 +130,29 @@ async def update_event(event_id: int, updated_fields: dict, bot: Bot = None) ->
                 form_data.add_field(key, str(value))
     
     try:
-        async with aiohttp.ClientSession() as session:
-            logger.debug(f"Sending request to update event {event_id}: {updated_fields}")
-            async with session.patch(url, headers=headers, data=form_data) as response:
-                response_text = await response.text()
-                if response.status == 200:
-                    logger.info(f"Event {event_id} updated successfully")
-                    return await response.json()
-                logger.error(f"Failed to update event {event_id}, status={response.status}, body={response_text}")
-                return None
+        logger.debug(f"Sending request to update event {event_id}: {updated_fields}")
+        async with backend_client.patch(url, data=form_data) as response:
+            response_text = await response.text()
+            if response.status == 200:
+                backend_client.invalidate(url_event)
+                logger.info(f"Event {event_id} updated successfully")
+                return await response.json()
+            logger.error(f"Failed to update event {event_id}, status={response.status}, body={response_text}")
+            return None
     except Exception as e:
         logger.error(f"Error updating event {event_id}: {e}")
         return None
 
 async def fetch_events() -> list:
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(f"{url_event}", headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data
-                logger.error(f"Failed to fetch events, status={resp.status}")
-                return []
+        return await backend_client.get_json(
+            url_event,
+            ttl=config_settings.CACHE_TTL_EVENTS,
+            stale_ttl=config_settings.CACHE_MAX_STALE
+        )
+    except aiohttp.ClientResponseError as e:
+        logger.error(f"Failed to fetch events, status={e.status}")
+        return []
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching events: {e}")
         return []
@@ -167,16 +166,15 @@ async def get_event_by_title(title: str) -> dict:
     return None
 
 async def delete_event(event_id: int) -> bool:
-    url = f"{url_event}{event_id}/"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = backend_client.url(url_event, event_id)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url, headers=headers) as resp:
-                if resp.status in (200, 204):
-                    logger.info(f"Event {event_id} deleted successfully")
-                    return True
-                logger.error(f"Failed to delete event {event_id}, status={resp.status}")
-                return False
+        async with backend_client.delete(url) as resp:
+            if resp.status in (200, 204):
+                backend_client.invalidate(url_event)
+                logger.info(f"Event {event_id} deleted successfully")
+                return True
+            logger.error(f"Failed to delete event {event_id}, status={resp.status}")
+            return False
     except Exception as e:
         logger.error(f"Error deleting event {event_id}: {e}")
         return False
@@ -1,24 +1,51 @@
+import asyncio
 import logging
-import os
-import aiohttp
+from datetime import datetime
 from aiogram import Router, F
+from aiogram.enums import ContentType
 from aiogram.types import Message, ReplyKeyboardRemove, CallbackQuery
 from aiogram.fsm.context import FSMContext
-from admin.keyboards.admin_inline import mailing_keyboard, admin_link_keyboard, accept_mailing_kb
+from aiogram.exceptions import TelegramBadRequest
+from admin.keyboards.admin_inline import (
+    mailing_keyboard, admin_link_keyboard, accept_mailing_kb, mailing_audience_keyboard, mailing_control_keyboard
+)
+from admin.services.audience import AUDIENCE_UNAVAILABLE_REASON, AudienceUnavailableError, estimate_audience
 from admin.keyboards.admin_reply import admin_keyboard, cancel_keyboard
+from admin.services.mailing import finish_mailing_job, send_mailing_content
+from admin.services.mailing_scheduler import mailing_scheduler
+from admin.services.mailing_worker import mailing_worker
+from admin.services.mailing_store import JOB_CANCELLED, mailing_store
+from client.services.subscriptions import get_subscriptions_data
 from data.url import *
+from utils.calendar import MOSCOW_TZ, get_calendar, get_time_keyboard
 from utils.filters import ChatTypeFilter, IsGroupAdmin, ADMIN_CHAT_ID
 from email.mime import image
 from aiogram.fsm.state import State, StatesGroup
 
 logger = logging.getLogger(__name__)
 
+# Готовые сообщения, которые можно разослать копированием
+COPYABLE_CONTENT_TYPES = {
+    ContentType.PHOTO, ContentType.VIDEO, ContentType.ANIMATION, ContentType.DOCUMENT,
+    ContentType.AUDIO, ContentType.VOICE, ContentType.VIDEO_NOTE,
+}
+
+# Сообщения альбома приходят отдельными апдейтами: ждём остальные, прежде чем ответить
+ALBUM_COLLECT_DELAY = 1.0
+_albums: dict[str, list[Message]] = {}
+
 
 admin_mailing_router = Router()
 admin_mailing_router.message.filter(
     ChatTypeFilter("private"),
     IsGroupAdmin([ADMIN_CHAT_ID], show_message=False)
 )
+# Кнопки рассылки (в том числе пауза, продолжение и отмена идущей рассылки) -
+# только для администраторов
+admin_mailing_router.callback_query.filter(
+    ChatTypeFilter("private"),
+    IsGroupAdmin([ADMIN_CHAT_ID], show_message=False)
+)
 
 
 class MailingFSM(StatesGroup):
@@ -28,12 +55,18 @@ class MailingFSM(StatesGroup):
         text: Состояние ввода текста рассылки.
         image: Состояние добавления изображения.
         button_url: Состояние добавления ссылки для кнопки.
+        audience: Состояние выбора аудитории (все пользователи или подписки).
         wait: Состояние ожидания подтверждения.
+        schedule_date: Состояние выбора даты отложенной отправки.
+        schedule_time: Состояние выбора времени отложенной отправки.
     """
     text = State()
     image = State()
     button_url = State()
+    audience = State()
     wait = State()
+    schedule_date = State()
+    schedule_time = State()
 
 
 @admin_mailing_router.message(F.text.casefold() == "отмена")
@@ -54,8 +87,66 @@ async def start_mailing(message: Message, state: FSMContext):
     Notes:
         Устанавливает состояние MailingFSM.text и удаляет текущую клавиатуру.
     """
-    await message.answer("Введите текст рассылки:", reply_markup=cancel_keyboard())
+    await message.answer(
+        "Введите текст рассылки или отправьте готовое сообщение (фото, видео, документ, альбом):",
+        reply_markup=cancel_keyboard()
+    )
     await state.set_state(MailingFSM.text)
+
+
+def _serialize_entities(message: Message) -> list[dict] | None:
+    """Форматирование текста сообщения в виде, пригодном для хранения."""
+    entities = message.entities or message.caption_entities
+    return [entity.model_dump(exclude_none=True) for entity in entities] if entities else None
+
+
+def _mailing_content(data: dict) -> dict:
+    """Собирает содержимое рассылки из данных FSM.
+
+    Исходное сообщение копируется, если оно и есть рассылка (готовое медиа) или
+    к тексту не добавлена картинка; иначе картинка отправляется по file_id с подписью.
+    """
+    copy = data.get("content_copy") or not data.get("image")
+    return {
+        "text": data.get("text"),
+        "image_id": data.get("image"),
+        "entities": data.get("entities"),
+        "source_chat_id": data.get("source_chat_id") if copy else None,
+        "source_message_ids": data.get("source_message_ids") if copy else None,
+    }
+
+
+@admin_mailing_router.message(MailingFSM.text, F.media_group_id)
+async def get_album_mailing(message: Message, state: FSMContext):
+    """Сохраняет альбом как содержимое рассылки.
+
+    Args:
+        message (Message): Одно из сообщений альбома.
+        state (FSMContext): Контекст состояния FSM для сохранения данных.
+
+    Notes:
+        Отвечает один раз на весь альбом - после того как придут остальные его сообщения.
+    """
+    album = _albums.setdefault(message.media_group_id, [])
+    album.append(message)
+    if len(album) > 1:
+        return
+    await asyncio.sleep(ALBUM_COLLECT_DELAY)
+
+    album = sorted(_albums.pop(message.media_group_id), key=lambda item: item.message_id)
+    captioned = next((item for item in album if item.caption), None)
+    photo = next((item.photo[-1].file_id for item in album if item.photo), None)
+    await state.update_data(
+        text=captioned.caption if captioned else None,
+        entities=None,
+        image=photo,
+        button_url=None,
+        source_chat_id=message.chat.id,
+        source_message_ids=[item.message_id for item in album],
+        content_copy=True
+    )
+    await message.answer(f"Альбом из {len(album)} файлов записан!\nКнопку-ссылку к альбому добавить нельзя.",
+                         reply_markup=await mailing_keyboard(0, with_image=False, with_button=False))
     
 
 @admin_mailing_router.message(MailingFSM.text)
@@ -68,8 +159,35 @@ async def get_text_mailing(message: Message, state: FSMContext):
 
     Notes:
         Сохраняет текст, проверяет длину (максимум 1024 символа) и предлагает опции для продолжения.
+        Готовое медиа-сообщение сохраняется целиком и рассылается копированием.
     """
-    await state.update_data(text=message.text)
+    if message.text is None:
+        if message.content_type not in COPYABLE_CONTENT_TYPES:
+            await message.answer("Такое сообщение нельзя разослать. Отправьте текст, фото, видео, документ или альбом:",
+                                 reply_markup=cancel_keyboard())
+            return
+        await state.update_data(
+            text=message.caption,
+            entities=None,
+            image=message.photo[-1].file_id if message.photo else None,
+            source_chat_id=message.chat.id,
+            source_message_ids=[message.message_id],
+            content_copy=True
+        )
+        await message.answer("Сообщение записано!\nВы можете выбрать опции для отправки рассылки:",
+                             reply_markup=await mailing_keyboard(0, with_image=False))
+        return
+
+    data = await state.get_data()
+    await state.update_data(
+        text=message.text,
+        entities=_serialize_entities(message),
+        # Картинка из прежнего готового сообщения к новому тексту не относится
+        image=None if data.get("content_copy") else data.get("image"),
+        source_chat_id=message.chat.id,
+        source_message_ids=[message.message_id],
+        content_copy=False
+    )
     if len(message.text) > 1024:
         await message.answer("Текст записан!\nВы можете выбрать опции для отправки рассылки:\nКартинки не доступны, тк длина текста превышает 1024 символа",
                              reply_markup=await mailing_keyboard(len(message.text)))
@@ -167,11 +285,12 @@ async def get_button_url_mailing(message: Message, state: FSMContext):
     Notes:
         Проверяет формат URL (начинается с https://) и переключает состояние на MailingFSM.wait.
     """
-    link = message.text.split('/')
+    link = (message.text or "").split('/')
     if len(link) > 1 and link[0] == "https:" and link[1] == "":
         await state.update_data(button_url=message.text)
+        data = await state.get_data()
         await message.answer("Ссылка добавлена!\nВы можете выбрать опции для отправки рассылки:",
-                             reply_markup=await mailing_keyboard(1000))
+                             reply_markup=await mailing_keyboard(1000, with_image=not data.get("content_copy")))
         await state.set_state(MailingFSM.wait)
     else:
         await message.answer("Это не ссылка, попробуйте еще раз:", reply_markup=cancel_keyboard())
@@ -179,84 +298,118 @@ async def get_button_url_mailing(message: Message, state: FSMContext):
 
 
 @admin_mailing_router.callback_query(F.data == "send_mailing")
-async def sending_mailing(callback: CallbackQuery, state: FSMContext):
-    """Подготавливает предварительный просмотр рассылки перед отправкой.
+async def choose_mailing_audience(callback: CallbackQuery, state: FSMContext):
+    """Предлагает выбрать аудиторию рассылки.
 
     Args:
         callback (CallbackQuery): Callback-запрос от кнопки "Отправить рассылку".
-        state (FSMContext): Контекст состояния FSM для получения данных.
+        state (FSMContext): Контекст состояния FSM для сохранения выбора.
 
     Notes:
-        Отображает текст, изображение и/или кнопку с ссылкой для подтверждения.
+        По умолчанию выбраны все пользователи; выбор подписок сужает аудиторию
+        до их подписчиков. Устанавливает состояние MailingFSM.audience.
+    """
+    subscriptions = await get_subscriptions_data()
+    await state.update_data(audience=[])
+    await callback.message.answer(
+        "Кому отправить рассылку? Выберите одну или несколько подписок или всех пользователей:",
+        reply_markup=mailing_audience_keyboard(subscriptions, [])
+    )
+    await state.set_state(MailingFSM.audience)
+    await callback.answer()
+
+
+@admin_mailing_router.callback_query(MailingFSM.audience, F.data.startswith("mailing_audience_"))
+async def toggle_mailing_audience(callback: CallbackQuery, state: FSMContext):
+    """Переключает подписку в аудитории рассылки или выбирает всех пользователей.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос от кнопки подписки.
+        state (FSMContext): Контекст состояния FSM с выбранными подписками.
     """
+    choice = callback.data.removeprefix("mailing_audience_")
+    if choice == "done":
+        await sending_mailing(callback, state)
+        return
+
     data = await state.get_data()
-    text = data.get("text")
-    image = data.get("image")
-    button_url = data.get("button_url")
-    
-    if image:
-        if button_url:
-            await callback.message.answer_photo(photo=image, caption=text, reply_markup=await admin_link_keyboard(button_url))
-        else:
-            await callback.message.answer_photo(photo=image, caption=text)
-    else:
-        if button_url:
-            await callback.message.answer(text, reply_markup=await admin_link_keyboard(button_url))
+    audience = data.get("audience", [])
+    if choice == "all":
+        audience = []
+    elif choice.isdigit():
+        subscription_id = int(choice)
+        if subscription_id in audience:
+            audience.remove(subscription_id)
         else:
-            await callback.message.answer(text)
-    
-    await callback.message.answer("Вы уверены, что хотите отправить рассылку?",
-                                  reply_markup=accept_mailing_kb)
+            audience.append(subscription_id)
+    await state.update_data(audience=audience)
+
+    subscriptions = await get_subscriptions_data()
+    try:
+        await callback.message.edit_reply_markup(reply_markup=mailing_audience_keyboard(subscriptions, audience))
+    except TelegramBadRequest:
+        pass
     await callback.answer()
-    await state.set_state(MailingFSM.wait)
 
 
-async def download_image(callback: CallbackQuery, image_id: str) -> str:
-    """Скачивает изображение с сервера Telegram и сохраняет на диск.
+async def sending_mailing(callback: CallbackQuery, state: FSMContext):
+    """Подготавливает предварительный просмотр рассылки перед отправкой.
 
     Args:
-        callback (CallbackQuery): Callback-запрос для доступа к боту.
-        image_id (str): ID изображения для скачивания.
-
-    Returns:
-        str: Путь к сохранённому файлу.
+        callback (CallbackQuery): Callback-запрос от кнопки "Далее" при выборе аудитории.
+        state (FSMContext): Контекст состояния FSM для получения данных.
 
-    Raises:
-        Exception: Если произошла ошибка при скачивании или сохранении.
+    Notes:
+        Отображает текст, изображение и/или кнопку с ссылкой и оценку размера аудитории.
+        Если бэкенд не отдаёт подписчиков выбранной подписки, предпросмотр не
+        показывается, и администратор остаётся на выборе аудитории.
     """
-    bot = callback.bot
-    file = await bot.get_file(image_id)
-    file_data = await bot.download_file(file.file_path)
+    data = await state.get_data()
+    button_url = data.get("button_url")
+    audience = data.get("audience") or []
 
-    # Уникальное имя файла
-    filename = f"{image_id}.jpg"
-    save_path = os.path.join("media", "mailing", "photos", filename)
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    try:
+        estimate, exact = await estimate_audience(audience)
+    except AudienceUnavailableError as e:
+        logger.error(f"Аудитория рассылки недоступна: {e}")
+        await callback.answer(f"⚠️ Рассылку не отправить: {AUDIENCE_UNAVAILABLE_REASON}", show_alert=True)
+        return
+
+    # Предпросмотр отправляется тем же способом, что и сама рассылка
+    reply_markup = await admin_link_keyboard(button_url) if button_url else None
+    await send_mailing_content(callback.bot, callback.message.chat.id, _mailing_content(data), reply_markup)
 
-    # Сохраняем файл
-    with open(save_path, "wb") as f:
-        f.write(file_data.getvalue())
+    if estimate is None:
+        audience_text = "Размер аудитории оценить не удалось."
+    else:
+        audience_text = f"Получателей: {'' if exact else 'до '}{estimate}."
+    if audience:
+        subscriptions = {sub["id"]: sub["name"] for sub in await get_subscriptions_data()}
+        names = ", ".join(subscriptions.get(sub_id, str(sub_id)) for sub_id in audience)
+        audience_text = f"Аудитория: подписчики «{names}».\n{audience_text}"
+    else:
+        audience_text = f"Аудитория: все пользователи.\n{audience_text}"
 
-    return f"/media/mailing/photos/{filename}"
+    await callback.message.answer(f"{audience_text}\n\nВы уверены, что хотите отправить рассылку?",
+                                  reply_markup=accept_mailing_kb)
+    await callback.answer()
+    await state.set_state(MailingFSM.wait)
 
 
 @admin_mailing_router.callback_query(F.data == "accept_send_mailing")
 async def send_mailing(callback: CallbackQuery, state: FSMContext):
-    """Отправляет рассылку всем пользователям через API.
+    """Запускает рассылку всем пользователям.
 
     Args:
         callback (CallbackQuery): Callback-запрос от кнопки "Подтвердить".
         state (FSMContext): Контекст состояния FSM для получения данных.
 
     Notes:
-        Использует API для получения списка пользователей и отправки сообщений с ограничением скорости.
+        Рассылка сохраняется в SQLite (MailingStore) и выполняется в фоне порциями
+        через Broadcaster; после перезапуска бота она продолжается с места остановки.
+        Отчёт отправляется в этот же чат по завершении. Под сообщением прогресса
+        есть кнопки паузы и отмены.
     """
-    data = await state.get_data()
-    text = data.get("text")
-    image_id = data.get("image")
-    button_url = data.get("button_url")
-
-    # 1. Получаем список всех пользователей через API
     if not config_settings.BOT_API_KEY:
         logger.error("BOT_API_KEY не установлен")
         await callback.message.answer("⚠️ Ошибка конфигурации сервера")
@@ -264,144 +417,227 @@ async def send_mailing(callback: CallbackQuery, state: FSMContext):
         return
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url_users,
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status != 200:
-                    error = await response.text()
-                    logger.error(f"API users error: {response.status} - {error}")
-                    await callback.message.answer("⚠️ Ошибка при получении списка пользователей")
-                    await state.clear()
-                    return
-
-                users = await response.json()
-                if not isinstance(users, list):
-                    logger.error(f"Некорректный формат пользователей: {type(users)}")
-                    await callback.message.answer("⚠️ Некорректный формат данных пользователей")
-                    await state.clear()
-                    return
-
+        job_id = await _create_mailing_job(await state.get_data(), callback.message.chat.id, callback.from_user.id)
     except Exception as e:
-        logger.error(f"Ошибка при получении пользователей: {e}")
-        await callback.message.answer("⚠️ Ошибка соединения с сервером")
+        logger.error(f"Ошибка при создании рассылки: {e}")
+        await callback.message.answer("⚠️ Не удалось создать рассылку")
         await state.clear()
+        await callback.answer()
         return
 
-    if not users:
-        await callback.message.answer("ℹ️ Нет пользователей для рассылки")
-        await state.clear()
-        return
+    progress_text = f"🕓 Рассылка #{job_id} поставлена в очередь"
+    if ahead := mailing_worker.backlog:
+        progress_text += f"\nПеред ней рассылок: {ahead}. Прогресс появится в этом сообщении."
+    progress_msg = await callback.message.answer(progress_text, reply_markup=mailing_control_keyboard(job_id))
+    await mailing_store.update_job(job_id, progress_message_id=progress_msg.message_id)
 
-    # 2. Подготовка данных для рассылки
-    reply_markup = await admin_link_keyboard(button_url) if button_url else None
-    total_users = len(users)
-    success = 0
-    failed = 0
-    failed_users = []
-
-    progress_msg = await callback.message.answer(
-        f"🚀 Начата рассылка для {total_users} пользователей...\n"
-        f"⏳ Обработано: 0/{total_users}"
+    mailing_worker.submit(job_id)
+    await callback.answer()
+    await state.clear()
+
+
+async def _create_mailing_job(data: dict, admin_chat_id: int, admin_user_id: int,
+                              scheduled_at: datetime | None = None) -> int:
+    """Сохраняет рассылку из данных FSM в MailingStore и возвращает её ID."""
+    content = _mailing_content(data)
+    return await mailing_store.create_job(
+        text=content["text"],
+        image_id=content["image_id"],
+        button_url=data.get("button_url"),
+        admin_chat_id=admin_chat_id,
+        admin_user_id=admin_user_id,
+        audience=data.get("audience") or None,
+        source_chat_id=content["source_chat_id"],
+        source_message_ids=content["source_message_ids"],
+        entities=content["entities"],
+        scheduled_at=scheduled_at
     )
 
-    # 3. Отправка сообщений с ограничением скорости и прогрессом
-    for index, user in enumerate(users, 1):
-        try:
-            tg_id = user.get("tg_id")
-            if not tg_id:
-                logger.error(f"У пользователя отсутствует tg_id: {user}")
-                failed += 1
-                failed_users.append(f"ID:{user.get('id')} (нет tg_id)")
-                continue
-
-            if image_id:
-                await callback.bot.send_photo(
-                    chat_id=tg_id,
-                    photo=image_id,
-                    caption=text,
-                    reply_markup=reply_markup
-                )
-            else:
-                await callback.bot.send_message(
-                    chat_id=tg_id,
-                    text=text,
-                    reply_markup=reply_markup
-                )
-            success += 1
-
-            # Обновление прогресса каждые 10% или 20 пользователей
-            if index % max(20, total_users // 10) == 0 or index == total_users:
-                try:
-                    await progress_msg.edit_text(
-                        f"🚀 Рассылка в процессе...\n"
-                        f"⏳ Обработано: {index}/{total_users}\n"
-                        f"✅ Успешно: {success}\n"
-                        f"❌ Ошибок: {failed}"
-                    )
-                except:
-                    pass
-
-            # Ограничение скорости (30 сообщений в секунду - лимит Telegram)
-            if index % 30 == 0:
-                await asyncio.sleep(1)
-
-        except Exception as e:
-            logger.error(f"Ошибка при отправке пользователю {tg_id}: {e}")
-            failed += 1
-            failed_users.append(str(tg_id))
-            continue
-
-    # 4. Сохраняем рассылку через API
-    mailing_data = {
-        "text": text,
-        "image": await download_image(callback, image_id) if image_id else None,
-        "button_url": button_url,
-        "type": "other",
-        "tg_user_id": callback.from_user.id,
-        "total_recipients": total_users,
-        "successful_deliveries": success,
-        "failed_deliveries": failed
-    }
 
+@admin_mailing_router.callback_query(MailingFSM.wait, F.data == "schedule_mailing")
+async def schedule_mailing(callback: CallbackQuery, state: FSMContext):
+    """Предлагает выбрать дату отложенной отправки рассылки.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос от кнопки "Запланировать".
+        state (FSMContext): Контекст состояния FSM.
+    """
+    await callback.message.answer("Выберите дату отправки рассылки:", reply_markup=get_calendar(prefix="mailing_"))
+    await state.set_state(MailingFSM.schedule_date)
+    await callback.answer()
+
+
+@admin_mailing_router.callback_query(MailingFSM.schedule_date, F.data.startswith(("mailing_prev_month:", "mailing_next_month:")))
+async def mailing_month_navigation(callback: CallbackQuery):
+    """Листает календарь выбора даты рассылки."""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url_mailing,
-                json=mailing_data,
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                if response.status != 201:
-                    error = await response.text()
-                    logger.error(f"Ошибка сохранения рассылки: {response.status} - {error}")
-    except Exception as e:
-        logger.error(f"Ошибка при сохранении рассылки: {e}")
+        _, month, year = callback.data.split(":")
+        await callback.message.edit_reply_markup(reply_markup=get_calendar(int(year), int(month), prefix="mailing_"))
+    except (ValueError, TelegramBadRequest) as e:
+        logger.error(f"Ошибка навигации по календарю рассылки: {e}")
+    await callback.answer()
+
 
-    # 5. Отправляем отчет
+@admin_mailing_router.callback_query(MailingFSM.schedule_date, F.data.startswith("mailing_select_date:"))
+async def mailing_date_selected(callback: CallbackQuery, state: FSMContext):
+    """Сохраняет дату отправки и предлагает выбрать время.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос с датой в формате ДД.ММ.ГГГГ.
+        state (FSMContext): Контекст состояния FSM для сохранения даты.
+    """
+    date_str = callback.data[len("mailing_select_date:"):]
     try:
-        await progress_msg.delete()
-    except:
-        pass
+        selected_date = datetime.strptime(date_str, "%d.%m.%Y").date()
+    except ValueError:
+        await callback.answer("Некорректная дата", show_alert=True)
+        return
+    if selected_date < datetime.now(MOSCOW_TZ).date():
+        await callback.answer("Дата не может быть в прошлом", show_alert=True)
+        return
 
-    report = (
-        f"📊 Рассылка завершена!\n"
-        f"• Всего пользователей: {total_users}\n"
-        f"• Успешно отправлено: {success}\n"
-        f"• Не удалось отправить: {failed}"
-    )
+    await state.update_data(schedule_date=date_str)
+    await state.set_state(MailingFSM.schedule_time)
+    await callback.message.edit_text(f"Выбрана дата: {date_str}. Выберите время отправки (МСК):",
+                                     reply_markup=get_time_keyboard(prefix="mailing_"))
+    await callback.answer()
+
+
+@admin_mailing_router.callback_query(MailingFSM.schedule_time, F.data == "mailing_manual_time")
+async def mailing_manual_time(callback: CallbackQuery):
+    """Просит ввести время отправки вручную."""
+    await callback.message.edit_text("Введите время отправки (формат ЧЧ:ММ, например, 15:30):")
+    await callback.answer()
 
-    if failed > 0:
-        failed_samples = ", ".join(failed_users[:10])
-        report += f"\n\nНе удалось отправить: {failed_samples}"
-        if failed > 10:
-            report += f" и ещё {failed - 10}"
 
-    await callback.message.answer(report, reply_markup=admin_keyboard())
+@admin_mailing_router.callback_query(MailingFSM.schedule_time, F.data.startswith("mailing_select_time:"))
+async def mailing_time_selected(callback: CallbackQuery, state: FSMContext):
+    """Планирует рассылку на выбранное время."""
+    await _schedule_mailing_at(callback.message, callback.from_user.id, state,
+                               callback.data[len("mailing_select_time:"):])
     await callback.answer()
+
+
+@admin_mailing_router.message(MailingFSM.schedule_time)
+async def mailing_time_entered(message: Message, state: FSMContext):
+    """Планирует рассылку на время, введённое вручную."""
+    await _schedule_mailing_at(message, message.from_user.id, state, (message.text or "").strip())
+
+
+async def _schedule_mailing_at(message: Message, admin_user_id: int, state: FSMContext, time_str: str):
+    """Создаёт запланированную рассылку и добавляет её в расписание.
+
+    Args:
+        message (Message): Сообщение, в чат которого отвечает бот.
+        admin_user_id (int): ID администратора, создавшего рассылку.
+        state (FSMContext): Контекст состояния FSM с данными рассылки и датой.
+        time_str (str): Время отправки в формате ЧЧ:ММ (МСК).
+    """
+    data = await state.get_data()
+    try:
+        scheduled_at = datetime.strptime(f"{data['schedule_date']} {time_str}", "%d.%m.%Y %H:%M").replace(tzinfo=MOSCOW_TZ)
+    except (KeyError, ValueError):
+        await message.answer("Неверный формат времени. Введите время в формате ЧЧ:ММ, например, 15:30:",
+                             reply_markup=get_time_keyboard(prefix="mailing_"))
+        return
+    if scheduled_at <= datetime.now(MOSCOW_TZ):
+        await message.answer("Время отправки уже прошло. Выберите другое время:",
+                             reply_markup=get_time_keyboard(prefix="mailing_"))
+        return
+
+    try:
+        job_id = await _create_mailing_job(data, message.chat.id, admin_user_id, scheduled_at=scheduled_at)
+    except Exception as e:
+        logger.error(f"Ошибка при создании рассылки: {e}")
+        await message.answer("⚠️ Не удалось создать рассылку", reply_markup=admin_keyboard())
+        await state.clear()
+        return
+
+    await message.answer(f"✅ Рассылка #{job_id} запланирована", reply_markup=admin_keyboard())
+    progress_text = (
+        f"🕓 Рассылка #{job_id} запланирована на {scheduled_at.strftime('%d.%m.%Y %H:%M')} (МСК).\n"
+        f"Прогресс появится в этом сообщении."
+    )
+    if _mailing_content(data)["source_message_ids"]:
+        # Получателям копируется исходное сообщение: без него рассылка будет отменена
+        progress_text += "\n⚠️ Не удаляйте исходное сообщение до отправки рассылки."
+    progress_msg = await message.answer(progress_text, reply_markup=mailing_control_keyboard(job_id, scheduled=True))
+    await mailing_store.update_job(job_id, progress_message_id=progress_msg.message_id)
+    mailing_scheduler.schedule(job_id, scheduled_at)
     await state.clear()
 
 
+@admin_mailing_router.callback_query(F.data.startswith("mailing_pause:"))
+async def pause_mailing(callback: CallbackQuery):
+    """Приостанавливает рассылку по кнопке под сообщением прогресса.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос с ID рассылки.
+
+    Notes:
+        Выполняющаяся рассылка останавливается в пределах текущей порции и сама
+        обновляет сообщение прогресса; рассылка из очереди сразу снимается с неё.
+    """
+    job_id = int(callback.data.split(":")[1])
+    running = mailing_worker.current == job_id
+    if not await mailing_worker.pause(job_id):
+        await callback.answer("Рассылку уже нельзя приостановить", show_alert=True)
+        return
+
+    if not running:
+        job = await mailing_store.get_job(job_id)
+        await callback.message.edit_text(
+            f"⏸ Рассылка #{job_id} приостановлена\n✅ Успешно: {job['success']}",
+            reply_markup=mailing_control_keyboard(job_id, paused=True)
+        )
+    await callback.answer("Рассылка приостанавливается")
+
+
+@admin_mailing_router.callback_query(F.data.startswith("mailing_resume:"))
+async def resume_mailing(callback: CallbackQuery):
+    """Продолжает приостановленную рассылку с первого неотправленного получателя.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос с ID рассылки.
+    """
+    job_id = int(callback.data.split(":")[1])
+    ahead = await mailing_worker.resume(job_id)
+    if ahead is None:
+        await callback.answer("Рассылка не на паузе", show_alert=True)
+        return
+
+    text = f"▶️ Рассылка #{job_id} продолжается"
+    if ahead:
+        text += f"\nПеред ней рассылок: {ahead}. Прогресс появится в этом сообщении."
+    await callback.message.edit_text(text, reply_markup=mailing_control_keyboard(job_id))
+    await callback.answer()
+
+
+@admin_mailing_router.callback_query(F.data.startswith("mailing_cancel:"))
+async def cancel_mailing(callback: CallbackQuery):
+    """Отменяет запланированную, приостановленную или выполняющуюся рассылку.
+
+    Args:
+        callback (CallbackQuery): Callback-запрос с ID рассылки.
+
+    Notes:
+        Уже отправленные сообщения остаются у получателей; в отчёте указывается,
+        сколько сообщений отправлено и сколько не отправлено из-за отмены.
+    """
+    job_id = int(callback.data.split(":")[1])
+    running = mailing_worker.current == job_id
+    mailing_scheduler.cancel(job_id)
+    if not await mailing_worker.cancel(job_id):
+        await callback.answer("Рассылка уже завершена", show_alert=True)
+        return
+
+    if not running:
+        # Итоговые числа придут отдельным отчётом
+        await callback.message.edit_text(f"✖️ Рассылка #{job_id} отменена")
+        await finish_mailing_job(callback.bot, job_id, status=JOB_CANCELLED)
+    await callback.answer("Рассылка отменяется")
+
+
 @admin_mailing_router.callback_query(F.data == "cancel_send_mailing")
 async def cancel_send_mailing(callback: CallbackQuery, state: FSMContext):
     """Отменяет процесс создания рассылки.
@@ -9,9 +9,10 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.filters import StateFilter
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 from aiogram.fsm.context import FSMContext
-from data.config import config_settings
 from admin.keyboards.admin_reply import admin_keyboard, points_system_settings_keyboard, cancel_keyboard, edit_points_system_settings_keyboard
+from data.config import config_settings
 from data.url import url_points_settings
+from utils.backend import backend_client
 from utils.filters import ChatTypeFilter, IsGroupAdmin, ADMIN_CHAT_ID
 
 # Настройка логирования
@@ -37,45 +38,41 @@ class EditPointsSystemSettingsStates(StatesGroup):
 
 # Функции для работы с API
 async def get_points_system_settings():
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(f"{url_points_settings}single/", headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data
-                logger.error(f"Failed to fetch settings, status={resp.status}")
-                return []
+        return await backend_client.get_json(
+            backend_client.url(url_points_settings, "single"),
+            ttl=config_settings.CACHE_TTL_POINTS_SETTINGS
+        )
+    except aiohttp.ClientResponseError as e:
+        logger.error(f"Failed to fetch settings, status={e.status}")
+        return []
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching settings: {e}")
         return []
 
 async def update_points_system_settings(settings_id: int, updated_fields: dict):
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.patch(
-                f"{url_points_settings}{settings_id}/",
-                json=updated_fields,
-                headers=headers
-            ) as resp:
-                if resp.status == 200:
-                    return True
-                logger.error(f"Failed to update points system settings, status={resp.status}, response={await resp.text()}")
-                return False
+        async with backend_client.patch(
+            backend_client.url(url_points_settings, settings_id),
+            json=updated_fields
+        ) as resp:
+            if resp.status == 200:
+                backend_client.invalidate(url_points_settings)
+                return True
+            logger.error(f"Failed to update points system settings, status={resp.status}, response={await resp.text()}")
+            return False
     except aiohttp.ClientError as e:
         logger.error(f"Error updating points system settings: {e}")
         return False
 
 async def create_points_system_settings(settings_data: dict):
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.post(f"{url_points_settings}", json=settings_data, headers=headers) as resp:
-                if resp.status == 201:
-                    return True
-                logger.error(f"Failed to create points system settings, status={resp.status}")
-                return False
+        async with backend_client.post(url_points_settings, json=settings_data) as resp:
+            if resp.status == 201:
+                backend_client.invalidate(url_points_settings)
+                return True
+            logger.error(f"Failed to create points system settings, status={resp.status}")
+            return False
     except aiohttp.ClientError as e:
         logger.error(f"Error creating points system settings: {e}")
         return False
@@ -1,8 +1,6 @@
-import aiohttp
 from aiogram import F, Router
 from aiogram.fsm.state import StatesGroup, State
-from aiogram.types import Message, ReplyKeyboardRemove, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, \
-    BufferedInputFile
+from aiogram.types import Message, ReplyKeyboardRemove, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
@@ -12,8 +10,7 @@ from admin.keyboards.admin_inline import residents_management_inline_keyboard, \
 from admin.services.utils import fetch_categories, \
     create_category, delete_category, show_categories_message, fetch_categories_with_keyboard, create_resident_api, \
     fetch_residents_list, update_resident_category_api, update_resident_field_api, fetch_residents_for_deletion, \
-    delete_resident_api, generate_residents_excel, fetch_category_name, fetch_resident_data
-from data.config import config_settings
+    delete_resident_api, fetch_category_name, fetch_resident_data
 from admin.keyboards.admin_reply import admin_keyboard, residents_management_keyboard, get_back_keyboard
 from data.url import url_resident, url_category
 from utils.filters import ChatTypeFilter, IsGroupAdmin, ADMIN_CHAT_ID
@@ -335,8 +332,8 @@ async def show_residents_list(callback: CallbackQuery):
     builder = InlineKeyboardBuilder()
     builder.row(
         InlineKeyboardButton(
-            text="📊 Выгрузить в Excel",
-            callback_data="export_residents_to_excel"
+            text="📊 Выгрузить",
+            callback_data="export_formats:residents"
         )
     )
     builder.row(
@@ -356,53 +353,6 @@ async def show_residents_list(callback: CallbackQuery):
         )
 
 
-@admin_resident_router.callback_query(F.data == "export_residents_to_excel")
-async def export_residents_to_excel(callback: CallbackQuery):
-    excel_file, error = await generate_residents_excel()
-
-    if error:
-        if callback.message.text != f"❌ {error}":
-            await callback.message.answer(
-                f"❌ {error}",
-                reply_markup=get_residents_management_keyboard()
-            )
-        await callback.answer()
-        return
-
-    try:
-        await callback.answer()
-        # Сбрасываем указатель файла
-        excel_file.seek(0)
-        # Отправляем файл
-        await callback.message.answer_document(
-            document=BufferedInputFile(
-                excel_file.read(),
-                filename="residents.xlsx"
-            ),
-            caption="Полный список резидентов"
-        )
-
-        # Отправляем отдельное сообщение с кнопкой "Назад"
-        await callback.message.answer(
-            "Вернуться к управлению резидентами",
-            reply_markup=InlineKeyboardMarkup(
-                inline_keyboard=[
-                    [InlineKeyboardButton(
-                        text="◀️ Назад",
-                        callback_data="back_to_residents_management"
-                    )]
-                ]
-            )
-        )
-
-    except Exception as e:
-        await callback.message.answer(
-            f"❌ Ошибка при отправке файла: {str(e)}",
-            reply_markup=get_residents_management_keyboard()
-        )
-        await callback.answer()
-
-
 # =================================================================================================
 # Добавление резидента
 # =================================================================================================
@@ -989,8 +939,7 @@ async def confirm_field_update(callback: CallbackQuery, state: FSMContext):
     success, result_message, field_name_ru = await update_resident_field_api(
         resident_id=resident_id,
         field=field_code,
-        value=new_value,
-        headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+        value=new_value
     )
 
     if success:
@@ -3,17 +3,20 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardMarkup
 from aiogram.types import InlineKeyboardButton
 from data.config import config_settings
 from data.url import url_resident, url_category
+from utils.export import EXPORT_FORMATS, available_formats
 
 
 # =================================================================================================
 # Для рассылок
 # =================================================================================================
 
-async def mailing_keyboard(message_size: int) -> InlineKeyboardBuilder:
+async def mailing_keyboard(message_size: int, with_image: bool = True, with_button: bool = True) -> InlineKeyboardBuilder:
     """Создаёт инлайн-клавиатуру для управления рассылкой.
 
     Args:
         message_size (int): Размер текста рассылки в символах.
+        with_image (bool): Показывать ли кнопку "Добавить картинку" (не нужна, если рассылка - готовое медиа).
+        with_button (bool): Показывать ли кнопку добавления ссылки (у альбомов кнопок не бывает).
 
     Returns:
         InlineKeyboardMarkup: Клавиатура с кнопками для добавления картинки, ссылки, отмены, изменения текста и отправки.
@@ -23,15 +26,18 @@ async def mailing_keyboard(message_size: int) -> InlineKeyboardBuilder:
     """
     keyboard = InlineKeyboardBuilder()
     
-    if message_size <= 1024:
+    if with_image and message_size <= 1024:
         keyboard.add(
             InlineKeyboardButton(text="Добавить картинку",
                                  callback_data="mailing_add_image"),
         )
     
+    if with_button:
+        keyboard.add(
+            InlineKeyboardButton(text="Добавить ссылку для кнопки",
+                                 callback_data="mailing_add_button_url"),
+        )
     keyboard.add(
-        InlineKeyboardButton(text="Добавить ссылку для кнопки",
-                             callback_data="mailing_add_button_url"),
         InlineKeyboardButton(text="Отменить рассылку",
                              callback_data="cancel_send_mailing"),
         InlineKeyboardButton(text="Изменить текст",
@@ -57,16 +63,83 @@ async def admin_link_keyboard(link: str) -> InlineKeyboardBuilder:
     return keyboard.as_markup()
 
 
+def mailing_audience_keyboard(subscriptions: list[dict], selected: list[int]) -> InlineKeyboardMarkup:
+    """Создаёт инлайн-клавиатуру выбора аудитории рассылки.
+
+    Args:
+        subscriptions (list[dict]): Подписки из API (поля id и name).
+        selected (list[int]): ID выбранных подписок; пустой список - все пользователи.
+
+    Returns:
+        InlineKeyboardMarkup: Кнопка "Все пользователи", переключатели подписок и кнопка "Далее".
+    """
+    keyboard = InlineKeyboardBuilder()
+    keyboard.button(text=("✅ " if not selected else "") + "Все пользователи",
+                    callback_data="mailing_audience_all")
+    for subscription in subscriptions:
+        mark = "✅ " if subscription["id"] in selected else ""
+        keyboard.button(text=mark + subscription["name"],
+                        callback_data=f"mailing_audience_{subscription['id']}")
+    keyboard.button(text="Далее ➡️", callback_data="mailing_audience_done")
+    keyboard.button(text="Отменить рассылку", callback_data="cancel_send_mailing")
+    keyboard.adjust(1)
+    return keyboard.as_markup()
+
+
 accept_mailing_kb = InlineKeyboardMarkup(
     inline_keyboard=[
         [InlineKeyboardButton(text="Подтвердить рассылку",
                               callback_data="accept_send_mailing")],
+        [InlineKeyboardButton(text="🕓 Запланировать",
+                              callback_data="schedule_mailing")],
         [InlineKeyboardButton(text="Отменить рассылку",
                               callback_data="cancel_send_mailing")],
     ]
 )
 
 
+def mailing_control_keyboard(job_id: int, paused: bool = False, scheduled: bool = False) -> InlineKeyboardMarkup:
+    """Создаёт инлайн-клавиатуру управления запущенной рассылкой под сообщением прогресса.
+
+    Args:
+        job_id (int): ID рассылки.
+        paused (bool): Рассылка на паузе - вместо "Пауза" показывается "Продолжить".
+        scheduled (bool): Рассылка запланирована - доступна только отмена.
+
+    Returns:
+        InlineKeyboardMarkup: Кнопки паузы (или продолжения) и отмены.
+    """
+    keyboard = InlineKeyboardBuilder()
+    if paused:
+        keyboard.button(text="▶️ Продолжить", callback_data=f"mailing_resume:{job_id}")
+    elif not scheduled:
+        keyboard.button(text="⏸ Пауза", callback_data=f"mailing_pause:{job_id}")
+    keyboard.button(text="✖️ Отменить", callback_data=f"mailing_cancel:{job_id}")
+    keyboard.adjust(2)
+    return keyboard.as_markup()
+
+
+# =================================================================================================
+# Для выгрузок
+# =================================================================================================
+
+
+def export_formats_keyboard(name: str) -> InlineKeyboardMarkup:
+    """Создаёт инлайн-клавиатуру выбора формата выгрузки.
+
+    Args:
+        name (str): Ключ выгрузки (users, residents, mailings).
+
+    Returns:
+        InlineKeyboardMarkup: По кнопке на каждый доступный формат (Parquet - только если установлен pyarrow).
+    """
+    keyboard = InlineKeyboardBuilder()
+    for fmt in available_formats():
+        keyboard.button(text=EXPORT_FORMATS[fmt][1], callback_data=f"export:{name}:{fmt}")
+    keyboard.adjust(1)
+    return keyboard.as_markup()
+
+
 # =================================================================================================
 # Для категорий резидентов
 # =================================================================================================
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from array import array
+from typing import AsyncIterator, Iterable, Optional
+
+import numpy as np
+from aiohttp import ClientResponseError
+
+from client.services.user import count_users, iter_user_pages
+from data.url import url_subscription_users
+
+logger = logging.getLogger(__name__)
+
+# Сколько chat_id превращать в Python int за раз при обходе RecipientSet
+ITER_CHUNK = 4096
+
+# Что показать администратору, если бэкенд не отдаёт подписчиков подписки
+AUDIENCE_UNAVAILABLE_REASON = "сервер не отдаёт подписчиков подписки, выберите «Все пользователи»"
+
+
+class AudienceUnavailableError(Exception):
+    """Бэкенд не отдаёт список подписчиков подписки (subscriptions/{id}/users/ отвечает 404)."""
+
+    def __init__(self, subscription_id: int):
+        super().__init__(f"Subscription {subscription_id} users endpoint is not available")
+        self.subscription_id = subscription_id
+
+
+class RecipientSet:
+    """Компактное множество chat_id получателей.
+
+    Идентификаторы копятся в array('q') (8 байт на запись вместо ~70 байт у int в set),
+    а дубликаты из пересекающихся подписок убираются в finalize() сортировкой на месте.
+    """
+
+    def __init__(self):
+        self._buffer = array("q")
+        self._unique: Optional[np.ndarray] = None
+
+    def add_many(self, chat_ids: Iterable[int]) -> None:
+        if self._unique is not None:
+            # После finalize() продолжаем копить поверх уже уникальных значений
+            self._buffer = array("q", self._unique.tobytes())
+            self._unique = None
+        self._buffer.extend(chat_ids)
+
+    def finalize(self) -> np.ndarray:
+        """Возвращает отсортированный массив уникальных chat_id."""
+        if self._unique is None:
+            # В отличие от np.unique, сортируем сам буфер, не создавая его копию
+            values = np.frombuffer(self._buffer, dtype=np.int64) if self._buffer else np.empty(0, dtype=np.int64)
+            values.sort()
+            keep = np.empty(len(values), dtype=bool)
+            keep[:1] = True
+            np.not_equal(values[1:], values[:-1], out=keep[1:])
+            self._unique = values[keep]
+            del values
+            self._buffer = array("q")
+        return self._unique
+
+    def exclude(self, chat_ids: Iterable[int]) -> int:
+        """Убирает из множества указанные chat_id.
+
+        Returns:
+            int: Сколько получателей исключено.
+        """
+        unique = self.finalize()
+        excluded = np.fromiter(chat_ids, dtype=np.int64)
+        if not len(unique) or not len(excluded):
+            return 0
+        keep = np.isin(unique, excluded, invert=True, assume_unique=True)
+        self._unique = unique[keep]
+        return len(unique) - len(self._unique)
+
+    def __len__(self) -> int:
+        return len(self.finalize())
+
+    def __iter__(self):
+        # Python int создаются порциями, а не сразу для всего множества
+        unique = self.finalize()
+        for start in range(0, len(unique), ITER_CHUNK):
+            yield from unique[start:start + ITER_CHUNK].tolist()
+
+
+def subscription_users_url(subscription_id: int) -> str:
+    """Адрес списка пользователей, подписанных на подписку."""
+    return url_subscription_users.format(subscription_id=subscription_id)
+
+
+async def iter_audience_pages(subscription_ids: Optional[list[int]] = None, fields: Optional[list[str]] = None) -> AsyncIterator[list[dict]]:
+    """Постранично получает пользователей аудитории рассылки.
+
+    Args:
+        subscription_ids: ID подписок; пустой список или None - все пользователи.
+        fields: Нужные поля пользователя.
+
+    Yields:
+        list[dict]: Страница пользователей. Пользователь нескольких подписок
+        встречается несколько раз - дубликаты убирает RecipientSet.
+
+    Raises:
+        AudienceUnavailableError: Если бэкенд не отдаёт подписчиков подписки.
+    """
+    if not subscription_ids:
+        async for page in iter_user_pages(fields=fields):
+            yield page
+        return
+    for subscription_id in subscription_ids:
+        try:
+            async for page in iter_user_pages(fields=fields, endpoint=subscription_users_url(subscription_id)):
+                yield page
+        except ClientResponseError as e:
+            if e.status == 404:
+                raise AudienceUnavailableError(subscription_id) from e
+            raise
+
+
+async def estimate_audience(subscription_ids: Optional[list[int]] = None) -> tuple[Optional[int], bool]:
+    """Оценивает размер аудитории без загрузки всех пользователей.
+
+    Args:
+        subscription_ids: ID подписок; пустой список или None - все пользователи.
+
+    Returns:
+        tuple[Optional[int], bool]: (оценка, точная ли она). Для нескольких подписок
+        возвращается сумма, то есть верхняя граница; None - если оценить не удалось
+        (в том числе если API не отдаёт количество).
+
+    Raises:
+        AudienceUnavailableError: Если бэкенд не отдаёт подписчиков подписки -
+            такую рассылку отправить некому.
+    """
+    try:
+        if not subscription_ids:
+            total = await count_users()
+            return total, total is not None
+        total = 0
+        for subscription_id in subscription_ids:
+            try:
+                count = await count_users(endpoint=subscription_users_url(subscription_id))
+            except ClientResponseError as e:
+                if e.status == 404:
+                    raise AudienceUnavailableError(subscription_id) from e
+                raise
+            if count is None:
+                return None, False
+            total += count
+        return total, len(subscription_ids) == 1
+    except AudienceUnavailableError:
+        raise
+    except Exception as e:
+        logger.error(f"Не удалось оценить аудиторию рассылки {subscription_ids}: {e}")
+        return None, False
+
+
+async def collect_audience(
+    subscription_ids: Optional[list[int]] = None,
+    stop: Optional[asyncio.Event] = None,
+) -> tuple[RecipientSet, int]:
+    """Собирает уникальных получателей аудитории.
+
+    Args:
+        subscription_ids: ID подписок; пустой список или None - все пользователи.
+        stop: Событие остановки; если оно установлено, сбор прекращается после
+            текущей страницы и возвращается неполный список.
+
+    Returns:
+        tuple[RecipientSet, int]: (получатели, количество пользователей без tg_id).
+
+    Raises:
+        AudienceUnavailableError: Если бэкенд не отдаёт подписчиков подписки.
+    """
+    recipients = RecipientSet()
+    skipped_ids = set()
+    async for page in iter_audience_pages(subscription_ids, fields=["id", "tg_id"]):
+        chat_ids = []
+        for user in page:
+            if user.get("tg_id"):
+                chat_ids.append(user["tg_id"])
+            elif user.get("id") not in skipped_ids:
+                logger.error(f"У пользователя отсутствует tg_id: {user}")
+                skipped_ids.add(user.get("id"))
+        recipients.add_many(chat_ids)
+        if stop is not None and stop.is_set():
+            break
+    return recipients, len(skipped_ids)
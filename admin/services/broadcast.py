@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import time
+from array import array
+from collections import Counter
+from typing import Awaitable, Callable, Iterable, Iterator, Optional
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Категории ошибок доставки
+ERROR_BLOCKED = "blocked"
+ERROR_NOT_FOUND = "not_found"
+ERROR_NETWORK = "network"
+ERROR_OTHER = "other"
+
+# Порядок задаёт компактный код категории в BroadcastStats.error_codes
+ERROR_CATEGORIES = (ERROR_BLOCKED, ERROR_NOT_FOUND, ERROR_NETWORK, ERROR_OTHER)
+
+# Получатель недоступен навсегда: повторная отправка в следующих рассылках бессмысленна
+PERMANENT_ERRORS = frozenset({ERROR_BLOCKED, ERROR_NOT_FOUND})
+
+
+def classify_error(error: Exception) -> str:
+    """Определяет категорию ошибки отправки.
+
+    Args:
+        error: Исключение, полученное при отправке.
+
+    Returns:
+        str: ERROR_BLOCKED - бот заблокирован или аккаунт удалён, ERROR_NOT_FOUND - чат
+        не найден, ERROR_NETWORK - сетевая ошибка или 5xx Telegram, ERROR_OTHER - остальное.
+    """
+    if isinstance(error, TelegramForbiddenError):
+        return ERROR_BLOCKED
+    if isinstance(error, TelegramBadRequest) and "chat not found" in error.message.lower():
+        return ERROR_NOT_FOUND
+    if isinstance(error, (TelegramNetworkError, TelegramServerError)):
+        return ERROR_NETWORK
+    return ERROR_OTHER
+
+
+class TokenBucket:
+    """Глобальный ограничитель скорости отправки (token bucket).
+
+    Токены пополняются со скоростью `rate` в секунду, но не больше `capacity`.
+    pause() останавливает выдачу токенов всем воркерам - так обрабатывается
+    TelegramRetryAfter.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Сколько токенов (сообщений) в секунду выдаётся в среднем.
+            capacity: Максимальный запас токенов (размер "всплеска"), по умолчанию равен rate.
+            clock: Источник монотонного времени.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Ждёт, пока можно отправить одно сообщение."""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов на seconds секунд и сбрасывает накопленный запас."""
+        now = self._clock()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+        self._updated = self._paused_until
+
+
+class BroadcastStats:
+    """Итоги рассылки.
+
+    chat_id хранятся в типизированных массивах (8 байт на получателя), а
+    категория ошибки - однобайтовым кодом в error_codes параллельно failed_ids,
+    поэтому объём памяти не зависит от количества Python-объектов.
+    """
+
+    def __init__(self, total: int = 0):
+        self.total = total
+        self.success = 0
+        self.failed = 0
+        self.retry_after = 0
+        self.sent_ids = array("q")
+        self.failed_ids = array("q")
+        self.error_codes = array("b")
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def processed(self) -> int:
+        return self.success + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Средняя скорость отправки, сообщений в секунду."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def add_failure(self, chat_id: int, category: str) -> None:
+        self.failed += 1
+        self.failed_ids.append(chat_id)
+        self.error_codes.append(ERROR_CATEGORIES.index(category))
+
+    def failures(self) -> Iterator[tuple[int, str]]:
+        """Пары (chat_id, категория ошибки)."""
+        for chat_id, code in zip(self.failed_ids, self.error_codes):
+            yield chat_id, ERROR_CATEGORIES[code]
+
+    def errors_by_category(self) -> dict[str, int]:
+        """Количество неудачных отправок по категориям."""
+        return {ERROR_CATEGORIES[code]: count for code, count in Counter(self.error_codes).items()}
+
+
+class Broadcaster:
+    """Параллельная рассылка с пулом воркеров и общим ограничением скорости.
+
+    Воркеры берут получателей из ограниченной очереди, перед каждой отправкой
+    получают токен из TokenBucket. TelegramRetryAfter не считается ошибкой:
+    весь пул ждёт указанное Telegram время и повторяет отправку.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[int], Awaitable[object]],
+        rate: float = 28,
+        workers: int = 16,
+        max_retries: int = 3,
+        on_progress: Optional[Callable[[BroadcastStats], Awaitable[None]]] = None,
+        progress_every: int = 50,
+    ):
+        """
+        Args:
+            send: Корутина отправки одного сообщения, принимает chat_id.
+            rate: Лимит сообщений в секунду на весь бот (у Telegram около 30).
+            workers: Количество одновременных отправок.
+            max_retries: Сколько раз повторять отправку при сетевой ошибке или 5xx Telegram.
+            on_progress: Необязательный колбэк прогресса, вызывается каждые progress_every сообщений.
+            progress_every: Шаг вызова on_progress.
+        """
+        self.send = send
+        self.bucket = TokenBucket(rate)
+        self.workers = workers
+        self.max_retries = max_retries
+        self.on_progress = on_progress
+        self.progress_every = progress_every
+
+    async def run(
+        self,
+        recipients: Iterable[int],
+        total: Optional[int] = None,
+        stats: Optional[BroadcastStats] = None,
+        stop: Optional[asyncio.Event] = None,
+    ) -> BroadcastStats:
+        """Отправляет сообщение всем получателям.
+
+        Args:
+            recipients: chat_id получателей.
+            total: Общее количество получателей, если recipients не поддерживает len().
+            stats: Объект статистики, который заполняется по ходу отправки; позволяет
+                узнать, кому сообщение уже ушло, если рассылку прервали.
+            stop: Событие остановки: после него новые отправки не начинаются,
+                уже начатые завершаются. Не отправленные получатели не попадают в stats.
+
+        Returns:
+            BroadcastStats: Количество успешных и неудачных отправок.
+        """
+        if stats is None:
+            stats = BroadcastStats(len(recipients) if total is None else total)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+
+        async def producer():
+            for chat_id in recipients:
+                if stop is not None and stop.is_set():
+                    break
+                await queue.put(chat_id)
+            for _ in range(self.workers):
+                await queue.put(None)
+
+        async def worker():
+            while (chat_id := await queue.get()) is not None:
+                if stop is not None and stop.is_set():
+                    # Дочитываем очередь, чтобы producer не завис на put()
+                    continue
+                error = await self._deliver(chat_id, stats)
+                if error is None:
+                    stats.success += 1
+                    stats.sent_ids.append(chat_id)
+                else:
+                    stats.add_failure(chat_id, error)
+                if self.on_progress and stats.processed % self.progress_every == 0:
+                    await self._report(stats)
+
+        await asyncio.gather(producer(), *(worker() for _ in range(self.workers)))
+        stats.finished_at = time.monotonic()
+        outcome = "stopped" if stop is not None and stop.is_set() else "finished"
+        logger.info(
+            f"Broadcast {outcome}: {stats.success}/{stats.total} delivered, {stats.failed} failed, "
+            f"{stats.retry_after} flood waits, {stats.rate:.1f} msg/s, errors: {stats.errors_by_category()}"
+        )
+        return stats
+
+    async def _deliver(self, chat_id: int, stats: BroadcastStats) -> Optional[str]:
+        """Отправляет сообщение одному получателю.
+
+        Returns:
+            Optional[str]: None при успехе, иначе категория ошибки.
+        """
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                await self.send(chat_id)
+                return None
+            except TelegramRetryAfter as e:
+                stats.retry_after += 1
+                logger.warning(f"Flood control, pausing broadcast for {e.retry_after}s")
+                self.bucket.pause(e.retry_after)
+            except (TelegramNetworkError, TelegramServerError) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.error(f"Ошибка при отправке пользователю {chat_id}: {e}")
+                    return ERROR_NETWORK
+                await asyncio.sleep(min(2 ** attempt, 10))
+            except Exception as e:
+                category = classify_error(e)
+                if category in PERMANENT_ERRORS:
+                    # Ожидаемая ситуация, а не сбой: получатель будет исключён из следующих рассылок
+                    logger.info(f"Получатель {chat_id} недоступен ({category}): {e}")
+                else:
+                    logger.error(f"Ошибка при отправке пользователю {chat_id}: {e}")
+                return category
+
+    async def _report(self, stats: BroadcastStats) -> None:
+        try:
+            await self.on_progress(stats)
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {e}")
@@ -0,0 +1,418 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from io import BytesIO
+from typing import AsyncIterator, Callable, Optional
+
+import pandas as pd
+import pytz
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, InlineKeyboardButton, InlineKeyboardMarkup
+
+from admin.services.mailing_store import mailing_store
+from admin.services.utils import (
+    USERS_REPORT_FIELDS, iter_resident_pages, prepare_mailings_frame, prepare_residents_frame, prepare_users_frame,
+)
+from client.services.user import iter_user_pages
+from data.config import config_settings
+from utils.export import EXPORT_FORMATS, ExcelExport, TableExport
+from utils.progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+MOSCOW_TZ = pytz.timezone('Europe/Moscow')
+
+
+class ExportSpec:
+    """Описание выгрузки: откуда брать данные и как оформить файл."""
+
+    def __init__(
+        self,
+        name: str,
+        pages: Callable[[], AsyncIterator[list[dict]]],
+        prepare: Callable[[list[dict]], pd.DataFrame],
+        sheet_title: str,
+        filename: str,
+        caption: str,
+        excel_options: Optional[dict] = None,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+    ):
+        """
+        Args:
+            name: Ключ выгрузки; вместе с форматом задаёт запись кэша и запущенную выгрузку.
+            pages: Возвращает асинхронный итератор страниц из API.
+            prepare: Преобразует страницу в строки отчёта; выполняется в отдельном потоке.
+            sheet_title: Название листа.
+            filename: Начало имени файла, к нему добавляется время выгрузки.
+            caption: Подпись к файлу.
+            excel_options: Дополнительные параметры ExcelExport (только для xlsx).
+            reply_markup: Клавиатура под файлом.
+        """
+        self.name = name
+        self.pages = pages
+        self.prepare = prepare
+        self.sheet_title = sheet_title
+        self.filename = filename
+        self.caption = caption
+        self.excel_options = excel_options or {}
+        self.reply_markup = reply_markup
+
+    def open_export(self, fmt: str) -> TableExport:
+        """Создаёт выгрузку в формате fmt (ключ EXPORT_FORMATS)."""
+        export_class = EXPORT_FORMATS[fmt][0]
+        if export_class is ExcelExport:
+            return ExcelExport(self.sheet_title, **self.excel_options)
+        return export_class(self.sheet_title)
+
+
+class PageSpool:
+    """Страницы из API во временном файле и отпечаток их содержимого.
+
+    Каждая страница записывается одной строкой JSON (с сортировкой ключей),
+    по этим же байтам считается sha256. Если отпечаток совпал с кэшем, файл
+    просто удаляется; иначе выгрузка строится из него без повторных запросов
+    к API, и в файл попадают ровно те данные, по которым посчитан отпечаток.
+    Сериализация и чтение выполняются в отдельном потоке.
+    """
+
+    def __init__(self, name: str):
+        self._hash = hashlib.sha256(name.encode())
+        self._file = tempfile.TemporaryFile()
+        self.rows = 0
+
+    async def append(self, page: list[dict]) -> None:
+        await asyncio.to_thread(self._append, page)
+        self.rows += len(page)
+
+    def _append(self, page: list[dict]) -> None:
+        line = json.dumps(page, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode() + b'\n'
+        self._hash.update(line)
+        self._file.write(line)
+
+    @property
+    def digest(self) -> str:
+        return self._hash.hexdigest()
+
+    async def read(self) -> AsyncIterator[list[dict]]:
+        """Отдаёт записанные страницы по порядку."""
+        await asyncio.to_thread(self._file.seek, 0)
+        while (page := await asyncio.to_thread(self._read_page)) is not None:
+            yield page
+
+    def _read_page(self) -> Optional[list[dict]]:
+        line = self._file.readline()
+        return json.loads(line) if line else None
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ExportCache:
+    """Готовые файлы выгрузок на диске.
+
+    Для каждой выгрузки хранится последний файл, отпечаток данных, из которых
+    он собран, и file_id, который Telegram вернул при первой отправке: пока
+    данные не менялись, файл повторно отправляется по file_id без загрузки.
+    Индекс лежит в index.json рядом с файлами и переживает перезапуск.
+    Записи старше ttl не используются, чтобы изменения оформления отчёта
+    рано или поздно попали в файл, даже если данные те же.
+    """
+
+    def __init__(self, directory: str, ttl: float = 86400, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            directory: Каталог для файлов и индекса.
+            ttl: Сколько секунд файл можно отдавать повторно.
+            clock: Источник времени.
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self._clock = clock
+        self._index: Optional[dict[str, dict]] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def path(self, entry: dict) -> str:
+        """Путь к файлу записи."""
+        return os.path.join(self.directory, entry["file"])
+
+    async def get(self, name: str, digest: str) -> Optional[dict]:
+        """Возвращает запись, если файл собран из тех же данных и ещё лежит на диске."""
+        entry = (await self._entries()).get(name)
+        if (
+            entry is None
+            or entry["digest"] != digest
+            or entry["created_at"] + self.ttl <= self._clock()
+            or not await asyncio.to_thread(os.path.exists, self.path(entry))
+        ):
+            return None
+        return entry
+
+    async def put(self, name: str, digest: str, filename: str, output: BytesIO, rows: int) -> dict:
+        """Сохраняет новый файл выгрузки вместо предыдущего.
+
+        Args:
+            name: Ключ выгрузки.
+            digest: Отпечаток исходных данных.
+            filename: Имя файла для отправки в Telegram.
+            output: Содержимое файла.
+            rows: Число строк (для логов).
+
+        Returns:
+            dict: Запись кэша.
+        """
+        extension = os.path.splitext(filename)[1]
+        entry = {
+            "digest": digest,
+            "file": f"{name}-{digest[:16]}{extension}",
+            "filename": filename,
+            "rows": rows,
+            "created_at": self._clock(),
+            "file_id": None,
+        }
+        async with self._lock:
+            index = await self._entries()
+            previous = index.get(name)
+            await asyncio.to_thread(self._write_file, entry, output)
+            index[name] = entry
+            await asyncio.to_thread(self._save, dict(index))
+            if previous is not None and previous["file"] != entry["file"]:
+                await asyncio.to_thread(self._remove_file, previous)
+        return entry
+
+    async def set_file_id(self, name: str, entry: dict, file_id: Optional[str]) -> None:
+        """Запоминает file_id отправленного файла (None - забыть недействительный)."""
+        async with self._lock:
+            entry["file_id"] = file_id
+            if (await self._entries()).get(name) is entry:
+                await asyncio.to_thread(self._save, dict(self._index))
+
+    async def _entries(self) -> dict[str, dict]:
+        if self._index is None:
+            self._index = await asyncio.to_thread(self._load)
+        return self._index
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Export cache index {self._index_path} is unreadable, starting empty: {e}")
+            return {}
+
+    def _save(self, index: dict[str, dict]) -> None:
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._index_path)
+
+    def _write_file(self, entry: dict, output: BytesIO) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(entry), "wb") as f:
+            f.write(output.getbuffer())
+
+    def _remove_file(self, entry: dict) -> None:
+        try:
+            os.remove(self.path(entry))
+        except FileNotFoundError:
+            pass
+
+
+class ExportJobs:
+    """Фоновые выгрузки для админов.
+
+    Нажатие кнопки выгрузки только ставит задачу: обработчик сразу отвечает, а
+    файл приходит отдельным сообщением, когда готов. Выгрузка определяется
+    описанием (ExportSpec) и форматом; если такая же выгрузка уже идёт (например, два админа нажали кнопку почти одновременно), второй запрос
+    присоединяется к ней и получает тот же файл.
+
+    Данные загружаются один раз (PageSpool) и сравниваются с кэшем по отпечатку:
+    если они не изменились, книга не собирается заново, а Telegram получает
+    file_id уже загруженного файла.
+    """
+
+    def __init__(self, cache: ExportCache):
+        self.cache = cache
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._chats: dict[str, list[int]] = {}
+
+    def submit(self, spec: ExportSpec, fmt: str, bot: Bot, chat_id: int) -> bool:
+        """Запускает выгрузку в фоне; файл будет отправлен в chat_id.
+
+        Args:
+            spec: Описание выгрузки.
+            fmt: Формат файла (ключ EXPORT_FORMATS).
+            bot: Экземпляр бота.
+            chat_id: Чат, куда отправить файл.
+
+        Returns:
+            bool: True, если запущена новая выгрузка; False, если такая уже идёт
+            и файл придёт вместе с ней.
+        """
+        key = f"{spec.name}-{fmt}"
+        chats = self._chats.setdefault(key, [])
+        if chat_id not in chats:
+            chats.append(chat_id)
+        if key in self._tasks:
+            return False
+        self._tasks[key] = asyncio.create_task(self._run(key, spec, fmt, bot, chat_id), name=f"export-{key}")
+        return True
+
+    def _detach(self, key: str) -> list[int]:
+        """Снимает выгрузку с учёта и возвращает чаты, которые ждут файл.
+
+        Запросы, пришедшие после этого, запускают новую выгрузку.
+        """
+        if self._tasks.get(key) is asyncio.current_task():
+            del self._tasks[key]
+            return self._chats.pop(key, [])
+        return []
+
+    async def _run(self, key: str, spec: ExportSpec, fmt: str, bot: Bot, chat_id: int) -> None:
+        progress = None
+        try:
+            progress_msg = await bot.send_message(chat_id, "⏳ Готовим отчет...")
+            progress = ProgressReporter(bot, chat_id, progress_msg.message_id)
+            entry, cached = await self._prepare(key, spec, fmt, progress)
+        except asyncio.CancelledError:
+            self._detach(key)
+            raise
+        except Exception as e:
+            logger.exception(f"Export '{key}' failed: {e}")
+            chats = self._detach(key)
+            if progress:
+                await progress.finish("❌ Отчет не сформирован")
+            await self._notify(bot, chats, "⚠️ Произошла ошибка при генерации отчета")
+            return
+
+        chats = self._detach(key)
+        if entry is None:
+            await progress.finish("❌ Отчет не сформирован")
+            await self._notify(bot, chats, "❌ Нет данных для выгрузки")
+            return
+
+        await progress.finish(
+            "✅ Отчет готов: данные не изменились, отправлен сохранённый файл" if cached else "✅ Отчет готов"
+        )
+        for chat in chats:
+            try:
+                await self._send(key, spec, bot, chat, entry)
+            except Exception as e:
+                logger.exception(f"Failed to send export '{key}' to {chat}: {e}")
+                await self._notify(bot, [chat], "⚠️ Произошла ошибка при отправке отчета")
+
+    async def _prepare(
+        self, key: str, spec: ExportSpec, fmt: str, progress: ProgressReporter
+    ) -> tuple[Optional[dict], bool]:
+        """Загружает данные и возвращает запись кэша с готовым файлом.
+
+        Returns:
+            tuple[Optional[dict], bool]: Запись (None - данных нет) и признак того,
+            что файл взят из кэша.
+        """
+        spool = PageSpool(key)
+        try:
+            async for page in spec.pages():
+                if page:
+                    await spool.append(page)
+                    progress.update(f"⏳ Готовим отчет...\n📥 Загружено строк: {spool.rows}")
+            if not spool.rows:
+                return None, False
+
+            entry = await self.cache.get(key, spool.digest)
+            if entry is not None:
+                logger.info(f"Export '{key}': data unchanged ({spool.rows} rows), reusing cached file")
+                return entry, True
+
+            progress.update(f"⏳ Готовим отчет...\n📥 Загружено строк: {spool.rows}\n📝 Формируем файл")
+            export = spec.open_export(fmt)
+            async for page in spool.read():
+                await export.write(await asyncio.to_thread(spec.prepare, page))
+            output = await export.close()
+            if output is None:
+                return None, False
+            filename = f"{spec.filename}_{datetime.now(tz=MOSCOW_TZ).strftime('%Y%m%d_%H%M%S')}{export.extension}"
+            return await self.cache.put(key, spool.digest, filename, output, spool.rows), False
+        finally:
+            spool.close()
+
+    async def _send(self, key: str, spec: ExportSpec, bot: Bot, chat_id: int, entry: dict) -> None:
+        if entry["file_id"]:
+            try:
+                await bot.send_document(chat_id, entry["file_id"], caption=spec.caption, reply_markup=spec.reply_markup)
+                return
+            except TelegramBadRequest as e:
+                logger.warning(f"Cached file_id of export '{key}' was rejected, uploading the file again: {e}")
+                await self.cache.set_file_id(key, entry, None)
+
+        message = await bot.send_document(
+            chat_id,
+            FSInputFile(self.cache.path(entry), filename=entry["filename"]),
+            caption=spec.caption,
+            reply_markup=spec.reply_markup
+        )
+        await self.cache.set_file_id(key, entry, message.document.file_id)
+
+    @staticmethod
+    async def _notify(bot: Bot, chats: list[int], text: str) -> None:
+        for chat_id in chats:
+            try:
+                await bot.send_message(chat_id, text)
+            except Exception as e:
+                logger.error(f"Failed to notify {chat_id} about export: {e}")
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+USERS_EXPORT = ExportSpec(
+    name="users",
+    pages=lambda: iter_user_pages(fields=USERS_REPORT_FIELDS),
+    prepare=prepare_users_frame,
+    sheet_title='Пользователи',
+    filename="users_report",
+    caption="📊 Отчет по всем пользователям",
+    excel_options={"width_scale": 1.2, "wrap_text": True},
+)
+
+RESIDENTS_EXPORT = ExportSpec(
+    name="residents",
+    pages=iter_resident_pages,
+    prepare=prepare_residents_frame,
+    sheet_title='Резиденты',
+    filename="residents",
+    caption="Полный список резидентов",
+    excel_options={"auto_filter": True},
+    reply_markup=InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_residents_management")]
+    ]),
+)
+
+MAILINGS_EXPORT = ExportSpec(
+    name="mailings",
+    pages=mailing_store.iter_jobs,
+    prepare=prepare_mailings_frame,
+    sheet_title='Рассылки',
+    filename="mailings",
+    caption="📨 История рассылок",
+    excel_options={"wrap_text": True},
+)
+
+# Выгрузки, доступные из кнопок (callback export:<name>:<format>)
+EXPORTS = {spec.name: spec for spec in (USERS_EXPORT, RESIDENTS_EXPORT, MAILINGS_EXPORT)}
+
+export_jobs = ExportJobs(ExportCache(config_settings.EXPORT_CACHE_DIR, ttl=config_settings.EXPORT_CACHE_TTL))
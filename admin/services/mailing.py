@@ -0,0 +1,467 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+import aiofiles.os
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup
+
+from admin.keyboards.admin_inline import admin_link_keyboard, mailing_control_keyboard
+from admin.keyboards.admin_reply import admin_keyboard
+from admin.services.audience import AUDIENCE_UNAVAILABLE_REASON, AudienceUnavailableError, collect_audience
+from admin.services.broadcast import ERROR_BLOCKED, ERROR_NETWORK, ERROR_NOT_FOUND, ERROR_OTHER, Broadcaster, BroadcastStats
+from admin.services.mailing_store import (
+    JOB_CANCELLED, JOB_COLLECTING, JOB_DONE, JOB_PAUSED, JOB_RUNNING, UNFINISHED_STATUSES, mailing_store,
+)
+from data.config import config_settings
+from client.services.user import deactivate_user, reactivate_user
+from data.url import url_mailing
+from utils.backend import backend_client
+from utils.progress import ProgressReporter
+
+logger = logging.getLogger(__name__)
+
+# Сколько получателей записывать в хранилище за один запрос
+RECIPIENTS_INSERT_CHUNK = 5000
+
+# Сколько недоступных получателей сообщать бэкенду одновременно
+REPORT_BLOCKED_CONCURRENCY = 10
+# После скольких неудачных попыток перестать сообщать бэкенду о получателе
+# (в реестре он остаётся, рассылки его по-прежнему пропускают)
+REPORT_BLOCKED_MAX_ATTEMPTS = 5
+
+# Ответы Telegram на copy_message, когда исходное сообщение администратора удалено
+SOURCE_MISSING_ERRORS = ("message to copy not found", "message not found", "there are no messages to")
+
+# Причина отмены рассылки, которую нечем отправлять
+SOURCE_MISSING_REASON = "исходное сообщение удалено, создайте рассылку заново"
+
+ERROR_LABELS = {
+    ERROR_BLOCKED: "заблокировали бота",
+    ERROR_NOT_FOUND: "чат не найден",
+    ERROR_NETWORK: "сетевые ошибки",
+    ERROR_OTHER: "другие ошибки",
+}
+
+
+class MailingControl:
+    """Запрос на остановку выполняющейся рассылки (пауза или отмена).
+
+    Рассылка проверяет запрос между порциями, а Broadcaster по событию stop
+    сразу перестаёт начинать новые отправки, поэтому рассылка останавливается
+    в пределах текущей порции.
+    """
+
+    def __init__(self):
+        self.stop = asyncio.Event()
+        self.status: str | None = None
+
+    def request(self, status: str) -> None:
+        """Просит остановить рассылку.
+
+        Args:
+            status (str): JOB_PAUSED или JOB_CANCELLED.
+        """
+        self.status = status
+        self.stop.set()
+
+
+def unsent_count(job: dict) -> int:
+    """Сколько собранных получателей рассылки ещё не получили сообщение."""
+    return job["total"] - job["skipped"] - job["success"] - job["failed"]
+
+
+async def download_image(bot: Bot, image_id: str) -> str:
+    """Скачивает изображение с сервера Telegram и сохраняет на диск.
+
+    Args:
+        bot (Bot): Экземпляр бота.
+        image_id (str): ID изображения для скачивания.
+
+    Returns:
+        str: Путь к сохранённому файлу.
+
+    Raises:
+        Exception: Если произошла ошибка при скачивании или сохранении.
+
+    Notes:
+        Файл пишется на диск потоково через aiofiles, не блокируя цикл событий;
+        уже сохранённая картинка повторно не скачивается.
+    """
+    # Уникальное имя файла
+    filename = f"{image_id}.jpg"
+    save_path = os.path.join("media", "mailing", "photos", filename)
+
+    if not await aiofiles.os.path.exists(save_path):
+        await aiofiles.os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        file = await bot.get_file(image_id)
+        await bot.download_file(file.file_path, destination=save_path)
+
+    return f"/media/mailing/photos/{filename}"
+
+
+async def send_mailing_content(
+    bot: Bot,
+    chat_id: int,
+    content: dict,
+    reply_markup: InlineKeyboardMarkup | None = None,
+) -> None:
+    """Отправляет содержимое рассылки одному получателю.
+
+    Если известно исходное сообщение администратора, оно копируется через
+    copy_message (альбом - через copy_messages): Telegram переиспользует уже
+    загруженные файлы и сохраняет форматирование, ничего не загружается заново.
+    Иначе отправляется картинка по file_id с подписью и форматированием.
+
+    Args:
+        bot (Bot): Экземпляр бота.
+        chat_id (int): Получатель.
+        content (dict): Рассылка из MailingStore или данные FSM с теми же ключами
+            (text, image_id, entities, source_chat_id, source_message_ids).
+        reply_markup (InlineKeyboardMarkup | None): Кнопка-ссылка (для альбомов не поддерживается).
+    """
+    message_ids = content.get("source_message_ids")
+    if message_ids and len(message_ids) > 1:
+        await bot.copy_messages(chat_id=chat_id, from_chat_id=content["source_chat_id"], message_ids=message_ids)
+    elif message_ids:
+        await bot.copy_message(chat_id=chat_id, from_chat_id=content["source_chat_id"],
+                               message_id=message_ids[0], reply_markup=reply_markup)
+    elif content.get("image_id"):
+        # Форматирование передаётся через entities, поэтому parse_mode бота отключается
+        formatting = {"caption_entities": content["entities"], "parse_mode": None} if content.get("entities") else {}
+        await bot.send_photo(chat_id=chat_id, photo=content["image_id"], caption=content.get("text"),
+                             reply_markup=reply_markup, **formatting)
+    else:
+        formatting = {"entities": content["entities"], "parse_mode": None} if content.get("entities") else {}
+        await bot.send_message(chat_id=chat_id, text=content["text"], reply_markup=reply_markup, **formatting)
+
+
+def is_source_missing(error: Exception) -> bool:
+    """Не удалось скопировать сообщение, потому что исходное сообщение администратора удалено."""
+    return isinstance(error, TelegramBadRequest) and any(
+        text in error.message.lower() for text in SOURCE_MISSING_ERRORS
+    )
+
+
+async def source_available(bot: Bot, job: dict) -> bool:
+    """Проверяет, что исходные сообщения рассылки, которые копируются получателям, ещё существуют.
+
+    Bot API не умеет читать сообщение по ID, поэтому источник без звука копируется
+    в чат администратора, и копия сразу удаляется. Рассылкам без source_message_ids
+    (картинка по file_id или текст) проверка не нужна.
+
+    Args:
+        bot (Bot): Экземпляр бота.
+        job (dict): Рассылка из MailingStore.
+
+    Returns:
+        bool: False, если хотя бы одно исходное сообщение удалено.
+    """
+    message_ids = job.get("source_message_ids")
+    if not message_ids:
+        return True
+    try:
+        copies = await bot.copy_messages(chat_id=job["admin_chat_id"], from_chat_id=job["source_chat_id"],
+                                         message_ids=message_ids, disable_notification=True)
+    except TelegramBadRequest as e:
+        if is_source_missing(e):
+            return False
+        raise
+    try:
+        await bot.delete_messages(chat_id=job["admin_chat_id"], message_ids=[copy.message_id for copy in copies])
+    except TelegramBadRequest as e:
+        logger.warning(f"Mailing {job['id']}: failed to delete source check copies: {e}")
+    # copy_messages пропускает сообщения, которые не нашёл
+    return len(copies) == len(message_ids)
+
+
+async def collect_recipients(job_id: int, audience: list[int] | None = None,
+                             control: MailingControl | None = None) -> bool:
+    """Загружает получателей аудитории из API в хранилище рассылки и переводит её в отправку.
+
+    Повторный вызов для той же рассылки безопасен: уже добавленные получатели не дублируются.
+    Получатели из реестра недоступных (заблокировали бота, чат не найден) исключаются.
+
+    Args:
+        job_id (int): ID рассылки.
+        audience (list[int] | None): ID подписок; None - все пользователи.
+        control (MailingControl | None): Запрос паузы или отмены; сбор прекращается
+            после текущей страницы, и рассылка в отправку не переводится.
+
+    Returns:
+        bool: True, если рассылка переведена в статус JOB_RUNNING; False, если сбор
+        остановлен через control или за время сбора рассылку приостановили или отменили.
+
+    Raises:
+        AudienceUnavailableError: Если бэкенд не отдаёт подписчиков подписки.
+    """
+    stop = control.stop if control else None
+    recipients, skipped = await collect_audience(audience, stop=stop)
+    if stop is not None and stop.is_set():
+        logger.info(f"Mailing {job_id}: recipient collection stopped ({control.status})")
+        return False
+
+    excluded = recipients.exclude(await mailing_store.blocked_chat_ids())
+    chat_ids = recipients.finalize()
+    for start in range(0, len(chat_ids), RECIPIENTS_INSERT_CHUNK):
+        await mailing_store.add_recipients(job_id, chat_ids[start:start + RECIPIENTS_INSERT_CHUNK].tolist())
+
+    await mailing_store.update_job(job_id, total=len(chat_ids) + skipped, skipped=skipped, excluded=excluded)
+    # Статус меняется, только если рассылку не приостановили и не отменили, пока собирались получатели
+    if not await mailing_store.set_status(job_id, JOB_RUNNING, (JOB_COLLECTING,)):
+        logger.info(f"Mailing {job_id}: status changed during recipient collection, not starting")
+        return False
+    logger.info(
+        f"Mailing {job_id}: collected {len(chat_ids)} recipients, {skipped} without tg_id, "
+        f"{excluded} blocked excluded, audience={audience or 'all'}"
+    )
+    return True
+
+
+async def run_mailing_job(bot: Bot, job_id: int, control: MailingControl | None = None) -> None:
+    """Выполняет рассылку порциями с сохранением прогресса после каждой порции.
+
+    Если рассылка была прервана, продолжает с первого недоставленного получателя:
+    получатели из уже сохранённых порций повторно не загружаются и не получают сообщение.
+
+    Args:
+        bot (Bot): Экземпляр бота.
+        job_id (int): ID рассылки.
+        control (MailingControl | None): Запрос паузы или отмены от администратора.
+    """
+    job = await mailing_store.get_job(job_id)
+    if job is None:
+        logger.error(f"Mailing {job_id} not found")
+        return
+    if job["status"] not in UNFINISHED_STATUSES:
+        # Рассылку приостановили или отменили, пока она ждала в очереди
+        logger.info(f"Mailing {job_id} skipped: {job['status']}")
+        return
+    if control is None:
+        control = MailingControl()
+
+    progress = ProgressReporter(bot, job["admin_chat_id"], job["progress_message_id"],
+                                reply_markup=mailing_control_keyboard(job_id))
+    if job["status"] == JOB_COLLECTING:
+        # Пока рассылка ждала своего времени или очереди, администратор мог удалить исходное сообщение
+        if not await source_available(bot, job):
+            logger.warning(f"Mailing {job_id} cancelled: source messages were deleted")
+            await progress.finish(f"❌ Рассылка #{job_id} отменена: {SOURCE_MISSING_REASON}")
+            await finish_mailing_job(bot, job_id, status=JOB_CANCELLED, reason=SOURCE_MISSING_REASON)
+            return
+        progress.update(f"🚀 Рассылка #{job_id} запущена...\n⏳ Собираем список получателей")
+        try:
+            collected = await collect_recipients(job_id, job["audience"], control)
+        except AudienceUnavailableError as e:
+            # Без списка подписчиков рассылка ушла бы пустой аудитории
+            logger.error(f"Mailing {job_id} cancelled: {e}")
+            await progress.finish(f"❌ Рассылка #{job_id} отменена: {AUDIENCE_UNAVAILABLE_REASON}")
+            await finish_mailing_job(bot, job_id, status=JOB_CANCELLED, reason=AUDIENCE_UNAVAILABLE_REASON)
+            return
+        if not collected and not control.stop.is_set():
+            # Статус сменили в обход воркера; сообщение прогресса обновил тот, кто его сменил
+            progress.cancel()
+            return
+        job = await mailing_store.get_job(job_id)
+
+    reply_markup = await admin_link_keyboard(job["button_url"]) if job["button_url"] else None
+
+    cancel_reason = None
+
+    async def send(chat_id: int):
+        nonlocal cancel_reason
+        try:
+            await send_mailing_content(bot, chat_id, job, reply_markup)
+        except TelegramBadRequest as e:
+            # Источник удалили во время рассылки: остальным получателям отправить нечего
+            if is_source_missing(e) and not control.stop.is_set():
+                cancel_reason = SOURCE_MISSING_REASON
+                control.request(JOB_CANCELLED)
+            raise
+
+    success, failed = job["success"], job["skipped"] + job["failed"]
+    total = job["total"]
+
+    def render(title: str, batch_stats: BroadcastStats | None = None) -> str:
+        done_success = success + (batch_stats.success if batch_stats else 0)
+        done_failed = failed + (batch_stats.failed if batch_stats else 0)
+        return (
+            f"{title}\n"
+            f"⏳ Обработано: {done_success + done_failed}/{total}\n"
+            f"✅ Успешно: {done_success}\n"
+            f"❌ Ошибок: {done_failed}"
+        )
+
+    async def on_progress(batch_stats: BroadcastStats):
+        progress.update(render(f"🚀 Рассылка #{job_id} в процессе...", batch_stats))
+
+    broadcaster = Broadcaster(
+        send,
+        rate=config_settings.MAILING_RATE_LIMIT,
+        workers=config_settings.MAILING_WORKERS,
+        on_progress=on_progress,
+        # Частые вызовы не страшны: ProgressReporter сам ограничивает число правок
+        progress_every=10
+    )
+
+    while not control.stop.is_set() and (
+        batch := await mailing_store.pending_batch(job_id, config_settings.MAILING_BATCH_SIZE)
+    ):
+        stats = BroadcastStats(len(batch))
+        try:
+            await broadcaster.run(batch, stats=stats, stop=control.stop)
+        except asyncio.CancelledError:
+            # Сохраняем уже отправленную часть порции, чтобы не повторить её после перезапуска
+            await mailing_store.checkpoint(job_id, stats.sent_ids, stats.failures())
+            progress.cancel()
+            raise
+        await mailing_store.checkpoint(job_id, stats.sent_ids, stats.failures())
+        success += len(stats.sent_ids)
+        failed += len(stats.failed_ids)
+        progress.update(render(f"🚀 Рассылка #{job_id} в процессе..."))
+
+    if control.status == JOB_PAUSED:
+        await mailing_store.update_job(job_id, status=JOB_PAUSED)
+        unsent = total - success - failed
+        logger.info(f"Mailing {job_id} paused, {unsent} recipients left")
+        await progress.finish(render(f"⏸ Рассылка #{job_id} приостановлена") + f"\n📭 Осталось: {unsent}",
+                              reply_markup=mailing_control_keyboard(job_id, paused=True))
+        return
+
+    if control.status == JOB_CANCELLED:
+        title = f"✖️ Рассылка #{job_id} отменена" + (f": {cancel_reason}" if cancel_reason else "")
+        await progress.finish(render(title))
+        await finish_mailing_job(bot, job_id, status=JOB_CANCELLED, reason=cancel_reason)
+    else:
+        await progress.finish(render(f"🏁 Рассылка #{job_id} отправлена"))
+        await finish_mailing_job(bot, job_id)
+    await report_blocked_chats()
+
+
+async def report_blocked_chats() -> int:
+    """Сообщает бэкенду о недоступных получателях, которые ещё не были переданы.
+
+    За вызов каждый получатель запрашивается не больше одного раза. Неудачная
+    попытка засчитывается, и после REPORT_BLOCKED_MAX_ATTEMPTS попыток получатель
+    больше не передаётся.
+
+    Returns:
+        int: Сколько получателей помечено неактивными.
+    """
+    reported = 0
+    last_chat_id = None
+    while chat_ids := await mailing_store.unreported_blocked(
+        REPORT_BLOCKED_CONCURRENCY, REPORT_BLOCKED_MAX_ATTEMPTS, after=last_chat_id
+    ):
+        last_chat_id = chat_ids[-1]
+        results = await asyncio.gather(*(deactivate_user(chat_id) for chat_id in chat_ids))
+        done = [chat_id for chat_id, ok in zip(chat_ids, results) if ok]
+        failed = [chat_id for chat_id, ok in zip(chat_ids, results) if not ok]
+        if done:
+            await mailing_store.mark_reported(done)
+            reported += len(done)
+        if failed:
+            given_up = await mailing_store.mark_report_failed(failed, REPORT_BLOCKED_MAX_ATTEMPTS)
+            if given_up:
+                logger.error(f"Gave up reporting {given_up} blocked recipients to backend "
+                             f"after {REPORT_BLOCKED_MAX_ATTEMPTS} attempts")
+        if not done:
+            # Бэкенд недоступен - попробуем после следующей рассылки
+            break
+    if reported:
+        logger.info(f"Reported {reported} blocked recipients to backend")
+    return reported
+
+
+async def unblock_recipient(tg_id: int) -> bool:
+    """Возвращает пользователя в рассылки, когда он снова запустил бота.
+
+    Убирает его из реестра недоступных получателей и, если он там был,
+    снимает на бэкенде отметку is_active=False, поставленную report_blocked_chats.
+
+    Returns:
+        bool: True, если пользователь был в реестре.
+    """
+    if not await mailing_store.unblock_chat(tg_id):
+        return False
+    if not await reactivate_user(tg_id):
+        logger.error(f"Recipient {tg_id} unblocked locally but is still inactive on backend")
+    return True
+
+
+async def finish_mailing_job(bot: Bot, job_id: int, status: str = JOB_DONE, reason: str | None = None) -> None:
+    """Сохраняет рассылку через API и отправляет отчёт администратору.
+
+    Args:
+        bot (Bot): Экземпляр бота.
+        job_id (int): ID рассылки.
+        status (str): JOB_DONE или JOB_CANCELLED; отменённая рассылка сохраняется
+            в API, только если кому-то уже была отправлена.
+        reason (str | None): Почему рассылка отменена, если её отменил не администратор.
+    """
+    job = await mailing_store.get_job(job_id)
+    total = job["total"]
+    success = job["success"]
+    failed = job["skipped"] + job["failed"]
+    unsent = unsent_count(job)
+
+    # Отмечаем завершение до сохранения в API, чтобы после перезапуска не создать дубликат
+    await mailing_store.update_job(job_id, status=status, finished_at=datetime.now().isoformat(timespec="seconds"))
+
+    cancelled = f"✖️ Рассылка #{job_id} отменена" + (f": {reason}" if reason else "")
+    if status == JOB_CANCELLED and not success + job["failed"]:
+        text = cancelled if reason else f"{cancelled} до начала отправки"
+        await bot.send_message(job["admin_chat_id"], text, reply_markup=admin_keyboard())
+        return
+
+    image_path = None
+    if job["image_id"]:
+        try:
+            image_path = await download_image(bot, job["image_id"])
+        except Exception as e:
+            logger.error(f"Не удалось сохранить картинку рассылки {job_id}: {e}")
+
+    mailing_data = {
+        "text": job["text"],
+        "image": image_path,
+        "button_url": job["button_url"],
+        "type": "other",
+        "tg_user_id": job["admin_user_id"],
+        "total_recipients": total,
+        "successful_deliveries": success,
+        "failed_deliveries": failed
+    }
+
+    try:
+        async with backend_client.post(url_mailing, json=mailing_data) as response:
+            if response.status != 201:
+                error = await response.text()
+                logger.error(f"Ошибка сохранения рассылки: {response.status} - {error}")
+    except Exception as e:
+        logger.error(f"Ошибка при сохранении рассылки: {e}")
+
+    title = cancelled if status == JOB_CANCELLED else f"📊 Рассылка #{job_id} завершена!"
+    report = (
+        f"{title}\n"
+        f"• Всего пользователей: {total}\n"
+        f"• Успешно отправлено: {success}\n"
+        f"• Не удалось отправить: {failed}"
+    )
+    if status == JOB_CANCELLED:
+        report += f"\n• Не отправлено из-за отмены: {unsent}"
+
+    if failed > 0:
+        breakdown = [
+            f"• {ERROR_LABELS.get(category, category)}: {count}"
+            for category, count in (await mailing_store.failures_by_category(job_id)).items()
+        ]
+        if job["skipped"]:
+            breakdown.append(f"• без tg_id: {job['skipped']}")
+        report += "\n\nПричины ошибок:\n" + "\n".join(breakdown)
+
+    if job["excluded"]:
+        report += f"\n\nИсключено ранее заблокировавших бота: {job['excluded']}"
+
+    await bot.send_message(job["admin_chat_id"], report, reply_markup=admin_keyboard())
@@ -0,0 +1,96 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from admin.services.mailing_store import mailing_store
+from admin.services.mailing_worker import mailing_worker
+
+logger = logging.getLogger(__name__)
+
+
+class MailingScheduler:
+    """Планировщик отложенных рассылок.
+
+    Все запланированные рассылки лежат в одной куче (время запуска, id), и один
+    цикл спит до ближайшего срока - независимо от числа рассылок не создаётся
+    ни одной задачи на рассылку. Добавление и отмена стоят O(log n).
+    Сроки хранятся в MailingStore, поэтому после перезапуска куча
+    восстанавливается, а просроченные рассылки запускаются сразу.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._heap: list[tuple[float, int]] = []
+        # Отменённые рассылки удаляются из кучи лениво, когда доходит их очередь
+        self._cancelled: set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Загружает запланированные рассылки из хранилища и запускает цикл."""
+        if self._task is not None:
+            return
+        self._heap = [
+            (datetime.fromisoformat(scheduled_at).timestamp(), job_id)
+            for job_id, scheduled_at in await mailing_store.scheduled_jobs()
+        ]
+        heapq.heapify(self._heap)
+        if self._heap:
+            logger.info(f"Mailing scheduler restored {len(self._heap)} scheduled jobs")
+        self._task = asyncio.create_task(self._run(), name="mailing-scheduler")
+
+    def schedule(self, job_id: int, when: datetime) -> None:
+        """Добавляет рассылку (уже сохранённую со статусом JOB_SCHEDULED) в расписание."""
+        self._cancelled.discard(job_id)
+        heapq.heappush(self._heap, (when.timestamp(), job_id))
+        # Будим цикл: новая рассылка может оказаться раньше текущей ближайшей
+        self._wakeup.set()
+
+    def cancel(self, job_id: int) -> None:
+        """Убирает рассылку из расписания."""
+        self._cancelled.add(job_id)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            fire_at, job_id = self._heap[0]
+            delay = fire_at - self._clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+            try:
+                # Запуск не прерывается остановкой бота: иначе рассылка могла бы сменить
+                # статус, но не попасть в очередь воркера
+                await asyncio.shield(self._fire(job_id, lateness=-delay))
+            except Exception as e:
+                logger.exception(f"Failed to start scheduled mailing {job_id}: {e}")
+
+    async def _fire(self, job_id: int, lateness: float) -> None:
+        if not await mailing_store.start_scheduled(job_id):
+            return
+        mailing_worker.submit(job_id)
+        logger.info(f"Scheduled mailing {job_id} started ({lateness * 1000:.0f} ms after its time)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+mailing_scheduler = MailingScheduler()
@@ -0,0 +1,379 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import AsyncIterator, Iterable
+
+import aiosqlite
+
+from admin.services.broadcast import ERROR_OTHER, PERMANENT_ERRORS
+from data.config import config_settings
+
+logger = logging.getLogger(__name__)
+
+
+# Статусы получателя
+PENDING = 0
+SENT = 1
+FAILED = 2
+
+# Статусы рассылки
+JOB_SCHEDULED = "scheduled"
+JOB_COLLECTING = "collecting"
+JOB_RUNNING = "running"
+JOB_PAUSED = "paused"
+JOB_CANCELLED = "cancelled"
+JOB_DONE = "done"
+UNFINISHED_STATUSES = (JOB_COLLECTING, JOB_RUNNING)
+# Рассылки, которые ещё можно отменить
+CANCELLABLE_STATUSES = (JOB_SCHEDULED, JOB_PAUSED, *UNFINISHED_STATUSES)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mailing_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL,
+    text TEXT,
+    image_id TEXT,
+    button_url TEXT,
+    audience TEXT,
+    source_chat_id INTEGER,
+    source_message_ids TEXT,
+    entities TEXT,
+    scheduled_at TEXT,
+    admin_chat_id INTEGER NOT NULL,
+    admin_user_id INTEGER NOT NULL,
+    progress_message_id INTEGER,
+    total INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    excluded INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS mailing_recipients (
+    job_id INTEGER NOT NULL REFERENCES mailing_jobs(id) ON DELETE CASCADE,
+    chat_id INTEGER NOT NULL,
+    status INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    PRIMARY KEY (job_id, chat_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_mailing_recipients_pending
+    ON mailing_recipients (job_id, status, chat_id);
+
+CREATE INDEX IF NOT EXISTS idx_mailing_jobs_status
+    ON mailing_jobs (status);
+
+CREATE TABLE IF NOT EXISTS blocked_chats (
+    chat_id INTEGER PRIMARY KEY,
+    reason TEXT NOT NULL,
+    blocked_at TEXT NOT NULL,
+    reported INTEGER NOT NULL DEFAULT 0,
+    report_attempts INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+"""
+
+# Колонки с JSON, которые декодируются при чтении рассылки
+JSON_COLUMNS = ("audience", "source_message_ids", "entities")
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _dumps(value) -> str | None:
+    return json.dumps(value) if value else None
+
+
+class MailingStore:
+    """Хранилище рассылок в SQLite: строка рассылки и статус каждого получателя.
+
+    Позволяет продолжить рассылку после перезапуска бота с первого
+    недоставленного получателя, не отправляя сообщение повторно тем,
+    кому оно уже ушло.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Путь к файлу базы SQLite.
+        """
+        self.path = path
+        self._db: aiosqlite.Connection | None = None
+
+    async def open(self) -> None:
+        """Открывает базу и создаёт таблицы при первом запуске."""
+        if self._db is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = await aiosqlite.connect(self.path)
+        self._db.row_factory = aiosqlite.Row
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        await self._db.execute("PRAGMA foreign_keys=ON")
+        await self._db.executescript(SCHEMA)
+        await self._db.commit()
+        logger.info(f"Mailing store opened at {self.path}")
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    @property
+    def db(self) -> aiosqlite.Connection:
+        if self._db is None:
+            raise RuntimeError("MailingStore is not opened")
+        return self._db
+
+    async def create_job(
+        self,
+        text: str | None,
+        image_id: str | None,
+        button_url: str | None,
+        admin_chat_id: int,
+        admin_user_id: int,
+        audience: list[int] | None = None,
+        source_chat_id: int | None = None,
+        source_message_ids: list[int] | None = None,
+        entities: list[dict] | None = None,
+        scheduled_at: datetime | None = None,
+    ) -> int:
+        """Создаёт рассылку в статусе сбора получателей (или запланированную).
+
+        Args:
+            audience: ID подписок, по которым отбираются получатели; None - все пользователи.
+            source_chat_id: Чат с исходным сообщением администратора.
+            source_message_ids: ID исходных сообщений (несколько - альбом); если заданы,
+                рассылка копирует их через copy_message вместо отправки text/image_id.
+            entities: Форматирование текста (MessageEntity) для отправки картинки с подписью.
+            scheduled_at: Время отправки (с часовым поясом); рассылка создаётся в статусе
+                JOB_SCHEDULED и запускается планировщиком.
+
+        Returns:
+            int: ID рассылки.
+        """
+        now = _now()
+        cursor = await self.db.execute(
+            "INSERT INTO mailing_jobs (status, text, image_id, button_url, audience, source_chat_id, "
+            "source_message_ids, entities, scheduled_at, admin_chat_id, admin_user_id, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (JOB_SCHEDULED if scheduled_at else JOB_COLLECTING, text, image_id, button_url, _dumps(audience),
+             source_chat_id, _dumps(source_message_ids), _dumps(entities),
+             scheduled_at.isoformat() if scheduled_at else None, admin_chat_id, admin_user_id, now, now),
+        )
+        await self.db.commit()
+        return cursor.lastrowid
+
+    async def get_job(self, job_id: int) -> dict | None:
+        async with self.db.execute("SELECT * FROM mailing_jobs WHERE id = ?", (job_id,)) as cursor:
+            row = await cursor.fetchone()
+        return self._job(row) if row else None
+
+    async def unfinished_jobs(self) -> list[dict]:
+        """Рассылки, прерванные перезапуском бота."""
+        placeholders = ", ".join("?" * len(UNFINISHED_STATUSES))
+        async with self.db.execute(
+            f"SELECT * FROM mailing_jobs WHERE status IN ({placeholders}) ORDER BY id",
+            UNFINISHED_STATUSES,
+        ) as cursor:
+            return [self._job(row) for row in await cursor.fetchall()]
+
+    async def scheduled_jobs(self) -> list[tuple[int, str]]:
+        """Запланированные рассылки: пары (id, scheduled_at в ISO-формате)."""
+        async with self.db.execute(
+            "SELECT id, scheduled_at FROM mailing_jobs WHERE status = ?", (JOB_SCHEDULED,)
+        ) as cursor:
+            return [(row[0], row[1]) for row in await cursor.fetchall()]
+
+    async def start_scheduled(self, job_id: int) -> bool:
+        """Переводит запланированную рассылку в статус сбора получателей.
+
+        Returns:
+            bool: False, если рассылка уже не запланирована (например, отменена).
+        """
+        cursor = await self.db.execute(
+            "UPDATE mailing_jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (JOB_COLLECTING, _now(), job_id, JOB_SCHEDULED),
+        )
+        await self.db.commit()
+        return cursor.rowcount > 0
+
+    async def set_status(self, job_id: int, status: str, expected: Iterable[str]) -> bool:
+        """Меняет статус рассылки, только если текущий статус входит в expected.
+
+        Returns:
+            bool: False, если рассылка в другом статусе (например, уже завершена).
+        """
+        expected = tuple(expected)
+        placeholders = ", ".join("?" * len(expected))
+        cursor = await self.db.execute(
+            f"UPDATE mailing_jobs SET status = ?, updated_at = ? WHERE id = ? AND status IN ({placeholders})",
+            (status, _now(), job_id, *expected),
+        )
+        await self.db.commit()
+        return cursor.rowcount > 0
+
+    async def resume_job(self, job_id: int) -> bool:
+        """Снимает рассылку с паузы.
+
+        Рассылка, приостановленная до сбора получателей (total = 0), продолжается со сбора.
+
+        Returns:
+            bool: False, если рассылка не на паузе.
+        """
+        cursor = await self.db.execute(
+            "UPDATE mailing_jobs SET status = CASE WHEN total = 0 THEN ? ELSE ? END, updated_at = ? "
+            "WHERE id = ? AND status = ?",
+            (JOB_COLLECTING, JOB_RUNNING, _now(), job_id, JOB_PAUSED),
+        )
+        await self.db.commit()
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _job(row: aiosqlite.Row) -> dict:
+        job = dict(row)
+        for column in JSON_COLUMNS:
+            job[column] = json.loads(job[column]) if job.get(column) else None
+        return job
+
+    async def update_job(self, job_id: int, **fields) -> None:
+        """Обновляет поля рассылки (status, progress_message_id, total, finished_at и т.п.)."""
+        fields["updated_at"] = _now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        await self.db.execute(
+            f"UPDATE mailing_jobs SET {assignments} WHERE id = ?",
+            (*fields.values(), job_id),
+        )
+        await self.db.commit()
+
+    async def add_recipients(self, job_id: int, chat_ids: list[int]) -> None:
+        """Добавляет получателей; повторное добавление того же chat_id игнорируется."""
+        await self.db.executemany(
+            "INSERT OR IGNORE INTO mailing_recipients (job_id, chat_id) VALUES (?, ?)",
+            ((job_id, chat_id) for chat_id in chat_ids),
+        )
+        await self.db.commit()
+
+    async def pending_batch(self, job_id: int, limit: int) -> list[int]:
+        """Следующая порция получателей, которым сообщение ещё не отправлялось."""
+        async with self.db.execute(
+            "SELECT chat_id FROM mailing_recipients WHERE job_id = ? AND status = ? ORDER BY chat_id LIMIT ?",
+            (job_id, PENDING, limit),
+        ) as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def checkpoint(self, job_id: int, sent: Iterable[int], failed: Iterable[tuple[int, str]]) -> None:
+        """Фиксирует результат отправки порции одной транзакцией.
+
+        Args:
+            sent: chat_id, которым сообщение доставлено.
+            failed: Пары (chat_id, категория ошибки). Получатели с постоянной ошибкой
+                (бот заблокирован, чат не найден) попадают в реестр blocked_chats.
+        """
+        sent = list(sent)
+        failed = list(failed)
+        await self.db.executemany(
+            "UPDATE mailing_recipients SET status = ?, error = ? WHERE job_id = ? AND chat_id = ?",
+            [(SENT, None, job_id, chat_id) for chat_id in sent]
+            + [(FAILED, error, job_id, chat_id) for chat_id, error in failed],
+        )
+        now = _now()
+        await self.db.executemany(
+            "INSERT OR IGNORE INTO blocked_chats (chat_id, reason, blocked_at) VALUES (?, ?, ?)",
+            [(chat_id, error, now) for chat_id, error in failed if error in PERMANENT_ERRORS],
+        )
+        await self.db.execute(
+            "UPDATE mailing_jobs SET success = success + ?, failed = failed + ?, updated_at = ? WHERE id = ?",
+            (len(sent), len(failed), now, job_id),
+        )
+        await self.db.commit()
+
+    async def failures_by_category(self, job_id: int) -> dict[str, int]:
+        """Количество неудачных отправок рассылки по категориям ошибок."""
+        async with self.db.execute(
+            "SELECT error, COUNT(*) FROM mailing_recipients WHERE job_id = ? AND status = ? GROUP BY error",
+            (job_id, FAILED),
+        ) as cursor:
+            return {row[0] or ERROR_OTHER: row[1] for row in await cursor.fetchall()}
+
+    async def iter_jobs(self, page_size: int = 500) -> AsyncIterator[list[dict]]:
+        """История рассылок для выгрузки: страницы по возрастанию id (поиск по ключу, без OFFSET).
+
+        Поля audience остаются JSON-строками, служебные поля (сообщения-источники,
+        форматирование) не читаются.
+        """
+        last_id = 0
+        while True:
+            async with self.db.execute(
+                "SELECT id, status, text, audience, scheduled_at, total, skipped, excluded, success, failed, "
+                "created_at, finished_at FROM mailing_jobs WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, page_size),
+            ) as cursor:
+                rows = [dict(row) for row in await cursor.fetchall()]
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]["id"]
+
+    async def blocked_chat_ids(self) -> list[int]:
+        """chat_id из реестра недоступных получателей."""
+        async with self.db.execute("SELECT chat_id FROM blocked_chats") as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def unblock_chat(self, chat_id: int) -> bool:
+        """Убирает получателя из реестра (например, он снова запустил бота).
+
+        Returns:
+            bool: True, если получатель был в реестре.
+        """
+        cursor = await self.db.execute("DELETE FROM blocked_chats WHERE chat_id = ?", (chat_id,))
+        await self.db.commit()
+        return cursor.rowcount > 0
+
+    async def unreported_blocked(self, limit: int, max_attempts: int, after: int | None = None) -> list[int]:
+        """Недоступные получатели, о которых ещё не сообщили бэкенду.
+
+        Args:
+            limit: Сколько получателей вернуть.
+            max_attempts: Получатели с таким числом неудачных попыток больше не возвращаются.
+            after: Вернуть только chat_id больше указанного (обход по порядку).
+        """
+        async with self.db.execute(
+            "SELECT chat_id FROM blocked_chats WHERE reported = 0 AND report_attempts < ? AND chat_id > ?"
+            " ORDER BY chat_id LIMIT ?",
+            (max_attempts, after if after is not None else -(1 << 63), limit),
+        ) as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def mark_reported(self, chat_ids: list[int]) -> None:
+        await self.db.executemany(
+            "UPDATE blocked_chats SET reported = 1 WHERE chat_id = ?",
+            ((chat_id,) for chat_id in chat_ids),
+        )
+        await self.db.commit()
+
+    async def mark_report_failed(self, chat_ids: list[int], max_attempts: int) -> int:
+        """Засчитывает неудачную попытку сообщить бэкенду о получателях.
+
+        Returns:
+            int: Сколько из них исчерпали max_attempts и больше не будут переданы.
+        """
+        await self.db.executemany(
+            "UPDATE blocked_chats SET report_attempts = report_attempts + 1 WHERE chat_id = ?",
+            ((chat_id,) for chat_id in chat_ids),
+        )
+        await self.db.commit()
+        placeholders = ",".join("?" * len(chat_ids))
+        async with self.db.execute(
+            f"SELECT COUNT(*) FROM blocked_chats WHERE report_attempts >= ? AND chat_id IN ({placeholders})",
+            (max_attempts, *chat_ids),
+        ) as cursor:
+            return (await cursor.fetchone())[0]
+
+mailing_store = MailingStore(config_settings.MAILING_DB_PATH)
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+
+from admin.services.mailing import MailingControl, run_mailing_job
+from admin.services.mailing_store import (
+    CANCELLABLE_STATUSES, JOB_CANCELLED, JOB_PAUSED, UNFINISHED_STATUSES, mailing_store,
+)
+from data.config import config_settings
+from utils.outbound import PRIORITY_BULK, setup_outbound
+
+logger = logging.getLogger(__name__)
+
+
+class MailingWorker:
+    """Фоновый исполнитель рассылок.
+
+    Рассылки ставятся в очередь и выполняются строго по одной, поэтому
+    одновременно работает только один Broadcaster и бот не превышает
+    MAILING_RATE_LIMIT. Отправка идёт через отдельный экземпляр Bot со своим
+    пулом соединений, чтобы массовая рассылка не занимала соединения,
+    через которые обработчики отвечают пользователям. Общий лимит Telegram
+    рассылка делит с остальными сообщениями через OutboundScheduler.
+
+    Паузу и отмену выполняющаяся рассылка обрабатывает сама через MailingControl,
+    рассылка из очереди просто убирается из неё.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._waiting: list[int] = []
+        self._current: Optional[int] = None
+        self._control: Optional[MailingControl] = None
+        self._task: Optional[asyncio.Task] = None
+        self._bot: Optional[Bot] = None
+
+    async def start(self, bot: Bot) -> None:
+        """Запускает воркер и ставит в очередь рассылки, прерванные перезапуском.
+
+        Args:
+            bot: Основной экземпляр бота; воркер создаёт копию с тем же токеном
+                и настройками, но с собственной HTTP-сессией.
+        """
+        if self._task is not None:
+            return
+        self._bot = Bot(
+            token=bot.token,
+            session=AiohttpSession(api=bot.session.api, limit=config_settings.MAILING_WORKERS),
+            default=bot.default,
+        )
+        # Рассылка идёт через общую очередь исходящих с низшим приоритетом
+        setup_outbound(self._bot, default_priority=PRIORITY_BULK)
+        self._task = asyncio.create_task(self._run(), name="mailing-worker")
+
+        for job in await mailing_store.unfinished_jobs():
+            logger.info(f"Resuming mailing {job['id']} ({job['status']}, {job['success'] + job['failed']}/{job['total']} done)")
+            self.submit(job["id"])
+
+    def submit(self, job_id: int) -> int:
+        """Ставит рассылку в очередь.
+
+        Returns:
+            int: Сколько рассылок будет выполнено перед ней.
+        """
+        if job_id == self._current or job_id in self._waiting:
+            return self.position(job_id)
+        self._waiting.append(job_id)
+        self._queue.put_nowait(job_id)
+        return self.position(job_id)
+
+    @property
+    def backlog(self) -> int:
+        """Сколько рассылок выполняется и ждёт в очереди."""
+        return len(self._waiting) + (self._current is not None)
+
+    @property
+    def current(self) -> Optional[int]:
+        """ID выполняющейся рассылки."""
+        return self._current
+
+    def position(self, job_id: int) -> int:
+        """Сколько рассылок выполняется или ждёт перед указанной (0 - она выполняется сейчас)."""
+        if job_id == self._current:
+            return 0
+        if job_id not in self._waiting:
+            return self.backlog
+        return self._waiting.index(job_id) + (self._current is not None)
+
+    async def pause(self, job_id: int) -> bool:
+        """Приостанавливает рассылку.
+
+        Выполняющаяся рассылка завершает уже начатые отправки, сохраняет прогресс и
+        сама обновляет сообщение прогресса.
+
+        Returns:
+            bool: False, если рассылка не выполняется и не ждёт в очереди.
+        """
+        if job_id == self._current:
+            self._control.request(JOB_PAUSED)
+            return True
+        self._discard(job_id)
+        return await mailing_store.set_status(job_id, JOB_PAUSED, UNFINISHED_STATUSES)
+
+    async def resume(self, job_id: int) -> Optional[int]:
+        """Снимает рассылку с паузы и ставит её в очередь.
+
+        Returns:
+            Optional[int]: Сколько рассылок будет выполнено перед ней; None, если рассылка не на паузе.
+        """
+        if not await mailing_store.resume_job(job_id):
+            return None
+        return self.submit(job_id)
+
+    async def cancel(self, job_id: int) -> bool:
+        """Отменяет рассылку: запланированную, приостановленную, ждущую в очереди или выполняющуюся.
+
+        Выполняющаяся рассылка сама сохраняет прогресс и отправляет отчёт; для остальных
+        отчёт отправляет вызывающий код (finish_mailing_job).
+
+        Returns:
+            bool: False, если рассылка уже завершена или отменена.
+        """
+        if job_id == self._current:
+            self._control.request(JOB_CANCELLED)
+            return True
+        self._discard(job_id)
+        return await mailing_store.set_status(job_id, JOB_CANCELLED, CANCELLABLE_STATUSES)
+
+    def _discard(self, job_id: int) -> None:
+        # Из asyncio.Queue нельзя удалить элемент: _run пропустит его, не найдя в _waiting
+        if job_id in self._waiting:
+            self._waiting.remove(job_id)
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            if job_id not in self._waiting:
+                continue
+            self._waiting.remove(job_id)
+            self._current = job_id
+            self._control = MailingControl()
+            try:
+                await run_mailing_job(self._bot, job_id, self._control)
+            except asyncio.CancelledError:
+                logger.info(f"Mailing {job_id} interrupted, it will resume after restart")
+                raise
+            except Exception as e:
+                logger.exception(f"Mailing {job_id} failed: {e}")
+            finally:
+                self._current = None
+                self._control = None
+
+    async def stop(self) -> None:
+        """Останавливает воркер; сохранённый прогресс используется при следующем запуске."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # Незавершённые рассылки снова попадут в очередь из хранилища при следующем start()
+        self._queue = asyncio.Queue()
+        self._waiting.clear()
+        if self._bot is not None:
+            await self._bot.session.close()
+            self._bot = None
+
+
+mailing_worker = MailingWorker()
@@ -3,10 +3,13 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from data.config import config_settings
 from data.url import url_category, url_resident
-from typing import Optional
+from admin.services.mailing_store import (
+    JOB_CANCELLED, JOB_COLLECTING, JOB_DONE, JOB_PAUSED, JOB_RUNNING, JOB_SCHEDULED,
+)
+from utils.backend import backend_client
+from utils.export import format_datetime, join_names, non_empty_strings, yes_no
 import pandas as pd
-from io import BytesIO
-from typing import Tuple, Optional, List, Dict
+from typing import AsyncIterator, Optional
 
 import logging
 logger = logging.getLogger(__name__)
@@ -18,48 +21,40 @@ logger = logging.getLogger(__name__)
 
 
 async def fetch_categories(tree: bool = False) -> list[dict]:
-    """Получение списка категорий из API"""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-                f"{url_category}?tree={'true' if tree else 'false'}",
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-        ) as response:
-            response.raise_for_status()
-            return await response.json()
+    """Получение списка категорий из API (кэш с отдачей устаревшей копии при недоступности API)"""
+    return await backend_client.get_json(
+        url_category,
+        params={"tree": 'true' if tree else 'false'},
+        ttl=config_settings.CACHE_TTL_CATEGORIES,
+        stale_ttl=config_settings.CACHE_MAX_STALE
+    )
 
 
 async def create_category(name: str, parent_id: Optional[int] = None) -> dict:
     """Создание новой категории через API"""
-    async with aiohttp.ClientSession() as session:
-        data = {"name": name}
-        if parent_id:
-            data["parent"] = parent_id
-
-        async with session.post(
-                url_category,
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()},
-                json=data
-        ) as response:
-            response.raise_for_status()
-            return await response.json()
+    data = {"name": name}
+    if parent_id:
+        data["parent"] = parent_id
+
+    async with backend_client.post(url_category, json=data) as response:
+        response.raise_for_status()
+        backend_client.invalidate(url_category)
+        return await response.json()
 
 
 async def delete_category(category_id: int) -> bool:
     """Удаление категории через API"""
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.delete(
-                f"{url_category}{category_id}/",
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 404:
-                    logger.error(f"Категория с ID {category_id} не найдена")
-                    return False
-                response.raise_for_status()
-                return response.status == 204
-        except Exception as e:
-            logger.error(f"Ошибка при удалении категории {category_id}: {str(e)}")
-            return False
+    try:
+        async with backend_client.delete(backend_client.url(url_category, category_id)) as response:
+            if response.status == 404:
+                logger.error(f"Категория с ID {category_id} не найдена")
+                return False
+            response.raise_for_status()
+            backend_client.invalidate(url_category)
+            return response.status == 204
+    except Exception as e:
+        logger.error(f"Ошибка при удалении категории {category_id}: {str(e)}")
+        return False
 
 
 async def format_categories_list(categories: list) -> str:
@@ -122,62 +117,57 @@ async def fetch_categories_with_keyboard(tree: bool = True, cancel_callback: str
     Получает категории и строит иерархическую клавиатуру (по одной кнопке в ряду)
     Возвращает кортеж (список категорий, клавиатура)
     """
-    async with aiohttp.ClientSession() as session:
+    try:
         try:
-            async with session.get(
-                    f"{url_category}?tree={'true' if tree else 'false'}",
-                    headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Ошибка загрузки категорий: {error_text}")
-
-                categories = await response.json()
-                builder = InlineKeyboardBuilder()
-
-                # Собираем все ID подкатегорий
-                subcategory_ids = set()
-
-                def collect_child_ids(cat):
-                    for child in cat.get('children', []):
-                        subcategory_ids.add(child['id'])
-                        collect_child_ids(child)
-
-                for cat in categories:
-                    collect_child_ids(cat)
-
-                def add_category_buttons(cats, level=0):
-                    for cat in cats:
-                        # Пропускаем подкатегории в основном списке
-                        if level == 0 and cat['id'] in subcategory_ids:
-                            continue
-
-                        # Добавляем кнопку категории в отдельный ряд
-                        btn_text = "    " * level + ("- подкатегория:  " if level > 0 else "") + cat['name']
-                        builder.add(InlineKeyboardButton(
-                            text=btn_text,
-                            callback_data=f"select_category_{cat['id']}"
-                        ))
-
-                        # Рекурсивно добавляем дочерние категории
-                        if cat.get('children'):
-                            add_category_buttons(cat['children'], level + 1)
-
-                add_category_buttons(categories)
-
-                # Добавляем кнопку отмены в отдельный ряд
+            categories = await fetch_categories(tree=tree)
+        except aiohttp.ClientResponseError as e:
+            raise Exception(f"Ошибка загрузки категорий: {e.status} {e.message}")
+
+        builder = InlineKeyboardBuilder()
+
+        # Собираем все ID подкатегорий
+        subcategory_ids = set()
+
+        def collect_child_ids(cat):
+            for child in cat.get('children', []):
+                subcategory_ids.add(child['id'])
+                collect_child_ids(child)
+
+        for cat in categories:
+            collect_child_ids(cat)
+
+        def add_category_buttons(cats, level=0):
+            for cat in cats:
+                # Пропускаем подкатегории в основном списке
+                if level == 0 and cat['id'] in subcategory_ids:
+                    continue
+
+                # Добавляем кнопку категории в отдельный ряд
+                btn_text = "    " * level + ("- подкатегория:  " if level > 0 else "") + cat['name']
                 builder.add(InlineKeyboardButton(
-                    text="◀️ Отмена",
-                    callback_data=cancel_callback
+                    text=btn_text,
+                    callback_data=f"select_category_{cat['id']}"
                 ))
 
-                # Устанавливаем по одной кнопке в ряду
-                builder.adjust(1)
+                # Рекурсивно добавляем дочерние категории
+                if cat.get('children'):
+                    add_category_buttons(cat['children'], level + 1)
+
+        add_category_buttons(categories)
+
+        # Добавляем кнопку отмены в отдельный ряд
+        builder.add(InlineKeyboardButton(
+            text="◀️ Отмена",
+            callback_data=cancel_callback
+        ))
+
+        # Устанавливаем по одной кнопке в ряду
+        builder.adjust(1)
 
-                return categories, builder.as_markup()
+        return categories, builder.as_markup()
 
-        except Exception as e:
-            raise Exception(f"Ошибка соединения: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Ошибка соединения: {str(e)}")
 
 
 async def create_resident_api(resident_data: dict) -> tuple[bool, str]:
@@ -185,20 +175,16 @@ async def create_resident_api(resident_data: dict) -> tuple[bool, str]:
     Создает нового резидента через API
     Возвращает кортеж (успех, сообщение)
     """
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(
-                url_resident,
-                json=resident_data,
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 201:
-                    return True, "✅ Резидент успешно добавлен!"
-                else:
-                    error_text = await response.text()
-                    return False, f"❌ Ошибка при добавлении: {error_text}"
-        except Exception as e:
-            return False, f"❌ Ошибка соединения: {str(e)}"
+    try:
+        async with backend_client.post(url_resident, json=resident_data) as response:
+            if response.status == 201:
+                backend_client.invalidate(url_resident)
+                return True, "✅ Резидент успешно добавлен!"
+            else:
+                error_text = await response.text()
+                return False, f"❌ Ошибка при добавлении: {error_text}"
+    except Exception as e:
+        return False, f"❌ Ошибка соединения: {str(e)}"
 
 
 async def fetch_residents_list() -> tuple[list[dict] | None, str | None]:
@@ -206,124 +192,171 @@ async def fetch_residents_list() -> tuple[list[dict] | None, str | None]:
     Получает список резидентов из API
     Возвращает кортеж (список резидентов, None) при успехе или (None, сообщение об ошибке) при ошибке
     """
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(
-                url_resident,
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 200:
-                    return await response.json(), None
-                else:
-                    error_text = await response.text()
-                    return None, f"❌ Ошибка загрузки: {error_text}"
-        except Exception as e:
-            return None, f"❌ Ошибка соединения: {str(e)}"
-
-
-async def generate_residents_excel() -> Tuple[Optional[BytesIO], Optional[str]]:
-    """
-    Генерирует Excel файл с данными резидентов с улучшенным форматированием.
+    try:
+        residents = await backend_client.get_json(
+            url_resident,
+            ttl=config_settings.CACHE_TTL_RESIDENTS,
+            stale_ttl=config_settings.CACHE_MAX_STALE
+        )
+        return residents, None
+    except aiohttp.ClientResponseError as e:
+        return None, f"❌ Ошибка загрузки: {e.status} {e.message}"
+    except Exception as e:
+        return None, f"❌ Ошибка соединения: {str(e)}"
+
+
+# =================================================================================================
+# Выгрузки
+# =================================================================================================
+
+
+# Колонки отчёта по пользователям: поле API -> заголовок
+USERS_REPORT_COLUMNS = {
+    'tg_id': 'TG ID',
+    'username': 'Никнейм',
+    'first_name': 'Имя (Telegram)',
+    'last_name': 'Фамилия (Telegram)',
+    'user_first_name': 'Имя (карта)',
+    'user_last_name': 'Фамилия (карта)',
+    'birth_date': 'Дата рождения',
+    'email': 'Email',
+    'phone_number': 'Номер телефона',
+    'is_bot': 'Бот',
+    'date_joined': 'Дата регистрации',
+    'last_activity': 'Последняя активность',
+    'is_staff': 'Админ',
+    'is_active': 'Активный',
+    'is_superuser': 'Суперюзер',
+    'role': 'Роль'
+}
+
+# Колонки, которые попадают в файл
+USERS_REPORT_KEEP = [
+    'TG ID', 'Никнейм', 'Имя (Telegram)', 'Фамилия (Telegram)',
+    'Имя (карта)', 'Фамилия (карта)', 'Дата рождения', 'Email', 'Номер телефона',
+    'Роль', 'Активный'
+]
+USERS_REPORT_FIELDS = [
+    field for title in USERS_REPORT_KEEP for field, column in USERS_REPORT_COLUMNS.items() if column == title
+]
+
+
+def prepare_users_frame(page: list[dict]) -> pd.DataFrame:
+    """Преобразует страницу пользователей из API в строки отчёта.
+
+    Args:
+        page (list[dict]): Пользователи из API.
 
     Returns:
-        Tuple[Optional[BytesIO], Optional[str]]:
-            - BytesIO объект с Excel файлом в случае успеха
-            - Сообщение об ошибке, если что-то пошло не так
+        pd.DataFrame: Колонки USERS_REPORT_KEEP, которые есть в данных.
     """
-    residents, error = await fetch_residents_list()
-    if error:
-        return None, error
-
-    try:
-        # Создаем DataFrame
-        df = pd.DataFrame(residents)
-
-        # Добавляем категории
-        for resident in residents:
-            categories = ", ".join([cat['name'] for cat in resident.get('categories', [])])
-            df.loc[df['id'] == resident['id'], 'categories'] = categories
-
-        # Переименовываем столбцы согласно модели
-        column_mapping = {
-            'name': 'Наименование',
-            'description': 'Описание',
-            'info': 'Доп.инфо',
-            'working_time': 'График работы',
-            'email': 'Email',
-            'phone_number': 'Номер телефона',
-            'official_website': 'Сайт',
-            'address': 'Адрес',
-            'building': 'Стр.',
-            'entrance': 'Вход',
-            'floor': 'Этаж',
-            'office': 'Офис/Пом.',
-            'photo': 'Фото',
-            'pin_code': 'Пин-код',
-            'categories': 'Категории'
-        }
-
-        # Применяем переименование и оставляем только нужные столбцы
-        df = df.rename(columns=column_mapping)
-        df = df[column_mapping.values()]
-
-        # Создаем файл в памяти
-        output = BytesIO()
-
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Записываем данные в Excel
-            df.to_excel(writer, index=False, sheet_name='Резиденты')
-
-            # Получаем объект листа
-            worksheet = writer.sheets['Резиденты']
-
-            # Создаем стили для форматирования
-            from openpyxl.styles import Font, Alignment, Border, Side
-
-            # Стиль для заголовков
-            header_font = Font(bold=True)
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            thin_border = Border(left=Side(style='thin'),
-                                 right=Side(style='thin'),
-                                 top=Side(style='thin'),
-                                 bottom=Side(style='thin'))
-
-            # Применяем стиль к заголовкам
-            for cell in worksheet[1]:
-                cell.font = header_font
-                cell.alignment = header_alignment
-                cell.border = thin_border
-
-            # Устанавливаем ширину колонок
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-
-                # Определяем максимальную длину содержимого
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-
-                # Устанавливаем ширину с небольшим запасом
-                adjusted_width = (max_length + 2)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-
-            # Добавляем автофильтр
-            worksheet.auto_filter.ref = worksheet.dimensions
-
-            # Стиль для обычных ячеек
-            cell_alignment = Alignment(horizontal='left', vertical='center')
-            for row in worksheet.iter_rows(min_row=2):
-                for cell in row:
-                    cell.alignment = cell_alignment
-
-        output.seek(0)
-        return output, None
+    # Строим DataFrame сразу из нужных полей в порядке колонок отчёта
+    fields = [field for field in USERS_REPORT_FIELDS if field in page[0]]
+    df = pd.DataFrame.from_records(page, columns=fields)
+
+    # Преобразования выполняются над колонкой целиком
+    for col in ('is_bot', 'is_staff', 'is_active', 'is_superuser'):
+        if col in df.columns:
+            df[col] = yes_no(df[col])
+    for col in ('date_joined', 'last_activity'):
+        if col in df.columns:
+            df[col] = format_datetime(df[col])
+    if 'birth_date' in df.columns:
+        df['birth_date'] = non_empty_strings(df['birth_date'])
+
+    df.columns = [USERS_REPORT_COLUMNS[field] for field in fields]
+    return df
+
+
+def prepare_residents_frame(residents: list[dict]) -> pd.DataFrame:
+    """Преобразует список резидентов из API в строки отчёта."""
+    # Создаем DataFrame
+    df = pd.DataFrame(residents)
+
+    # Названия категорий через запятую: один explode по всем резидентам вместо поиска строки для каждого
+    if 'categories' in df.columns:
+        df['categories'] = join_names(df['categories'])
+    else:
+        df['categories'] = ""
+
+    # Переименовываем столбцы согласно модели
+    column_mapping = {
+        'name': 'Наименование',
+        'description': 'Описание',
+        'info': 'Доп.инфо',
+        'working_time': 'График работы',
+        'email': 'Email',
+        'phone_number': 'Номер телефона',
+        'official_website': 'Сайт',
+        'address': 'Адрес',
+        'building': 'Стр.',
+        'entrance': 'Вход',
+        'floor': 'Этаж',
+        'office': 'Офис/Пом.',
+        'photo': 'Фото',
+        'pin_code': 'Пин-код',
+        'categories': 'Категории'
+    }
 
-    except Exception as e:
-        return None, f"Ошибка генерации Excel: {str(e)}"
+    # Применяем переименование и оставляем только нужные столбцы
+    df = df.rename(columns=column_mapping)
+    return df[column_mapping.values()]
+
+
+# Колонки отчёта по рассылкам: поле MailingStore -> заголовок
+MAILINGS_REPORT_COLUMNS = {
+    'id': 'ID',
+    'status': 'Статус',
+    'created_at': 'Создана',
+    'scheduled_at': 'Запланирована на',
+    'finished_at': 'Завершена',
+    'audience': 'Аудитория',
+    'total': 'Всего получателей',
+    'success': 'Доставлено',
+    'failed': 'Ошибок отправки',
+    'skipped': 'Без Telegram ID',
+    'excluded': 'Исключено (заблокировали бота)',
+    'text': 'Текст'
+}
+
+MAILING_STATUS_LABELS = {
+    JOB_SCHEDULED: 'Запланирована',
+    JOB_COLLECTING: 'Сбор получателей',
+    JOB_RUNNING: 'Отправляется',
+    JOB_PAUSED: 'На паузе',
+    JOB_CANCELLED: 'Отменена',
+    JOB_DONE: 'Завершена',
+}
+
+
+def prepare_mailings_frame(jobs: list[dict]) -> pd.DataFrame:
+    """Преобразует страницу рассылок из MailingStore в строки отчёта."""
+    df = pd.DataFrame.from_records(jobs, columns=list(MAILINGS_REPORT_COLUMNS))
+
+    df['status'] = df['status'].map(MAILING_STATUS_LABELS).fillna(df['status'])
+    for col in ('created_at', 'scheduled_at', 'finished_at'):
+        df[col] = format_datetime(df[col])
+    # audience - JSON-список ID подписок ("[1, 2]") или пусто для всех пользователей
+    audience = non_empty_strings(df['audience'])
+    df['audience'] = ("Подписки: " + audience.str.strip('[]')).fillna("Все пользователи")
+
+    df.columns = list(MAILINGS_REPORT_COLUMNS.values())
+    return df
+
+
+async def iter_resident_pages() -> AsyncIterator[list[dict]]:
+    """Резиденты для выгрузки: API отдаёт список целиком, поэтому страница одна.
+
+    Список запрашивается мимо кэша: по нему считается отпечаток выгрузки, и
+    устаревшая копия выдала бы старый файл за актуальный.
+
+    Raises:
+        aiohttp.ClientError: При ошибке запроса к API.
+    """
+    async with backend_client.get(url_resident) as resp:
+        resp.raise_for_status()
+        residents = await resp.json()
+    yield residents
 
 
 async def update_resident_category_api(resident_id: int, category_id: int) -> tuple[bool, str]:
@@ -337,26 +370,25 @@ async def update_resident_category_api(resident_id: int, category_id: int) -> tu
     Returns:
         tuple[bool, str]: (успех, сообщение)
     """
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.patch(
-                    f"{url_resident}{resident_id}/",
-                    json={"category_ids": [category_id]},
-                    headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 200:
-                    return True, "✅ Категория успешно обновлена!"
-                error_text = await response.text()
-                return False, f"❌ Ошибка обновления: {error_text}"
-        except Exception as e:
-            return False, f"❌ Ошибка соединения: {str(e)}"
+    try:
+        async with backend_client.patch(
+                backend_client.url(url_resident, resident_id),
+                json={"category_ids": [category_id]}
+        ) as response:
+            if response.status == 200:
+                backend_client.invalidate(url_resident)
+                return True, "✅ Категория успешно обновлена!"
+            error_text = await response.text()
+            return False, f"❌ Ошибка обновления: {error_text}"
+    except Exception as e:
+        return False, f"❌ Ошибка соединения: {str(e)}"
 
 
 async def update_resident_field_api(
         resident_id: int,
         field: str,
         value: str | int,
-        headers: dict
+        headers: Optional[dict] = None
 ) -> tuple[bool, str, str]:
     """
     Обновляет поле резидента через API
@@ -365,7 +397,7 @@ async def update_resident_field_api(
         resident_id: ID резидента
         field: Название поля для обновления
         value: Новое значение поля
-        headers: Заголовки запроса
+        headers: Дополнительные заголовки запроса (X-Bot-Api-Key добавляет backend_client)
 
     Returns:
         tuple[bool, str, str]: (успех, сообщение, русское название поля)
@@ -383,19 +415,19 @@ async def update_resident_field_api(
     field_name_ru = FIELD_TRANSLATIONS.get(field, field)
     update_data = {field: value}
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.patch(
-                    f"{url_resident}{resident_id}/",
-                    json=update_data,
-                    headers=headers
-            ) as response:
-                if response.status == 200:
-                    return True, f"✅ {field_name_ru} успешно обновлено!", field_name_ru
-                error_text = await response.text()
-                return False, f"❌ Ошибка обновления: {error_text}", field_name_ru
-        except Exception as e:
-            return False, f"❌ Ошибка соединения: {str(e)}", field_name_ru
+    try:
+        async with backend_client.patch(
+                backend_client.url(url_resident, resident_id),
+                json=update_data,
+                headers=headers
+        ) as response:
+            if response.status == 200:
+                backend_client.invalidate(url_resident)
+                return True, f"✅ {field_name_ru} успешно обновлено!", field_name_ru
+            error_text = await response.text()
+            return False, f"❌ Ошибка обновления: {error_text}", field_name_ru
+    except Exception as e:
+        return False, f"❌ Ошибка соединения: {str(e)}", field_name_ru
 
 
 async def fetch_residents_for_deletion() -> tuple[list[dict] | None, str | None]:
@@ -405,18 +437,7 @@ async def fetch_residents_for_deletion() -> tuple[list[dict] | None, str | None]
     Returns:
         tuple: (список резидентов, None) при успехе или (None, сообщение об ошибке) при ошибке
     """
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(
-                    url_resident,
-                    headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 200:
-                    return await response.json(), None
-                error_text = await response.text()
-                return None, f"❌ Ошибка загрузки: {error_text}"
-        except Exception as e:
-            return None, f"❌ Ошибка соединения: {str(e)}"
+    return await fetch_residents_list()
 
 
 async def delete_resident_api(resident_id: str) -> tuple[bool, str]:
@@ -429,47 +450,36 @@ async def delete_resident_api(resident_id: str) -> tuple[bool, str]:
     Returns:
         tuple[bool, str]: (успех, сообщение)
     """
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.delete(
-                    f"{url_resident}{resident_id}/",
-                    headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 204:
-                    return True, "✅ Резидент успешно удален!"
-                error_text = await response.text()
-                return False, f"❌ Ошибка удаления: {error_text}"
-        except Exception as e:
-            return False, f"❌ Ошибка соединения: {str(e)}"
+    try:
+        async with backend_client.delete(backend_client.url(url_resident, resident_id)) as response:
+            if response.status == 204:
+                backend_client.invalidate(url_resident)
+                return True, "✅ Резидент успешно удален!"
+            error_text = await response.text()
+            return False, f"❌ Ошибка удаления: {error_text}"
+    except Exception as e:
+        return False, f"❌ Ошибка соединения: {str(e)}"
 
 
 # Для получения данных резидента
 async def fetch_resident_data(resident_id: int) -> tuple[Optional[dict], Optional[str]]:
     """Получает данные конкретного резидента по ID"""
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(
-                f"{url_resident}{resident_id}/",
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 200:
-                    return await response.json(), None
-                error_text = await response.text()
-                return None, f"❌ Ошибка загрузки данных резидента: {error_text}"
-        except Exception as e:
-            return None, f"❌ Ошибка соединения: {str(e)}"
+    try:
+        async with backend_client.get(backend_client.url(url_resident, resident_id)) as response:
+            if response.status == 200:
+                return await response.json(), None
+            error_text = await response.text()
+            return None, f"❌ Ошибка загрузки данных резидента: {error_text}"
+    except Exception as e:
+        return None, f"❌ Ошибка соединения: {str(e)}"
 
 async def fetch_category_name(category_id: int) -> str:
     """Получает название категории по ID"""
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(
-                f"{url_category}{category_id}/",
-                headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-            ) as response:
-                if response.status == 200:
-                    category_data = await response.json()
-                    return category_data.get('name', 'Неизвестная категория')
-                return 'Неизвестная категория'
-        except Exception:
-            return 'Неизвестная категория'
+    try:
+        category_data = await backend_client.get_json(
+            backend_client.url(url_category, category_id),
+            ttl=config_settings.CACHE_TTL_CATEGORIES
+        )
+        return category_data.get('name', 'Неизвестная категория')
+    except Exception:
+        return 'Неизвестная категория'
@@ -0,0 +1,17 @@
+"""Бенчмарки оптимизаций бота.
+
+Запускаются из корня репозитория: `python -m benchmarks.<имя>`. Настоящие токены
+и бэкенд не нужны - переменные окружения ниже подставляются при импорте пакета,
+только если не заданы, поэтому data.config загружается в любом бенчмарке.
+"""
+import os
+import sys
+
+os.environ.setdefault("TOKEN", "123456:BENCH-token-for-local-runs-only")
+os.environ.setdefault("ADMIN_CHAT_ID", "-100")
+os.environ.setdefault("RESIDENT_ADMIN_CHAT_ID", "-200")
+os.environ.setdefault("base_url", "http://127.0.0.1:9/api")
+os.environ.setdefault("BOT_API_KEY", "bench")
+os.environ.setdefault("APP_URL", "http://localhost")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
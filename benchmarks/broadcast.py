@@ -0,0 +1,64 @@
+"""Скорость рассылки: старый последовательный цикл против Broadcaster (user-007).
+
+Фейковый Bot API отвечает с задержкой 50 мс и возвращает 429, если за последнюю
+секунду отправлено больше 30 сообщений.
+
+    python -m benchmarks.broadcast [--old 300] [--new 1500] [--rate N]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import FakeTelegram
+
+from admin.services.broadcast import Broadcaster
+from data.config import config_settings
+
+
+async def old_loop(bot, chat_ids: list[int]) -> None:
+    """Цикл из прежнего send_mailing: по одному сообщению и пауза 1 с после каждых 30."""
+    for index, chat_id in enumerate(chat_ids, 1):
+        try:
+            await bot.send_message(chat_id=chat_id, text="bench")
+        except Exception:
+            pass
+        if index % 30 == 0:
+            await asyncio.sleep(1)
+
+
+async def main(old_count: int, new_count: int, rate: float) -> None:
+    telegram = FakeTelegram(latency=0.05, limit=30)
+    base_url = await telegram.start()
+    bot = telegram.bot(base_url)
+    try:
+        if old_count:
+            started = time.perf_counter()
+            await old_loop(bot, list(range(1, old_count + 1)))
+            elapsed = time.perf_counter() - started
+            print(f"old loop:    {old_count / elapsed:5.1f} msg/s ({old_count} messages, {elapsed:.1f} s)")
+
+        telegram.delivered = telegram.flood_errors = 0
+
+        async def send(chat_id: int):
+            await bot.send_message(chat_id=chat_id, text="bench")
+
+        broadcaster = Broadcaster(send, rate=rate, workers=config_settings.MAILING_WORKERS)
+        stats = await broadcaster.run(range(1, new_count + 1), total=new_count)
+        print(
+            f"broadcaster: {stats.rate:5.1f} msg/s ({new_count} messages, {stats.elapsed:.1f} s, "
+            f"{stats.failed} failed, {stats.retry_after} flood waits, "
+            f"rate limit {rate}/s)"
+        )
+    finally:
+        await bot.session.close()
+        await telegram.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--old", type=int, default=300, help="Сообщений для старого цикла (0 - пропустить)")
+    parser.add_argument("--new", type=int, default=1500, help="Сообщений для Broadcaster")
+    parser.add_argument("--rate", type=float, default=config_settings.MAILING_RATE_LIMIT,
+                        help="Лимит Broadcaster, сообщений в секунду (по умолчанию MAILING_RATE_LIMIT)")
+    args = parser.parse_args()
+    asyncio.run(main(args.old, args.new, args.rate))
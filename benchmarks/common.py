@@ -0,0 +1,115 @@
+"""Общие части бенчмарков: локальные фейковые серверы и замеры."""
+import asyncio
+import os
+import resource
+import statistics
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+TOKEN = os.environ["TOKEN"]
+
+
+class FakeTelegram:
+    """Локальный Bot API: отвечает с задержкой latency и возвращает 429,
+    если за последнюю секунду пришло больше limit сообщений."""
+
+    def __init__(self, latency: float = 0.05, limit: int = 30, retry_after: int = 1):
+        self.latency = latency
+        self.limit = limit
+        self.retry_after = retry_after
+        self.window: deque[float] = deque()
+        self.delivered = 0
+        self.flood_errors = 0
+        self._message_id = 0
+        self.server: TestServer | None = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return str(self.server.make_url(""))
+
+    async def close(self) -> None:
+        if self.server is not None:
+            await self.server.close()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        while self.window and self.window[0] <= now - 1:
+            self.window.popleft()
+        if len(self.window) >= self.limit:
+            self.flood_errors += 1
+            return web.json_response({
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            })
+        self.window.append(now)
+        self.delivered += 1
+        self._message_id += 1
+        chat_id = int(data.get("chat_id", 1))
+        return web.json_response({"ok": True, "result": {
+            "message_id": self._message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "group"},
+            "text": data.get("text", ""),
+        }})
+
+    def bot(self, base_url: str) -> Bot:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(base_url.rstrip("/")))
+        return Bot(TOKEN, session=session)
+
+
+class LoopStallMonitor:
+    """Самая долгая блокировка цикла событий: тик раз в interval и опоздание тика."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.max_stall = 0.0
+        self._tick = time.perf_counter()
+        self._task: asyncio.Task | None = None
+
+    def _measure(self) -> None:
+        self.max_stall = max(self.max_stall, time.perf_counter() - self._tick - self.interval)
+
+    async def _run(self) -> None:
+        while True:
+            self._tick = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._measure()
+
+    def __enter__(self):
+        self._tick = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        # Блокировка могла закончиться вместе с замером - тик после неё уже не сработает
+        self._measure()
+        self._task.cancel()
+
+
+def peak_rss_mib() -> float:
+    """Пиковый RSS процесса в MiB (ru_maxrss в Linux - в KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def median_latency(call: Callable[[], Awaitable[object]], runs: int) -> float:
+    """Медиана времени вызова в миллисекундах."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await call()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
@@ -0,0 +1,161 @@
+"""Поиск покупателя на кассе: прежняя последовательная цепочка против lookup_customer (user-025).
+
+Локальный бэкенд отвечает с задержкой 50 мс. Телефон хранится в формате
++7..., поэтому первый вариант номера не находится - как в прежних логах кассы.
+
+- old - прежний process_phone_or_card: find_user_by_phone (варианты номера по
+  очереди) -> номер карты -> ID карты -> изображение, без кэша идентификаторов;
+- cold - lookup_customer после invalidate_user (кэш идентификаторов пуст);
+- warm - lookup_customer с заполненным кэшем: запрашивается только изображение карты.
+
+    python -m benchmarks.customer_lookup [--runs 20] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Адреса в data/url.py собираются при импорте, поэтому порт бэкенда выбирается заранее
+PORT = _free_port()
+os.environ["base_url"] = f"http://127.0.0.1:{PORT}/api"
+
+from benchmarks.common import median_latency  # noqa: E402
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from data.url import url_loyalty, url_users  # noqa: E402
+from resident_admin.services.point_transactions import CARD_NUMBER_PATTERN, lookup_customer  # noqa: E402
+from utils.backend import backend_client  # noqa: E402
+from utils.identity import identity_cache  # noqa: E402
+
+TG_ID = 1_000_000_001
+PHONE = "79998887766"
+CARD_NUMBER = "123 456"
+
+
+class FakeBackend:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+        self.server: TestServer | None = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/api/users/", self._user_id)
+        app.router.add_get("/api/users/phone/{phone}/", self._by_phone)
+        app.router.add_get("/api/loyalty-cards/card-number/{number}/", self._by_card)
+        app.router.add_get("/api/loyalty-cards/{tg_id}/card-number/", self._card_number)
+        app.router.add_get("/api/loyalty-cards/{tg_id}/card-id/", self._card_id)
+        app.router.add_get("/api/loyalty-cards/{tg_id}/card-image/", self._card_image)
+        self.server = TestServer(app, port=PORT)
+        await self.server.start_server()
+
+    async def _reply(self) -> None:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+    @staticmethod
+    def _user() -> dict:
+        return {"tg_id": TG_ID, "user_first_name": "Иван", "user_last_name": "Петров", "phone_number": f"+{PHONE}"}
+
+    async def _user_id(self, request: web.Request) -> web.Response:
+        await self._reply()
+        return web.json_response({"results": [{"id": 42}]})
+
+    async def _by_phone(self, request: web.Request) -> web.Response:
+        await self._reply()
+        if request.match_info["phone"] != f"+{PHONE}":
+            raise web.HTTPNotFound()
+        return web.json_response(self._user())
+
+    async def _by_card(self, request: web.Request) -> web.Response:
+        await self._reply()
+        return web.json_response(self._user())
+
+    async def _card_number(self, request: web.Request) -> web.Response:
+        await self._reply()
+        return web.json_response({"card_number": CARD_NUMBER})
+
+    async def _card_id(self, request: web.Request) -> web.Response:
+        await self._reply()
+        return web.json_response({"card_id": 7})
+
+    async def _card_image(self, request: web.Request) -> web.Response:
+        await self._reply()
+        return web.Response(body=b"\x89PNG" + bytes(20_000), content_type="image/png")
+
+
+async def _get_json(url: str) -> dict | None:
+    async with backend_client.get(url) as resp:
+        if resp.status == 404:
+            return None
+        resp.raise_for_status()
+        return await resp.json()
+
+
+async def _get_bytes(url: str) -> bytes:
+    async with backend_client.get(url) as resp:
+        resp.raise_for_status()
+        return await resp.read()
+
+
+async def old_lookup(text: str) -> None:
+    """Прежняя цепочка process_phone_or_card: каждый запрос ждёт предыдущий."""
+    if CARD_NUMBER_PATTERN.match(text):
+        user = await _get_json(backend_client.url(url_loyalty, "card-number", CARD_NUMBER))
+    else:
+        user = None
+        for variant in (PHONE, f"+{PHONE}"):
+            user = await _get_json(backend_client.url(url_users, "phone", variant))
+            if user:
+                break
+        await _get_json(backend_client.url(url_loyalty, user["tg_id"], "card-number"))
+    await _get_json(backend_client.url(url_loyalty, user["tg_id"], "card-id"))
+    await _get_bytes(backend_client.url(url_loyalty, user["tg_id"], "card-image"))
+
+
+async def cold_lookup(text: str) -> None:
+    identity_cache.invalidate_user(TG_ID)
+    result = await lookup_customer(text)
+    assert result.found, result
+
+
+async def warm_lookup(text: str) -> None:
+    result = await lookup_customer(text)
+    assert result.found, result
+
+
+async def main(runs: int, latency: float) -> None:
+    # Предупреждения о ненайденном варианте номера выводились бы на каждом прогоне
+    logging.getLogger().setLevel(logging.ERROR)
+    backend = FakeBackend(latency)
+    await backend.start()
+    await backend_client.start()
+    try:
+        for name, text in (("phone", f"+{PHONE}"), ("card", CARD_NUMBER)):
+            line = [f"{name:5}:"]
+            for mode, call in (("old", old_lookup), ("cold", cold_lookup), ("warm", warm_lookup)):
+                backend.requests = 0
+                median = await median_latency(lambda: call(text), runs)
+                line.append(f"{mode} {median:4.0f} ms ({backend.requests / runs:.0f} req)")
+            print(" ".join(line[:1]) + " " + ", ".join(line[1:]))
+    finally:
+        await backend_client.close()
+        await backend.server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.latency))
@@ -0,0 +1,114 @@
+"""Преобразование данных для выгрузок: построчный код против векторного (user-021).
+
+Резиденты: прежний цикл с df.loc[df['id'] == ...] для категорий каждого резидента
+(квадратичный) против prepare_residents_frame. Результаты сравниваются.
+Пользователи: прежний prepare_users_frame с apply по каждой колонке против
+текущего - страницами по 500 и одним кадром.
+
+    python -m benchmarks.export_transform [--residents 1000 10000 50000] [--old-limit 10000] [--users 100000]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from admin.services.utils import USERS_REPORT_FIELDS, prepare_residents_frame, prepare_users_frame
+from benchmarks.users_export import make_users
+
+RESIDENT_COLUMNS = {
+    'name': 'Наименование', 'description': 'Описание', 'info': 'Доп.инфо', 'working_time': 'График работы',
+    'email': 'Email', 'phone_number': 'Номер телефона', 'official_website': 'Сайт', 'address': 'Адрес',
+    'building': 'Стр.', 'entrance': 'Вход', 'floor': 'Этаж', 'office': 'Офис/Пом.', 'photo': 'Фото',
+    'pin_code': 'Пин-код', 'categories': 'Категории',
+}
+
+OLD_USERS_COLUMNS = {
+    'tg_id': 'TG ID', 'username': 'Никнейм', 'first_name': 'Имя (Telegram)', 'last_name': 'Фамилия (Telegram)',
+    'user_first_name': 'Имя (карта)', 'user_last_name': 'Фамилия (карта)', 'birth_date': 'Дата рождения',
+    'email': 'Email', 'phone_number': 'Номер телефона', 'is_bot': 'Бот', 'date_joined': 'Дата регистрации',
+    'last_activity': 'Последняя активность', 'is_staff': 'Админ', 'is_active': 'Активный',
+    'is_superuser': 'Суперюзер', 'role': 'Роль',
+}
+OLD_USERS_KEEP = [
+    'TG ID', 'Никнейм', 'Имя (Telegram)', 'Фамилия (Telegram)', 'Имя (карта)', 'Фамилия (карта)',
+    'Дата рождения', 'Email', 'Номер телефона', 'Роль', 'Активный',
+]
+
+
+def make_residents(count: int) -> list[dict]:
+    categories = [{"id": i, "name": f"Категория {i}"} for i in range(20)]
+    return [
+        {
+            "id": resident_id,
+            "name": f"Резидент {resident_id}",
+            **{field: f"{field} {resident_id}" for field in RESIDENT_COLUMNS if field not in ("name", "categories")},
+            "categories": categories[resident_id % 20:resident_id % 20 + resident_id % 3],
+        }
+        for resident_id in range(count)
+    ]
+
+
+def old_residents_frame(residents: list[dict]) -> pd.DataFrame:
+    """Прежний generate_residents_excel до записи в Excel."""
+    df = pd.DataFrame(residents)
+    for resident in residents:
+        categories = ", ".join([cat['name'] for cat in resident.get('categories', [])])
+        df.loc[df['id'] == resident['id'], 'categories'] = categories
+    df = df.rename(columns=RESIDENT_COLUMNS)
+    return df[RESIDENT_COLUMNS.values()]
+
+
+def old_users_frame(page: list[dict]) -> pd.DataFrame:
+    """prepare_users_frame до векторизации (страница со всеми полями пользователя)."""
+    df = pd.DataFrame(page)
+    for col in ['is_bot', 'is_staff', 'is_active', 'is_superuser']:
+        if col in df.columns:
+            df[col] = df[col].apply(lambda x: 'Да' if x else 'Нет')
+    for col in ['date_joined', 'last_activity']:
+        if col in df.columns:
+            df[col] = df[col].apply(lambda x: x[:19].replace('T', ' ') if isinstance(x, str) else None)
+    if 'birth_date' in df.columns:
+        df['birth_date'] = df['birth_date'].apply(lambda x: x if isinstance(x, str) and x else None)
+    df = df.rename(columns=OLD_USERS_COLUMNS)
+    return df[[col for col in OLD_USERS_KEEP if col in df.columns]]
+
+
+def timed(function, *args) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def pages(users: list[dict], size: int = 500) -> list[list[dict]]:
+    return [users[start:start + size] for start in range(0, len(users), size)]
+
+
+def main(resident_sizes: list[int], old_limit: int, users_count: int) -> None:
+    for count in resident_sizes:
+        residents = make_residents(count)
+        new_time, new_frame = timed(prepare_residents_frame, residents)
+        line = f"residents {count:>6}: new {new_time * 1000:7.0f} ms"
+        if count <= old_limit:
+            old_time, old_frame = timed(old_residents_frame, residents)
+            pd.testing.assert_frame_equal(old_frame.fillna(""), new_frame.fillna(""), check_dtype=False)
+            line += f", old {old_time:6.2f} s (same frame)"
+        print(line)
+
+    users = make_users(users_count)
+    projected = [{field: user.get(field) for field in USERS_REPORT_FIELDS} for user in users]
+    old_pages = sum(timed(old_users_frame, page)[0] for page in pages(users))
+    new_pages = sum(timed(prepare_users_frame, page)[0] for page in pages(projected))
+    old_whole, _ = timed(old_users_frame, users)
+    new_whole, _ = timed(prepare_users_frame, projected)
+    print(f"users {users_count} in 500-row pages: old {old_pages:.2f} s, new {new_pages:.2f} s")
+    print(f"users {users_count} in one frame:     old {old_whole:.2f} s, new {new_whole:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--residents", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--old-limit", type=int, default=10_000,
+                        help="Старый код резидентов не запускается на больших объёмах (квадратичный)")
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.residents, args.old_limit, args.users)
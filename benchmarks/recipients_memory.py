@@ -0,0 +1,87 @@
+"""Память под получателей и итоги одной рассылки (user-015).
+
+Сравнивает прежний send_mailing (весь список пользователей из API и строки
+failed_users) с RecipientSet + BroadcastStats. Пользователи приходят страницами
+по 500, 5% отправок завершаются ошибкой. Замер - tracemalloc: сколько памяти
+удерживается после обработки всех получателей и пик по ходу работы.
+
+    python -m benchmarks.recipients_memory [--sizes 10000 100000 1000000]
+"""
+import argparse
+import tracemalloc
+
+from admin.services.audience import RecipientSet
+from admin.services.broadcast import ERROR_BLOCKED, BroadcastStats
+
+PAGE_SIZE = 500
+FIRST_TG_ID = 1_000_000_000
+
+
+def pages(count: int, full: bool):
+    """Страницы пользователей, как их отдаёт API (full - все поля, иначе только id и tg_id)."""
+    for start in range(0, count, PAGE_SIZE):
+        page = []
+        for user_id in range(start, min(start + PAGE_SIZE, count)):
+            user = {"id": user_id, "tg_id": FIRST_TG_ID + user_id}
+            if full:
+                user.update(first_name=f"Имя{user_id}", last_name="", username=f"user{user_id}", is_active=True)
+            page.append(user)
+        yield page
+
+
+def failed(chat_id: int) -> bool:
+    return chat_id % 20 == 0
+
+
+def old_pipeline(count: int):
+    users = []
+    for page in pages(count, full=True):
+        users.extend(page)
+    failed_users = []
+    success = 0
+    for user in users:
+        tg_id = user["tg_id"]
+        if failed(tg_id):
+            failed_users.append(str(tg_id))
+        else:
+            success += 1
+    return users, failed_users
+
+
+def new_pipeline(count: int):
+    recipients = RecipientSet()
+    for page in pages(count, full=False):
+        recipients.add_many([user["tg_id"] for user in page])
+    recipients.finalize()
+    stats = BroadcastStats(len(recipients))
+    for chat_id in recipients:
+        if failed(chat_id):
+            stats.add_failure(chat_id, ERROR_BLOCKED)
+        else:
+            stats.success += 1
+            stats.sent_ids.append(chat_id)
+    return recipients, stats
+
+
+def measure(pipeline, count: int) -> tuple[float, float]:
+    """(удерживаемая память, пик) в MiB."""
+    tracemalloc.start()
+    result = pipeline(count)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained / 2 ** 20, peak / 2 ** 20
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'N':>10}  {'old retained':>12}  {'new retained / peak':>20}")
+    for count in sizes:
+        old_retained, _ = measure(old_pipeline, count)
+        new_retained, new_peak = measure(new_pipeline, count)
+        print(f"{count:>10}  {old_retained:>8.1f} MiB  {new_retained:>8.2f} / {new_peak:.2f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    main(parser.parse_args().sizes)
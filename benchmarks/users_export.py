@@ -0,0 +1,187 @@
+"""Выгрузка пользователей: время, пиковая память и блокировка цикла событий (user-020, user-023).
+
+Локальный API отдаёт N пользователей: обычным списком (как читала старая
+выгрузка) или страницами limit/offset. Режимы:
+
+- old - прежний generate_excel_report: весь список одним запросом, DataFrame,
+  pd.ExcelWriter и оформление каждой ячейки прямо в цикле событий;
+- xlsx, csv, parquet - текущий конвейер ExportJobs: страницы из API, PageSpool,
+  преобразование и запись файла в отдельном потоке.
+
+Каждый режим запускается в отдельном процессе, чтобы пиковый RSS не смешивался.
+
+    python -m benchmarks.users_export [--rows 100000] [--modes old xlsx csv parquet]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Адреса в data/url.py собираются при импорте, поэтому порт API выбирается заранее
+# и передаётся процессам режимов через окружение
+PORT = int(os.environ.setdefault("BENCH_API_PORT", str(_free_port())))
+os.environ["base_url"] = f"http://127.0.0.1:{PORT}/api"
+
+from benchmarks.common import LoopStallMonitor, peak_rss_mib  # noqa: E402
+
+import pandas as pd  # noqa: E402
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side  # noqa: E402
+
+from admin.services.export_jobs import USERS_EXPORT, ExportCache, ExportJobs  # noqa: E402
+from data.url import url_users  # noqa: E402
+from utils.backend import backend_client  # noqa: E402
+from utils.export import available_formats  # noqa: E402
+
+
+def make_users(count: int) -> list[dict]:
+    return [
+        {
+            "id": user_id,
+            "tg_id": 1_000_000_000 + user_id,
+            "username": f"user{user_id}",
+            "first_name": f"Имя{user_id}",
+            "last_name": f"Фамилия{user_id}",
+            "user_first_name": f"Имя{user_id}" if user_id % 3 else None,
+            "user_last_name": f"Фамилия{user_id}" if user_id % 3 else None,
+            "birth_date": "1990-05-17" if user_id % 4 else None,
+            "email": f"user{user_id}@example.com",
+            "phone_number": f"+7900{user_id:07d}",
+            "is_bot": False,
+            "is_staff": user_id % 1000 == 0,
+            "is_active": user_id % 10 != 0,
+            "is_superuser": False,
+            "role": "user",
+            "date_joined": "2024-01-15T10:20:30.123456Z",
+            "last_activity": "2025-03-01T08:00:00Z",
+        }
+        for user_id in range(count)
+    ]
+
+
+class FakeUsersApi:
+    def __init__(self, users: list[dict]):
+        self.users = users
+        self.server: TestServer | None = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/api/users/", self._handle)
+        self.server = TestServer(app, port=PORT)
+        await self.server.start_server()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        if "limit" not in request.query:
+            return web.json_response(self.users)
+        limit = int(request.query["limit"])
+        offset = int(request.query.get("offset", 0))
+        fields = request.query.get("fields")
+        page = self.users[offset:offset + limit]
+        if fields:
+            names = fields.split(",")
+            page = [{name: user.get(name) for name in names} for user in page]
+        next_url = None
+        if offset + limit < len(self.users):
+            next_url = str(request.url.update_query(offset=offset + limit))
+        return web.json_response({"count": len(self.users), "next": next_url, "results": page})
+
+
+def old_excel(users: list[dict]) -> BytesIO:
+    """Сокращённая копия прежнего generate_excel_report (после получения списка)."""
+    df = pd.DataFrame(users)
+    df = df.drop(columns=['id', 'password', 'groups', 'user_permissions'], errors='ignore')
+    for col in ['is_bot', 'is_staff', 'is_active', 'is_superuser']:
+        df[col] = df[col].apply(lambda x: 'Да' if x else 'Нет')
+    for col in ['date_joined', 'last_activity']:
+        df[col] = df[col].apply(lambda x: x[:19].replace('T', ' ') if isinstance(x, str) else None)
+    df['birth_date'] = df['birth_date'].apply(lambda x: x if isinstance(x, str) and x else None)
+    df = df.rename(columns={
+        'tg_id': 'TG ID', 'username': 'Никнейм', 'first_name': 'Имя (Telegram)',
+        'last_name': 'Фамилия (Telegram)', 'user_first_name': 'Имя (карта)',
+        'user_last_name': 'Фамилия (карта)', 'birth_date': 'Дата рождения', 'email': 'Email',
+        'phone_number': 'Номер телефона', 'is_active': 'Активный', 'role': 'Роль',
+    })
+    df = df[['TG ID', 'Никнейм', 'Имя (Telegram)', 'Фамилия (Telegram)', 'Имя (карта)', 'Фамилия (карта)',
+             'Дата рождения', 'Email', 'Номер телефона', 'Роль', 'Активный']]
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Пользователи')
+        worksheet = writer.sheets['Пользователи']
+        alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+        for row in worksheet.iter_rows():
+            for cell in row:
+                cell.alignment = alignment
+        for column in worksheet.columns:
+            max_length = max(len(str(cell.value)) for cell in column)
+            worksheet.column_dimensions[column[0].column_letter].width = (max_length + 2) * 1.2
+        thin = Side(style='thin')
+        for cell in worksheet[1]:
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal='center', vertical='center')
+    output.seek(0)
+    return output
+
+
+class FakeProgress:
+    def update(self, text: str) -> None:
+        pass
+
+
+async def run_mode(mode: str, rows: int) -> None:
+    api = FakeUsersApi(make_users(rows))
+    await api.start()
+    await backend_client.start()
+    rss_before = peak_rss_mib()
+    try:
+        with LoopStallMonitor() as monitor:
+            started = time.perf_counter()
+            if mode == "old":
+                async with backend_client.get(url_users) as resp:
+                    users = await resp.json()
+                size = old_excel(users).getbuffer().nbytes
+            else:
+                with tempfile.TemporaryDirectory() as directory:
+                    jobs = ExportJobs(ExportCache(directory))
+                    entry, _ = await jobs._prepare(f"users-{mode}", USERS_EXPORT, mode, FakeProgress())
+                    size = os.path.getsize(jobs.cache.path(entry))
+            elapsed = time.perf_counter() - started
+        print(
+            f"{mode:8} {rows} rows: {elapsed:5.1f} s, {size / 2 ** 20:4.1f} MB, "
+            f"+{peak_rss_mib() - rss_before:.0f} MiB peak RSS, longest loop stall {monitor.max_stall * 1000:.0f} ms"
+        )
+    finally:
+        await backend_client.close()
+        await api.server.close()
+
+
+def main(rows: int, modes: list[str]) -> None:
+    for mode in modes:
+        subprocess.run([sys.executable, "-m", "benchmarks.users_export", "--rows", str(rows), "--run", mode], check=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--modes", nargs="+", default=["old", *available_formats()])
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        asyncio.run(run_mode(args.run, args.rows))
+    else:
+        main(args.rows, args.modes)
@@ -11,9 +11,7 @@ from aiogram.types import (
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
 from aiogram import F
-import aiohttp
 
-from data.config import config_settings
 from data.url import url_subscription
 from client.keyboards.inline import (
     get_profile_inline_kb,
@@ -28,6 +26,7 @@ from client.keyboards.reply import main_kb, edit_data_keyboard
 from client.services.loyalty import fetch_loyalty_card, get_user_data
 from client.services.user import update_user_data, parse_birth_date, normalize_phone_number, name_pattern, email_pattern
 from client.services.subscriptions import get_my_subscriptions, get_subscriptions_data
+from utils.backend import BackendClient
 
 
 
@@ -374,7 +373,7 @@ async def edit_subscriptions_handler(callback: CallbackQuery, state: FSMContext)
 
 
 @profile_router.callback_query(EditSubscriptions.choosing)
-async def process_edit_choice(callback: CallbackQuery, state: FSMContext):
+async def process_edit_choice(callback: CallbackQuery, state: FSMContext, backend: BackendClient):
     """
     Обрабатывает выбор и изменение подписок пользователя в профиле.
     Функция реагирует на нажатия inline-кнопок в меню редактирования подписок:
@@ -383,6 +382,7 @@ async def process_edit_choice(callback: CallbackQuery, state: FSMContext):
     Аргументы:
         callback (CallbackQuery): Объект колбэка от Telegram, содержащий данные о нажатой кнопке.
         state (FSMContext): Контекст состояния FSM для хранения и обновления выбранных подписок.
+        backend (BackendClient): Клиент API бэкенда из workflow data диспетчера.
     Исключения:
         При ошибках API или других сбоях информирует пользователя и выводит ошибку в консоль.
     """
@@ -406,37 +406,31 @@ async def process_edit_choice(callback: CallbackQuery, state: FSMContext):
             subscriptions = await get_subscriptions_data()
             name_to_id = {sub["name"]: sub["id"] for sub in subscriptions}
 
-            headers = {
-                "X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()
-            }
             user_id = str(callback.from_user.id)
 
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                # Подписываемся на новые подписки
-                for name in selected:
-                    if name not in current_subscriptions:
-                        subscription_id = name_to_id.get(name)
-                        if subscription_id:
-                            async with session.post(
-                                url=f"{url_subscription}{subscription_id}/subscribe/",
-                                headers=headers,
-                                json={"tg_id": user_id}
-                            ) as response:
-                                if response.status != 200:
-                                    print(f"Ошибка при подписке на {name}: {response.status} - {await response.text()}")
-
-                # Отписываемся от снятых подписок
-                for name in current_subscriptions:
-                    if name not in selected:
-                        subscription_id = name_to_id.get(name)
-                        if subscription_id:
-                            async with session.post(
-                                url=f"{url_subscription}{subscription_id}/unsubscribe/",
-                                headers=headers,
-                                json={"tg_id": user_id}
-                            ) as response:
-                                if response.status != 200:
-                                    print(f"Ошибка при отписке от {name}: {response.status} - {await response.text()}")
+            # Подписываемся на новые подписки
+            for name in selected:
+                if name not in current_subscriptions:
+                    subscription_id = name_to_id.get(name)
+                    if subscription_id:
+                        async with backend.post(
+                            backend.url(url_subscription, subscription_id, "subscribe"),
+                            json={"tg_id": user_id}
+                        ) as response:
+                            if response.status != 200:
+                                print(f"Ошибка при подписке на {name}: {response.status} - {await response.text()}")
+
+            # Отписываемся от снятых подписок
+            for name in current_subscriptions:
+                if name not in selected:
+                    subscription_id = name_to_id.get(name)
+                    if subscription_id:
+                        async with backend.post(
+                            backend.url(url_subscription, subscription_id, "unsubscribe"),
+                            json={"tg_id": user_id}
+                        ) as response:
+                            if response.status != 200:
+                                print(f"Ошибка при отписке от {name}: {response.status} - {await response.text()}")
 
             await callback.message.answer(
                 "Ваши подписки успешно обновлены!",
@@ -1,6 +1,5 @@
 import logging
 
-import aiohttp
 from aiogram import Router, types, F
 from aiogram.types import Message as AiogramMessage, Message, InlineKeyboardMarkup, InlineKeyboardButton, WebAppInfo
 from aiogram.filters import CommandStart
@@ -13,6 +12,9 @@ from data.url import url_users, url_subscription
 from client.keyboards.reply import main_kb
 from client.keyboards.inline import build_interests_keyboard, get_subscriptions_name
 from client.services.subscriptions import get_subscriptions_data
+from admin.services.mailing import unblock_recipient
+from utils.backend import BackendClient
+from utils.identity import identity_cache
 
 logger = logging.getLogger(__name__)
 
@@ -50,16 +52,25 @@ async def send_new_user_notification(bot, user_data: dict, referral_code: str =
 
 
 @start_router.message(CommandStart())
-async def cmd_start(message: AiogramMessage, state: FSMContext):
+async def cmd_start(message: AiogramMessage, state: FSMContext, backend: BackendClient):
     """Обрабатывает команду /start для регистрации или приветствия пользователя.
 
     Args:
         message (Message): Сообщение с командой /start.
+        backend (BackendClient): Клиент API бэкенда из workflow data диспетчера.
 
     Notes:
         Выполняет POST-запрос к API для регистрации и отправляет приветствие в зависимости от статуса (200 или 201).
     """
     await state.clear()
+
+    # Пользователь снова запустил бота - возвращаем его в рассылки
+    try:
+        if await unblock_recipient(message.from_user.id):
+            logger.info(f"Пользователь {message.from_user.id} удалён из реестра недоступных получателей")
+    except Exception as e:
+        logger.error(f"Не удалось обновить реестр недоступных получателей: {e}")
+
     parts = message.text.split()
     referral_code = parts[1] if len(parts) > 1 else None
     
@@ -74,83 +85,80 @@ async def cmd_start(message: AiogramMessage, state: FSMContext):
     }
 
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            try:
-                async with session.post(
-                        url_users,
-                        json=user_data,
-                        headers={"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-                ) as resp:
-                    response_data = await resp.json()
-
-                    # 201 — новый пользователь, запускаем процесс выбора интересов
-                    # 200 — существующий пользователь, просто приветствуем
-                    if resp.status in (200, 201):
-                        greeting_name = response_data.get('first_name', message.from_user.first_name)
-
-                        # Определяем текст приветствия
-                        if resp.status == 201:
-                            # Отправляем уведомление в админ-группу о новом пользователе
-                            await send_new_user_notification(message.bot, user_data, referral_code)
-                            # Приветственный текст
-                            greeting_text = (
-                                "<b>Здравствуйте!</b>\n\n"
-                                "<b>Добро пожаловать в мир Арт-пространства 🎉</b>\n\n"
-                                "Чтобы подсказать Вам самое интересное из жизни Арт-пространства, отметьте, что Вам ближе 💛"
-                            )
-
-                            await state.set_state(Form.choosing)
-                            await state.update_data(selected=[])
-
-                            await message.answer(
-                                greeting_text,
-                                reply_markup = await build_interests_keyboard([])
-                            )
-
-                        elif resp.status == 200:
-                            greeting_text = "Рады снова приветствовать Вас в боте Арт-пространства ❤"
-
-                            await message.answer(
-                                f"Здравствуйте, <b>{greeting_name}</b>!\n\n"
-                                f"{greeting_text}",
-                                reply_markup=main_kb
-                            )
-
-                    # Обработка других статусов
-                    else:
-                        error_msg = response_data.get('detail', 'Сервис временно недоступен')
-                        logger.error(f"API error {resp.status}: {error_msg}")
+        try:
+            async with backend.post(url_users, json=user_data) as resp:
+                response_data = await resp.json()
+
+                # 201 — новый пользователь, запускаем процесс выбора интересов
+                # 200 — существующий пользователь, просто приветствуем
+                if resp.status in (200, 201):
+                    greeting_name = response_data.get('first_name', message.from_user.first_name)
+
+                    # Определяем текст приветствия
+                    if resp.status == 201:
+                        # Сбрасываем закэшированные "не найдено" для нового пользователя
+                        identity_cache.invalidate_user(message.from_user.id)
+                        # Отправляем уведомление в админ-группу о новом пользователе
+                        await send_new_user_notification(message.bot, user_data, referral_code)
+                        # Приветственный текст
+                        greeting_text = (
+                            "<b>Здравствуйте!</b>\n\n"
+                            "<b>Добро пожаловать в мир Арт-пространства 🎉</b>\n\n"
+                            "Чтобы подсказать Вам самое интересное из жизни Арт-пространства, отметьте, что Вам ближе 💛"
+                        )
+
+                        await state.set_state(Form.choosing)
+                        await state.update_data(selected=[])
+
                         await message.answer(
-                            f"Здравствуйте, <b>{message.from_user.first_name}</b>!\n"
-                            f"⚠️ {error_msg}\n\n"
-                            "Попробуйте позже или обратитесь в поддержку."
+                            greeting_text,
+                            reply_markup = await build_interests_keyboard([])
                         )
 
-            except ServerTimeoutError:
-                logger.error("Таймаут подключения к серверу")
-                await message.answer(
-                    f"⏳ <b>{message.from_user.first_name}</b>, сервер не отвечает.\n"
-                    "Попробуйте через несколько минут."
-                )
-
-            except ClientConnectorError as e:
-                logger.error(f"Ошибка подключения: {str(e)}")
-                await message.answer(
-                    f"🔌 <b>Технические неполадки</b>\n\n"
-                    f"Здравствуйте, <b>{message.from_user.first_name}</b>!\n"
-                    "Не удалось подключиться к серверу.\n\n"
-                    "🛠️ Мы уже решаем проблему!\n"
-                    "🕒 Попробуйте через 15-20 минут."
-                )
-
-            except Exception as e:
-                logger.error(f"Ошибка запроса: {str(e)}")
-                await message.answer(
-                    f"🌀 <b>Неожиданная ошибка</b>\n\n"
-                    f"Здравствуйте, <b>{message.from_user.first_name}</b>!\n"
-                    "Произошла непредвиденная ошибка.\n\n"
-                    "Наши специалисты уже в курсе и работают над решением."
-                )
+                    elif resp.status == 200:
+                        greeting_text = "Рады снова приветствовать Вас в боте Арт-пространства ❤"
+
+                        await message.answer(
+                            f"Здравствуйте, <b>{greeting_name}</b>!\n\n"
+                            f"{greeting_text}",
+                            reply_markup=main_kb
+                        )
+
+                # Обработка других статусов
+                else:
+                    error_msg = response_data.get('detail', 'Сервис временно недоступен')
+                    logger.error(f"API error {resp.status}: {error_msg}")
+                    await message.answer(
+                        f"Здравствуйте, <b>{message.from_user.first_name}</b>!\n"
+                        f"⚠️ {error_msg}\n\n"
+                        "Попробуйте позже или обратитесь в поддержку."
+                    )
+
+        except ServerTimeoutError:
+            logger.error("Таймаут подключения к серверу")
+            await message.answer(
+                f"⏳ <b>{message.from_user.first_name}</b>, сервер не отвечает.\n"
+                "Попробуйте через несколько минут."
+            )
+
+        except ClientConnectorError as e:
+            logger.error(f"Ошибка подключения: {str(e)}")
+            await message.answer(
+                f"🔌 <b>Технические неполадки</b>\n\n"
+                f"Здравствуйте, <b>{message.from_user.first_name}</b>!\n"
+                "Не удалось подключиться к серверу.\n\n"
+                "🛠️ Мы уже решаем проблему!\n"
+                "🕒 Попробуйте через 15-20 минут."
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка запроса: {str(e)}")
+            await message.answer(
+                f"🌀 <b>Неожиданная ошибка</b>\n\n"
+                f"Здравствуйте, <b>{message.from_user.first_name}</b>!\n"
+                "Произошла непредвиденная ошибка.\n\n"
+                "Наши специалисты уже в курсе и работают над решением."
+            )
 
     except Exception as e:
         logger.error(f"Критическая ошибка: {str(e)}", exc_info=True)
@@ -162,12 +170,13 @@ async def cmd_start(message: AiogramMessage, state: FSMContext):
 
 
 @start_router.callback_query(Form.choosing)
-async def process_choice(callback: types.CallbackQuery, state: FSMContext):
+async def process_choice(callback: types.CallbackQuery, state: FSMContext, backend: BackendClient):
     """
     Обрабатывает выбор пользователя при выборе интересов (подписок) через callback-кнопки.
     Аргументы:
         callback (types.CallbackQuery): Объект callback-запроса от пользователя.
         state (FSMContext): Контекст состояния конечного автомата для хранения данных пользователя.
+        backend (BackendClient): Клиент API бэкенда из workflow data диспетчера.
     Описание:
         - Если пользователь нажал кнопку "Готово" ("done"):
             - Проверяет, выбраны ли интересы. Если нет — отправляет уведомление.
@@ -199,24 +208,18 @@ async def process_choice(callback: types.CallbackQuery, state: FSMContext):
             # Преобразуем список подписок в словарь: {название: id}
             name_to_id = {sub["name"]: sub["id"] for sub in subscriptions}
 
-            headers = {
-                "X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()
-            }
-
             user_id = str(callback.from_user.id)
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                for name in selected:
-                    subscription_id = name_to_id.get(name)
-                    if not subscription_id:
-                        continue
-
-                    async with session.post(
-                        url=f"{url_subscription}{subscription_id}/subscribe/",
-                        headers=headers,
-                        json={"tg_id": user_id}
-                    ) as response:
-                        if response.status != 200:
-                            print(f"Ошибка при подписке на {name}: {response.status}")
+            for name in selected:
+                subscription_id = name_to_id.get(name)
+                if not subscription_id:
+                    continue
+
+                async with backend.post(
+                    backend.url(url_subscription, subscription_id, "subscribe"),
+                    json={"tg_id": user_id}
+                ) as response:
+                    if response.status != 200:
+                        print(f"Ошибка при подписке на {name}: {response.status}")
         except Exception as e:
             logger.exception("Сбой при отправке подписок")
 
@@ -2,6 +2,7 @@ import aiohttp
 
 from data.config import config_settings
 from data.url import url_subscription
+from utils.backend import backend_client
 
 
 async def get_my_subscriptions(tg_id: int) -> list[str]:
@@ -16,18 +17,14 @@ async def get_my_subscriptions(tg_id: int) -> list[str]:
         Exception: В случае других ошибок при выполнении запроса.
     """
 
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(
-                url=f"{url_subscription}my/",
-                headers=headers,
-                params={"tg_id": str(tg_id)}
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return [item["name"] for item in data if "name" in item]
+        async with backend_client.get(
+            backend_client.url(url_subscription, "my"),
+            params={"tg_id": str(tg_id)}
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return [item["name"] for item in data if "name" in item]
     except aiohttp.ClientResponseError as e:
         print(f"Сбой при получении подписок: HTTP {e.status}, message='{e.message}', url='{e.request_info.url}'")
         return []
@@ -45,14 +42,13 @@ async def get_subscriptions_name():
         В случае ошибки при выполнении запроса или обработке данных функция выводит сообщение об ошибке и возвращает пустой список.
     """
 
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(url=url_subscription, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return [item["name"] for item in data if "name" in item]
+        data = await backend_client.get_json(
+            url_subscription,
+            ttl=config_settings.CACHE_TTL_SUBSCRIPTIONS,
+            stale_ttl=config_settings.CACHE_MAX_STALE
+        )
+        return [item["name"] for item in data if "name" in item]
 
     except Exception as e:
         print(f"Ошибка при получении подписок: {e}")
@@ -69,13 +65,12 @@ async def get_subscriptions_data():
         Все исключения обрабатываются внутри функции, ошибки выводятся в консоль.
     """
 
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(url=url_subscription, headers=headers) as response:
-                response.raise_for_status()
-                return await response.json()
+        return await backend_client.get_json(
+            url_subscription,
+            ttl=config_settings.CACHE_TTL_SUBSCRIPTIONS,
+            stale_ttl=config_settings.CACHE_MAX_STALE
+        )
     except Exception as e:
         print(f"Ошибка при получении списка подписок: {e}")
         return []
\ No newline at end of file
@@ -1,13 +1,28 @@
+import asyncio
 import logging
 import aiohttp
-from typing import Optional
+from typing import AsyncIterator, Optional
 from data.config import config_settings
-from data.url import url_users
+from data.url import url_subscription, url_subscription_users, url_users, url_users_stats
+from utils.backend import backend_client
+from utils.cache import TTLCache
+from utils.identity import identity_cache
 import re
 from datetime import datetime, date
 
 logger = logging.getLogger(__name__)
 
+# Поля сводной статистики пользователей (users/stats/)
+USERS_STATS_FIELDS = ("total", "active", "new_today", "new_week", "subscriptions")
+
+# Статистика, посчитанная без users/stats/ (ключ "counts"), и отметка о том,
+# что бэкенд не поддерживает users/stats/ (ключ "unsupported")
+_users_stats_cache = TTLCache(maxsize=2, default_ttl=config_settings.CACHE_TTL_USERS_STATS)
+
+# Адреса, которые вернули обычный список вместо пагинированного ответа: посчитать
+# их можно только загрузив весь список, поэтому count_users их не запрашивает
+_unpaginated_endpoints = TTLCache(maxsize=64, default_ttl=config_settings.CACHE_TTL_USERS_STATS_UNSUPPORTED)
+
 
 name_pattern = re.compile(r"^[А-Яа-яA-Za-zёЁ\-]{2,}$")
 email_pattern = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w{2,}$")
@@ -79,43 +94,266 @@ async def update_user_data(
     if email is not None:
         payload["email"] = email
 
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-    url = f"{url_users}{user_id}/"
+    url = backend_client.url(url_users, user_id)
     logger.info(f"Updating user data for user_id={user_id} with payload={payload}, url={url}")
 
     try:
         # Получаем текущие данные пользователя
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(url, headers=headers) as resp_get:
-                if resp_get.status != 200:
-                    logger.error(f"Failed to fetch current user data for user_id={user_id}: status={resp_get.status}")
-                    return False
-                current_data = await resp_get.json()
-
-                # Сравниваем текущие данные с payload
-                update_needed = False
-                for key, value in payload.items():
-                    if current_data.get(key) != value:
-                        update_needed = True
-                        break
-
-                if not update_needed:
-                    logger.info(f"No changes needed for user_id={user_id}")
-                    return True
-
-                # Выполняем обновление только если есть изменения
-                async with session.patch(url, json=payload, headers=headers) as resp:
-                    response_text = await resp.text()
-                    if resp.status in [200, 201]:
-                        logger.info(f"User data updated for user_id={user_id}, status={resp.status}")
-                        return True
-                    else:
-                        logger.error(
-                            f"Failed to update user data for user_id={user_id}: status={resp.status}, response={response_text}")
-                        return False
+        async with backend_client.get(url) as resp_get:
+            if resp_get.status != 200:
+                logger.error(f"Failed to fetch current user data for user_id={user_id}: status={resp_get.status}")
+                return False
+            current_data = await resp_get.json()
+
+        # Сравниваем текущие данные с payload
+        update_needed = False
+        for key, value in payload.items():
+            if current_data.get(key) != value:
+                update_needed = True
+                break
+
+        if not update_needed:
+            logger.info(f"No changes needed for user_id={user_id}")
+            return True
+
+        # Выполняем обновление только если есть изменения
+        async with backend_client.patch(url, json=payload) as resp:
+            response_text = await resp.text()
+            if resp.status in [200, 201]:
+                logger.info(f"User data updated for user_id={user_id}, status={resp.status}")
+                # Телефон и данные карты могли измениться
+                identity_cache.invalidate_user(user_id)
+                return True
+            else:
+                logger.error(
+                    f"Failed to update user data for user_id={user_id}: status={resp.status}, response={response_text}")
+                return False
     except aiohttp.ClientError as e:
         logger.exception(f"Client error while updating user data for user_id={user_id}: {str(e)}")
         return False
     except Exception as e:
         logger.exception(f"Unexpected error while updating user_data for user_id={user_id}: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+async def iter_user_pages(
+    page_size: Optional[int] = None,
+    fields: Optional[list[str]] = None,
+    endpoint: str = url_users,
+    **filters
+) -> AsyncIterator[list[dict]]:
+    """
+    Постранично получает пользователей из API, не загружая всю таблицу разом.
+    Аргументы:
+        page_size (int): Размер страницы (по умолчанию config_settings.USERS_PAGE_SIZE).
+        fields (list[str]): Нужные поля пользователя; остальные отбрасываются сразу после получения страницы.
+        endpoint (str): Адрес списка пользователей (по умолчанию url_users, например, подписчики подписки).
+        **filters: Дополнительные параметры запроса (например, is_active=True).
+    Возвращает:
+        AsyncIterator[list[dict]]: Страницы пользователей по мере их получения.
+    Исключения:
+        aiohttp.ClientResponseError: Если API ответил ошибкой.
+        aiohttp.ClientError: При ошибке соединения.
+    Примечания:
+        Поддерживаются ответы DRF ({"results": [...], "next": ...}) с курсорной
+        и limit/offset пагинацией - следующая страница берётся из "next".
+        Если API вернул обычный список, он отдаётся частями по page_size.
+    """
+    page_size = page_size or config_settings.USERS_PAGE_SIZE
+    params = {**filters, "limit": page_size, "page_size": page_size}
+    if fields:
+        params["fields"] = ",".join(fields)
+
+    url = endpoint
+    page_number = 0
+    while url:
+        async with backend_client.get(url, params=params) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+
+        if isinstance(data, list):
+            # API без пагинации - отдаём тот же список частями
+            logger.debug(f"Users endpoint returned a plain list of {len(data)} users")
+            for start in range(0, len(data), page_size):
+                yield _project_users(data[start:start + page_size], fields)
+            return
+
+        page_number += 1
+        results = data.get("results") or []
+        logger.debug(f"Fetched users page {page_number}: {len(results)} users")
+        yield _project_users(results, fields)
+
+        next_url = data.get("next")
+        if not next_url or next_url == url:
+            return
+        # В "next" уже есть все параметры запроса
+        url, params = next_url, None
+
+
+async def count_users(endpoint: str = url_users, **filters) -> Optional[int]:
+    """
+    Возвращает количество пользователей, запрашивая одну минимальную страницу.
+    Аргументы:
+        endpoint (str): Адрес списка пользователей.
+        **filters: Дополнительные параметры запроса.
+    Возвращает:
+        Optional[int]: Поле "count" пагинированного ответа; None, если API не поддерживает
+        пагинацию и количество не известно.
+    Исключения:
+        aiohttp.ClientError: При ошибке запроса.
+    Примечания:
+        Адрес, вернувший обычный список, запоминается на CACHE_TTL_USERS_STATS_UNSUPPORTED
+        секунд и не запрашивается повторно, чтобы не загружать всю таблицу ради количества.
+    """
+    if _unpaginated_endpoints.get(endpoint):
+        return None
+    params = {**filters, "limit": 1, "page_size": 1, "fields": "id"}
+    async with backend_client.get(endpoint, params=params) as resp:
+        resp.raise_for_status()
+        data = await resp.json()
+    if isinstance(data, list):
+        logger.warning(f"{endpoint} does not support pagination, users are not counted")
+        _unpaginated_endpoints.set(endpoint, True)
+        return None
+    return data.get("count")
+
+
+async def get_users_page(page: int, page_size: Optional[int] = None, fields: Optional[list[str]] = None) -> tuple[list[dict], int]:
+    """
+    Получает одну страницу списка пользователей.
+    Аргументы:
+        page (int): Номер страницы, начиная с 1.
+        page_size (int): Размер страницы (по умолчанию config_settings.USERS_LIST_PAGE_SIZE).
+        fields (list[str]): Нужные поля пользователя.
+    Возвращает:
+        tuple[list[dict], int]: Пользователи страницы и общее количество пользователей.
+    Исключения:
+        aiohttp.ClientError: При ошибке запроса.
+    Примечания:
+        Передаются параметры обеих схем пагинации DRF (limit/offset и page/page_size),
+        как и в iter_user_pages. Если API вернул обычный список, страница вырезается из него.
+    """
+    page_size = page_size or config_settings.USERS_LIST_PAGE_SIZE
+    offset = (page - 1) * page_size
+    params = {"limit": page_size, "offset": offset, "page": page, "page_size": page_size}
+    if fields:
+        params["fields"] = ",".join(fields)
+    async with backend_client.get(url_users, params=params) as resp:
+        resp.raise_for_status()
+        data = await resp.json()
+    if isinstance(data, list):
+        return _project_users(data[offset:offset + page_size], fields), len(data)
+    results = data.get("results") or []
+    return _project_users(results, fields), data.get("count", offset + len(results))
+
+
+async def get_users_stats() -> dict:
+    """
+    Возвращает сводную статистику пользователей, посчитанную на бэкенде.
+    Возвращает:
+        dict: total, active, new_today, new_week и subscriptions - список {"id", "name", "count"}.
+        Поля, которых нет в ответе, равны None.
+    Исключения:
+        aiohttp.ClientError: При ошибке запроса.
+    Примечания:
+        Ответ users/stats/ кэшируется на CACHE_TTL_USERS_STATS секунд. Если бэкенд не
+        поддерживает users/stats/ (404), адрес не запрашивается CACHE_TTL_USERS_STATS_UNSUPPORTED
+        секунд, а числа собираются запросами count по одной минимальной странице (всего,
+        активные, подписчики каждой подписки) и кэшируются на CACHE_TTL_USERS_STATS секунд;
+        новых пользователей так посчитать нельзя. Фильтр is_active списка пользователей
+        не документирован: если с ним получается столько же, сколько всего, бэкенд его,
+        скорее всего, игнорирует, и число активных не показывается (None).
+    """
+    if _users_stats_cache.get("unsupported") is None:
+        try:
+            stats = await backend_client.get_json(
+                url_users_stats,
+                ttl=config_settings.CACHE_TTL_USERS_STATS,
+                stale_ttl=config_settings.CACHE_MAX_STALE
+            )
+            return {field: stats.get(field) for field in USERS_STATS_FIELDS}
+        except aiohttp.ClientResponseError as e:
+            if e.status != 404:
+                raise
+            logger.info("users/stats/ is not available, counting users page by page")
+            _users_stats_cache.set("unsupported", True, config_settings.CACHE_TTL_USERS_STATS_UNSUPPORTED)
+
+    stats = _users_stats_cache.get("counts")
+    if stats is None:
+        stats = await _count_users_stats()
+        _users_stats_cache.set("counts", stats)
+    return {field: stats.get(field) for field in USERS_STATS_FIELDS}
+
+
+async def _count_users_stats() -> dict:
+    subscriptions = await backend_client.get_json(
+        url_subscription,
+        ttl=config_settings.CACHE_TTL_SUBSCRIPTIONS,
+        stale_ttl=config_settings.CACHE_MAX_STALE
+    )
+    total, active, *counts = await asyncio.gather(
+        count_users(),
+        count_users(is_active="true"),
+        *(_count_subscription_users(item["id"]) for item in subscriptions)
+    )
+    if active == total:
+        active = None
+    return {
+        "total": total,
+        "active": active,
+        "subscriptions": [
+            {"id": item["id"], "name": item.get("name"), "count": count}
+            for item, count in zip(subscriptions, counts)
+        ],
+    }
+
+
+async def _count_subscription_users(subscription_id: int) -> Optional[int]:
+    try:
+        return await count_users(endpoint=url_subscription_users.format(subscription_id=subscription_id))
+    except aiohttp.ClientResponseError as e:
+        if e.status != 404:
+            raise
+        logger.warning(f"Subscription {subscription_id} users endpoint is not available")
+        return None
+
+
+async def deactivate_user(tg_id: int) -> bool:
+    """
+    Помечает пользователя неактивным (заблокировал бота или удалил аккаунт).
+    Аргументы:
+        tg_id (int): Telegram ID пользователя.
+    Возвращает:
+        bool: True, если бэкенд принял изменение или пользователя уже нет (404).
+    """
+    return await _set_user_active(tg_id, False)
+
+
+async def reactivate_user(tg_id: int) -> bool:
+    """
+    Снова помечает пользователя активным (после deactivate_user он запустил бота).
+    Аргументы:
+        tg_id (int): Telegram ID пользователя.
+    Возвращает:
+        bool: True, если бэкенд принял изменение или пользователя нет (404).
+    """
+    return await _set_user_active(tg_id, True)
+
+
+async def _set_user_active(tg_id: int, is_active: bool) -> bool:
+    action = "activate" if is_active else "deactivate"
+    try:
+        async with backend_client.patch(backend_client.url(url_users, tg_id), json={"is_active": is_active}) as resp:
+            if resp.status in (200, 204, 404):
+                return True
+            logger.error(f"Failed to {action} user tg_id={tg_id}: status={resp.status}")
+            return False
+    except aiohttp.ClientError as e:
+        logger.error(f"Client error while trying to {action} user tg_id={tg_id}: {e}")
+        return False
+
+
+def _project_users(users: list[dict], fields: Optional[list[str]]) -> list[dict]:
+    if not fields:
+        return users
+    return [{field: user.get(field) for field in fields} for user in users]
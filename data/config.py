@@ -11,6 +11,70 @@ class Settings(BaseSettings):
     BOT_API_KEY: SecretStr
     APP_URL: str
 
+    # Пул соединений к API бэкенда
+    BACKEND_TIMEOUT: float = 10
+    BACKEND_POOL_LIMIT: int = 100
+    BACKEND_POOL_LIMIT_PER_HOST: int = 30
+
+    # Кэш справочных ответов бэкенда (TTL в секундах)
+    BACKEND_CACHE_MAXSIZE: int = 256
+    CACHE_TTL_SUBSCRIPTIONS: float = 300
+    CACHE_TTL_CATEGORIES: float = 300
+    CACHE_TTL_POINTS_SETTINGS: float = 60
+    CACHE_TTL_EVENTS: float = 60
+    CACHE_TTL_RESIDENTS: float = 60
+    CACHE_TTL_USERS_STATS: float = 60
+    # Сколько не запрашивать users/stats/ после ответа 404 (бэкенд не поддерживает сводку)
+    CACHE_TTL_USERS_STATS_UNSUPPORTED: float = 600
+    # Кэш идентификаторов (tg_id -> user_id, карта, резидент): найденные соответствия
+    # и ответы "не найдено" (в секундах), максимальное число записей
+    CACHE_TTL_IDENTITY: float = 86400
+    CACHE_TTL_IDENTITY_MISSING: float = 30
+    IDENTITY_CACHE_MAXSIZE: int = 10000
+    # Сколько ещё отдавать устаревший ответ, пока бэкенд недоступен
+    CACHE_MAX_STALE: float = 3600
+
+    # Повторы и автомат отключения адресов бэкенда
+    BACKEND_RETRY_ATTEMPTS: int = 3
+    BACKEND_RETRY_BASE_DELAY: float = 0.2
+    BACKEND_RETRY_MAX_DELAY: float = 2.0
+    BACKEND_BREAKER_THRESHOLD: int = 5
+    BACKEND_BREAKER_RECOVERY: float = 30
+
+    # Размер страницы при постраничной выборке пользователей
+    USERS_PAGE_SIZE: int = 500
+    # Сколько пользователей показывать на одной странице списка в админ-панели
+    USERS_LIST_PAGE_SIZE: int = 20
+
+    # Рассылки: лимит сообщений в секунду и число параллельных отправок.
+    # Лимит Telegram (~30/с) общий для бота, часть оставляем под ответы пользователям
+    MAILING_RATE_LIMIT: float = 25
+    MAILING_WORKERS: int = 16
+    # Файл SQLite с рассылками и размер порции, после которой сохраняется прогресс
+    MAILING_DB_PATH: str = "data/mailing.sqlite3"
+    MAILING_BATCH_SIZE: int = 200
+    # Как часто (в секундах) обновлять сообщение с прогрессом длительных операций
+    PROGRESS_UPDATE_INTERVAL: float = 3
+
+    # Общая очередь исходящих сообщений: лимит бота в секунду,
+    # лимит личного чата (сообщений в секунду и допустимая серия) и группы (в минуту)
+    OUTBOUND_RATE_LIMIT: float = 30
+    OUTBOUND_CHAT_RATE: float = 1
+    OUTBOUND_CHAT_BURST: int = 3
+    OUTBOUND_GROUP_PER_MINUTE: int = 20
+
+    # Кэш готовых выгрузок на диске: пока данные не менялись, повторно отправляется
+    # сохранённый файл (но не дольше EXPORT_CACHE_TTL секунд после сборки)
+    EXPORT_CACHE_DIR: str = "data/exports"
+    EXPORT_CACHE_TTL: float = 86400
+
+    # Фоновая проверка доступности бэкенда: интервал и таймаут подключения (в секундах).
+    # Статус отдаётся на http://HEALTH_HOST:HEALTH_PORT/healthz; 0 (по умолчанию) - эндпоинт
+    # не поднимается
+    HEALTH_CHECK_INTERVAL: float = 15
+    HEALTH_CHECK_TIMEOUT: float = 3
+    HEALTH_HOST: str = "127.0.0.1"
+    HEALTH_PORT: int = 0
 
     model_config = SettingsConfigDict(env_file='.env',
                                       env_file_encoding='utf-8',
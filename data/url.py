@@ -3,9 +3,11 @@ from data.config import config_settings
 base_url = config_settings.base_url
 
 url_users = f"{base_url}/users/"
+url_users_stats = f"{base_url}/users/stats/"
 url_mailing = f"{base_url}/mailings/"
 url_loyalty = f"{base_url}/loyalty-cards/"
 url_subscription = f"{base_url}/subscriptions/"
+url_subscription_users = f"{base_url}/subscriptions/{{subscription_id}}/users/"
 url_resident = f"{base_url}/residents/"
 url_category = f"{base_url}/categories/"
 url_point_transactions_accrue = f'{base_url}/resident/points-transactions/accrue/'
@@ -1,13 +1,12 @@
-import re
 import aiohttp
 from aiogram import Router, F
 from aiogram.types import Message, BufferedInputFile, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
 from client.services.loyalty import fetch_loyalty_card
-from data.config import config_settings
 from data.url import url_point_transactions_accrue, url_resident
 from resident_admin.keyboards.res_admin_reply import back_to_menu_kb, res_admin_keyboard
-from resident_admin.services.point_transactions import find_user_by_card_number, get_card_number_by_user, find_user_by_phone, get_card_id_by_tg_id, get_user_id_by_tg_id
+from resident_admin.services.point_transactions import get_user_id_by_tg_id, lookup_customer
 from resident_admin.services.resident_required import resident_required
+from utils.backend import BackendClient
 from utils.filters import ChatTypeFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
@@ -41,114 +40,57 @@ async def start_bonus_transaction(message: Message, state: FSMContext):
 @RA_bonus_router.message(TransactionFSM.number)
 @resident_required
 async def process_phone_or_card(message: Message, state: FSMContext):
-    input_text = message.text.strip()
-    phone_pattern = r'^\+?7\d{10}$'
-    card_number_pattern = r'^\d{3}\s?\d{3}$'
     transaction_keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="Начисление", callback_data="transaction_accrue")]
     ])
 
-    if re.match(phone_pattern, input_text):
-        phone_number = input_text.replace('+', '')
-        logger.info(f"Processing phone_number: {phone_number}")
-        user_data = await find_user_by_phone(phone_number)
-        if user_data and user_data.get('tg_id'):
-            card_number = await get_card_number_by_user(user_data['tg_id'])
-            if card_number:
-                card_id = await get_card_id_by_tg_id(user_data['tg_id'])
-                if card_id is None:
-                    await message.answer(
-                        "Не удалось получить данные карты. Попробуйте еще раз или введите номер телефона:",
-                        reply_markup=back_to_menu_kb
-                    )
-                    await state.set_state(TransactionFSM.number)
-                    return
-                card_data = await fetch_loyalty_card(user_data['tg_id'])
-                if card_data and card_data.get('card_image'):
-                    await state.update_data(
-                        user_data=user_data,
-                        card_number=card_number,
-                        card_id=card_id
-                    )
-                    await message.answer("Для возврата в главное меню нажмите кнопку '↩ Обратно'.",
-                                        reply_markup=back_to_menu_kb)
-                    await message.answer_photo(
-                        photo=BufferedInputFile(card_data['card_image'], filename=f"card_{card_number}.png"),
-                        caption=f"Карта найдена: {card_number} (Клиент: {user_data['user_first_name']} {user_data['user_last_name']})",
-                        reply_markup=back_to_menu_kb
-                    )
-                    await message.answer(
-                        "Выберите тип операции:",
-                        reply_markup=transaction_keyboard
-                    )
-                    await state.set_state(TransactionFSM.transaction_type)
-                else:
-                    await message.answer(
-                        "Не удалось сгенерировать изображение карты. Попробуйте еще раз или введите номер телефона:",
-                        reply_markup=back_to_menu_kb
-                    )
-                    await state.set_state(TransactionFSM.number)
-            else:
-                await message.answer(
-                    "Карта не найдена для данного пользователя. Попробуйте ввести номер карты (формат: 123 456):",
-                    reply_markup=back_to_menu_kb
-                )
-                await state.set_state(TransactionFSM.number)
-        else:
-            await message.answer(
-                "Пользователь не найден по номеру телефона. Попробуйте ввести номер карты (формат: 123 456):",
-                reply_markup=back_to_menu_kb
-            )
-            await state.set_state(TransactionFSM.number)
-    elif re.match(card_number_pattern, input_text):
-        card_number = input_text.replace(' ', '')
-        logger.info(f"Processing card_number: {card_number}")
-        user_data = await find_user_by_card_number(card_number)
-        if user_data and user_data.get('tg_id'):
-            card_id = await get_card_id_by_tg_id(user_data['tg_id'])
-            if card_id is None:
-                await message.answer(
-                    "Не удалось получить данные карты. Попробуйте еще раз или введите номер телефона:",
-                    reply_markup=back_to_menu_kb
-                )
-                await state.set_state(TransactionFSM.number)
-                return
-            card_data = await fetch_loyalty_card(user_data['tg_id'])
-            if card_data and card_data.get('card_image'):
-                await state.update_data(
-                    user_data=user_data,
-                    card_number=card_number,
-                    card_id=card_id
-                )
-                await message.answer("Для возврата в главное меню нажмите кнопку '↩ Обратно'.",
-                                    reply_markup=back_to_menu_kb)
-                await message.answer_photo(
-                    photo=BufferedInputFile(card_data['card_image'], filename=f"card_{card_number}.png"),
-                    caption=f"Карта найдена: {card_number} (Клиент: {user_data['user_first_name']} {user_data['user_last_name']})",
-                    reply_markup=back_to_menu_kb
-                )
-                await message.answer(
-                    "Выберите тип операции:",
-                    reply_markup=transaction_keyboard
-                )
-                await state.set_state(TransactionFSM.transaction_type)
-            else:
-                await message.answer(
-                    "Не удалось сгенерировать изображение карты. Попробуйте еще раз или введите номер телефона:",
-                    reply_markup=back_to_menu_kb
-                )
-                await state.set_state(TransactionFSM.number)
-        else:
-            await message.answer(
-                "Пользователь не найден по номеру карты. Попробуйте еще раз или введите номер телефона:",
-                reply_markup=back_to_menu_kb
-            )
-            await state.set_state(TransactionFSM.number)
-    else:
+    try:
+        # Все данные покупателя запрашиваются одним вызовом, независимые запросы идут параллельно
+        customer = await lookup_customer(message.text)
+    except ValueError:
         await message.answer(
             "Неверный формат. Введите номер телефона (79998887766 или +79998887766) или номер карты (123 456):",
             reply_markup=back_to_menu_kb
         )
+        return
+
+    if not customer.user:
+        if customer.by == "phone":
+            text = "Пользователь не найден по номеру телефона. Попробуйте ввести номер карты (формат: 123 456):"
+        else:
+            text = "Пользователь не найден по номеру карты. Попробуйте еще раз или введите номер телефона:"
+    elif not customer.card_number:
+        text = "Карта не найдена для данного пользователя. Попробуйте ввести номер карты (формат: 123 456):"
+    elif customer.card_id is None:
+        text = "Не удалось получить данные карты. Попробуйте еще раз или введите номер телефона:"
+    elif not customer.card_image:
+        text = "Не удалось сгенерировать изображение карты. Попробуйте еще раз или введите номер телефона:"
+    else:
+        text = None
+
+    if text:
+        await message.answer(text, reply_markup=back_to_menu_kb)
+        await state.set_state(TransactionFSM.number)
+        return
+
+    user_data = customer.user
+    await state.update_data(
+        user_data=user_data,
+        card_number=customer.card_number,
+        card_id=customer.card_id
+    )
+    await message.answer("Для возврата в главное меню нажмите кнопку '↩ Обратно'.",
+                        reply_markup=back_to_menu_kb)
+    await message.answer_photo(
+        photo=BufferedInputFile(customer.card_image, filename=f"card_{customer.card_number}.png"),
+        caption=f"Карта найдена: {customer.card_number} (Клиент: {user_data['user_first_name']} {user_data['user_last_name']})",
+        reply_markup=back_to_menu_kb
+    )
+    await message.answer(
+        "Выберите тип операции:",
+        reply_markup=transaction_keyboard
+    )
+    await state.set_state(TransactionFSM.transaction_type)
 
 @RA_bonus_router.callback_query(TransactionFSM.transaction_type)
 @resident_required
@@ -164,7 +106,7 @@ async def process_transaction_type(callback: CallbackQuery, state: FSMContext):
 
 @RA_bonus_router.message(TransactionFSM.price)
 @resident_required
-async def process_transaction_price(message: Message, state: FSMContext):
+async def process_transaction_price(message: Message, state: FSMContext, backend: BackendClient):
     """Обработка суммы для начисления бонусов."""
     try:
         price = float(message.text.strip())
@@ -218,10 +160,7 @@ async def process_transaction_price(message: Message, state: FSMContext):
         await state.set_state(TransactionFSM.number)
         return
 
-    headers = {
-        "X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value(),
-        "X-Resident-ID": str(resident_id)
-    }
+    headers = {"X-Resident-ID": str(resident_id)}
 
     transaction_data = {
         'price': price,
@@ -229,43 +168,42 @@ async def process_transaction_price(message: Message, state: FSMContext):
     }
 
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            if transaction_type == "accrue":
-                url = url_point_transactions_accrue
-                async with session.post(url, headers=headers, json=transaction_data) as resp:
-                    if resp.status == 201:
-                        data = await resp.json()
-                        points = data.get('points', 0)
-                        card_data = await fetch_loyalty_card(tg_id)
-                        if card_data and card_data.get('card_image'):
-                            await message.answer_photo(
-                                photo=BufferedInputFile(card_data['card_image'], filename=f"card_{card_number}.png"),
-                                caption=(
-                                    f"Начислено бонусов: <b>{points}</b>\n\n"
-                                    f"за покупку на сумму <b>{price}</b> руб.\n\n"
-                                    f"Карта: {card_number} (Клиент: {user_data['user_first_name']} {user_data['user_last_name']})"
-                                ),
-                                reply_markup=back_to_menu_kb,
-                                parse_mode="HTML"
-                            )
-                        else:
-                            await message.answer(
+        if transaction_type == "accrue":
+            url = url_point_transactions_accrue
+            async with backend.post(url, headers=headers, json=transaction_data) as resp:
+                if resp.status == 201:
+                    data = await resp.json()
+                    points = data.get('points', 0)
+                    card_data = await fetch_loyalty_card(tg_id)
+                    if card_data and card_data.get('card_image'):
+                        await message.answer_photo(
+                            photo=BufferedInputFile(card_data['card_image'], filename=f"card_{card_number}.png"),
+                            caption=(
                                 f"Начислено бонусов: <b>{points}</b>\n\n"
                                 f"за покупку на сумму <b>{price}</b> руб.\n\n"
-                                f"Карта: {card_number} (Клиент: {user_data['user_first_name']} {user_data['user_last_name']})",
-                                reply_markup=back_to_menu_kb,
-                                parse_mode="HTML"
-                            )
-                        await state.set_state(None)
+                                f"Карта: {card_number} (Клиент: {user_data['user_first_name']} {user_data['user_last_name']})"
+                            ),
+                            reply_markup=back_to_menu_kb,
+                            parse_mode="HTML"
+                        )
                     else:
-                        error_data = await resp.json()
-                        error_msg = error_data.get('error', 'Неизвестная ошибка при начислении бонусов')
                         await message.answer(
-                            f"Ошибка:\n<b>{error_msg}</b>.\nПопробуйте ещё раз.",
+                            f"Начислено бонусов: <b>{points}</b>\n\n"
+                            f"за покупку на сумму <b>{price}</b> руб.\n\n"
+                            f"Карта: {card_number} (Клиент: {user_data['user_first_name']} {user_data['user_last_name']})",
                             reply_markup=back_to_menu_kb,
                             parse_mode="HTML"
                         )
-                        await state.set_state(TransactionFSM.price)
+                    await state.set_state(None)
+                else:
+                    error_data = await resp.json()
+                    error_msg = error_data.get('error', 'Неизвестная ошибка при начислении бонусов')
+                    await message.answer(
+                        f"Ошибка:\n<b>{error_msg}</b>.\nПопробуйте ещё раз.",
+                        reply_markup=back_to_menu_kb,
+                        parse_mode="HTML"
+                    )
+                    await state.set_state(TransactionFSM.price)
     except aiohttp.ClientError as e:
         logger.error(f"Error processing transaction {transaction_type} for card_id={card_id}: {e}")
         await message.answer(
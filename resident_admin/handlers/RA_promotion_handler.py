@@ -11,8 +11,8 @@ from aiogram.utils.keyboard import ReplyKeyboardBuilder
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
-from data.config import config_settings
 from data.url import url_promotions
+from utils.backend import backend_client
 from resident_admin.keyboards.res_admin_reply import res_admin_promotion_keyboard, res_admin_keyboard, res_admin_cancel_keyboard, res_admin_edit_promotion_keyboard
 from utils.filters import ChatTypeFilter
 from utils.photo import download_photo_from_telegram, validate_photo
@@ -120,8 +120,7 @@ async def finish_edit_promotion(message, state, updated_promotion, promotion, da
 
 async def create_new_promotion(promotion_data: dict, photo_file_id: str = None, resident_id: int = None, bot=None):
     logger.info(f"Creating promotion for resident_id={resident_id}")
-    url = f"{url_promotions}"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = url_promotions
     data = promotion_data.copy()
     form_data = aiohttp.FormData()
     for key, value in data.items():
@@ -146,31 +145,27 @@ async def create_new_promotion(promotion_data: dict, photo_file_id: str = None,
         raise Exception("Фото обязательно для создания акции")
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=form_data) as response:
-                if response.status == 201:
-                    logger.info(f"Promotion created successfully, status={response.status}")
-                    return await response.json()
-                else:
-                    logger.error(f"Failed to create promotion, status={response.status}")
-                    return None
+        async with backend_client.post(url, data=form_data) as response:
+            if response.status == 201:
+                logger.info(f"Promotion created successfully, status={response.status}")
+                return await response.json()
+            else:
+                logger.error(f"Failed to create promotion, status={response.status}")
+                return None
     except aiohttp.ClientError as e:
         logger.error(f"HTTP Client Error creating promotion: {e}")
         return None
 
 async def get_promotion_list(resident_id: int):
     logger.info(f"Fetching promotion list for resident_id={resident_id}")
-    url = f"{url_promotions}?resident={resident_id}"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    logger.info(f"Successfully fetched promotions, status={resp.status}")
-                    return await resp.json()
-                else:
-                    logger.error(f"Failed to fetch promotions, status={resp.status}")
-                    return []
+        async with backend_client.get(url_promotions, params={"resident": resident_id}) as resp:
+            if resp.status == 200:
+                logger.info(f"Successfully fetched promotions, status={resp.status}")
+                return await resp.json()
+            else:
+                logger.error(f"Failed to fetch promotions, status={resp.status}")
+                return []
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching promotions: {e}")
         return []
@@ -189,8 +184,7 @@ async def get_promotion_by_title(title: str, state: FSMContext) -> dict:
 
 async def update_promotion(promotion_id: int, updated_fields: dict, bot: Bot = None):
     logger.info(f"Updating promotion {promotion_id} with fields: {updated_fields}")
-    url = f"{url_promotions}{promotion_id}/"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = backend_client.url(url_promotions, promotion_id)
     form_data = aiohttp.FormData()
     for key, value in updated_fields.items():
         logger.info(f"{key}={value}")
@@ -212,32 +206,29 @@ async def update_promotion(promotion_id: int, updated_fields: dict, bot: Bot = N
                 continue
             form_data.add_field(key, str(value))
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(url, headers=headers, data=form_data) as response:
-                response_text = await response.text()
-                if response.status == 200:
-                    logger.info(f"Promotion {promotion_id} updated successfully, status={response.status}")
-                    return await response.json()
-                else:
-                    logger.error(f"Failed to update promotion {promotion_id}, status={response.status}, response={response_text}")
-                    return False
+        async with backend_client.patch(url, data=form_data) as response:
+            response_text = await response.text()
+            if response.status == 200:
+                logger.info(f"Promotion {promotion_id} updated successfully, status={response.status}")
+                return await response.json()
+            else:
+                logger.error(f"Failed to update promotion {promotion_id}, status={response.status}, response={response_text}")
+                return False
     except Exception as e:
         logger.error(f"Error updating promotion {promotion_id}: {e}")
         return False
 
 async def delete_promotion(promotion_id: int) -> bool:
     logger.info(f"Deleting promotion {promotion_id}")
-    url = f"{url_promotions}{promotion_id}/"
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    url = backend_client.url(url_promotions, promotion_id)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url, headers=headers) as resp:
-                if resp.status in (200, 204):
-                    logger.info(f"Promotion {promotion_id} deleted successfully, status={resp.status}")
-                    return True
-                else:
-                    logger.error(f"Failed to delete promotion {promotion_id}, status={resp.status}")
-                    return False
+        async with backend_client.delete(url) as resp:
+            if resp.status in (200, 204):
+                logger.info(f"Promotion {promotion_id} deleted successfully, status={resp.status}")
+                return True
+            else:
+                logger.error(f"Failed to delete promotion {promotion_id}, status={resp.status}")
+                return False
     except Exception as e:
         logger.error(f"Error deleting promotion {promotion_id}: {e}")
         return False
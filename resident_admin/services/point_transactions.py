@@ -1,15 +1,31 @@
+import asyncio
+import re
+
 from client.services.loyalty import fetch_loyalty_card
-from data.config import config_settings
 from data.url import url_users, url_loyalty, url_point_transactions_deduct, url_resident
+from utils.backend import backend_client
+from utils.identity import identity_cache
 import aiohttp
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Форматы ввода кассира: телефон (79998887766 или +79998887766) и номер карты (123 456)
+PHONE_PATTERN = re.compile(r'^\+?7\d{10}$')
+CARD_NUMBER_PATTERN = re.compile(r'^\d{3}\s?\d{3}$')
+
+
+def _user_info(data: dict) -> dict:
+    return {
+        "tg_id": data.get("tg_id"),
+        "user_first_name": data.get("user_first_name"),
+        "user_last_name": data.get("user_last_name"),
+        "phone_number": data.get("phone_number")
+    }
+
 
 async def find_user_by_phone(phone_number: str) -> dict:
-    """Поиск пользователя по номеру телефона через API."""
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    """Поиск пользователя по номеру телефона через API (с кэшем идентификаторов)."""
     # Нормализуем номер телефона
     phone_number_clean = ''.join(filter(str.isdigit, phone_number))
     phone_variants = [phone_number_clean]
@@ -18,140 +34,250 @@ async def find_user_by_phone(phone_number: str) -> dict:
     elif phone_number_clean.startswith('7'):
         phone_variants.append(f"+{phone_number_clean}")
 
-    for variant in phone_variants:
-        url = f"{url_users}phone/{variant}/"
+    async def fetch_variant(variant: str) -> dict | None:
+        url = backend_client.url(url_users, "phone", variant)
         logger.info(f"Fetching user by phone_number={variant}, URL={url}")
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                async with session.get(url, headers=headers) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        logger.info(f"Successfully fetched user by phone_number={variant}: {data}")
-                        return {
-                            "tg_id": data.get("tg_id"),
-                            "user_first_name": data.get("user_first_name"),
-                            "user_last_name": data.get("user_last_name"),
-                            "phone_number": data.get("phone_number")
-                        }
-                    else:
-                        logger.warning(f"Failed to fetch user by phone_number={variant}, status={resp.status}")
+            async with backend_client.get(url) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    logger.info(f"Successfully fetched user by phone_number={variant}: {data}")
+                    return _user_info(data)
+                logger.warning(f"Failed to fetch user by phone_number={variant}, status={resp.status}")
+                if resp.status != 404:
+                    resp.raise_for_status()
+                return None
         except aiohttp.ClientError as e:
             logger.error(f"Error fetching user by phone_number={variant}: {e}")
+            raise
+
+    async def load() -> dict | None:
+        # Варианты номера проверяются одновременно, приоритет - в порядке списка
+        results = await asyncio.gather(*(fetch_variant(v) for v in phone_variants), return_exceptions=True)
+        for result in results:
+            if isinstance(result, dict):
+                return result
+        # "Не найдено" кэшируется, только если ни один вариант не завершился ошибкой
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return None
 
-    logger.warning(f"No user found for phone_number={phone_number} in any format")
-    return {}
+    try:
+        user = await identity_cache.get("phone", phone_number_clean, load, tg_id=lambda user: user["tg_id"])
+    except aiohttp.ClientError:
+        user = None
+    if not user:
+        logger.warning(f"No user found for phone_number={phone_number} in any format")
+        return {}
+    return user
 
 
 async def find_user_by_card_number(card_number: str) -> dict:
-    """Поиск пользователя по номеру карты через API."""
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    """Поиск пользователя по номеру карты через API (с кэшем идентификаторов)."""
     # Форматируем номер карты для соответствия формату "123 456"
     card_number_clean = f"{card_number[:3]} {card_number[3:]}"
-    url = f"{url_loyalty}card-number/{card_number_clean}/"
-    logger.info(f"Fetching user by card_number={card_number_clean}, URL={url}")
+
+    async def load() -> dict | None:
+        url = backend_client.url(url_loyalty, "card-number", card_number_clean)
+        logger.info(f"Fetching user by card_number={card_number_clean}, URL={url}")
+        async with backend_client.get(url) as resp:
+            if resp.status == 404:
+                logger.warning(f"User with card_number={card_number_clean} not found")
+                return None
+            resp.raise_for_status()
+            data = await resp.json()
+        logger.info(f"Successfully fetched user by card_number={card_number_clean}")
+        return _user_info(data)
 
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    logger.info(f"Successfully fetched user by card_number={card_number_clean}")
-                    return {
-                        "tg_id": data.get("tg_id"),
-                        "user_first_name": data.get("user_first_name"),
-                        "user_last_name": data.get("user_last_name"),
-                        "phone_number": data.get("phone_number")
-                    }
-                else:
-                    logger.warning(f"Failed to fetch user by card_number={card_number_clean}, status={resp.status}")
-                    return {}
+        user = await identity_cache.get("card_number", card_number_clean, load, tg_id=lambda user: user["tg_id"])
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching user by card_number={card_number_clean}: {e}")
         return {}
+    return user or {}
+
 
 async def get_card_number_by_user(tg_id: int) -> str | None:
-    """Получение номера карты по tg_id через API."""
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-    url = f"{url_loyalty}{tg_id}/card-number/"
+    """Получение номера карты по tg_id через API (с кэшем идентификаторов)."""
+    async def load() -> str | None:
+        async with backend_client.get(backend_client.url(url_loyalty, tg_id, "card-number")) as resp:
+            if resp.status == 404:
+                return None
+            resp.raise_for_status()
+            data = await resp.json()
+        card_number = data.get('card_number')
+        logger.info(f"Successfully fetched card_number={card_number} for tg_id={tg_id}")
+        return card_number
 
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    card_number = data.get('card_number')
-                    logger.info(f"Successfully fetched card_number={card_number} for tg_id={tg_id}")
-                    return card_number
-                else:
-                    logger.warning(f"Failed to fetch card number for tg_id={tg_id}, status={resp.status}")
-                    return None
+        card_number = await identity_cache.get("tg_card_number", tg_id, load)
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching card number for tg_id={tg_id}: {e}")
         return None
+    if card_number is None:
+        logger.warning(f"No card number for tg_id={tg_id}")
+    return card_number
 
 
 async def get_card_id_by_tg_id(tg_id: int) -> int | None:
-    """Получение ID карты по tg_id через API."""
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
-    url = f"{url_loyalty}{tg_id}/card-id/"
+    """Получение ID карты по tg_id через API (с кэшем идентификаторов)."""
+    async def load() -> int | None:
+        async with backend_client.get(backend_client.url(url_loyalty, tg_id, "card-id")) as resp:
+            if resp.status == 404:
+                return None
+            resp.raise_for_status()
+            data = await resp.json()
+        card_id = data.get('card_id')
+        logger.info(f"Successfully fetched card_id={card_id} for tg_id={tg_id}")
+        return card_id
 
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    card_id = data.get('card_id')
-                    logger.info(f"Successfully fetched card_id={card_id} for tg_id={tg_id}")
-                    return card_id
-                else:
-                    logger.warning(f"Failed to fetch card_id for tg_id={tg_id}, status={resp.status}")
-                    return None
+        card_id = await identity_cache.get("card_id", tg_id, load)
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching card_id for tg_id={tg_id}: {e}")
         return None
+    if card_id is None:
+        logger.warning(f"No card_id for tg_id={tg_id}")
+    return card_id
 
 
 async def get_resident_id_by_user_id(user_id: int) -> int | None:
-    """Получение resident_id по user_id через API."""
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    """Получение resident_id по user_id через API (с кэшем идентификаторов)."""
+    async def load() -> int | None:
+        async with backend_client.get(url_resident, params={"user": user_id}) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+        if isinstance(data, dict):
+            data = data.get("results")
+        if data and isinstance(data, list):
+            resident_id = data[0].get('id')
+            logger.info(f"Successfully fetched resident_id={resident_id} for user_id={user_id}")
+            return resident_id
+        return None
+
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(f"{url_resident}?user={user_id}", headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data and isinstance(data, list) and len(data) > 0:
-                        resident_id = data[0].get('id')
-                        logger.info(f"Successfully fetched resident_id={resident_id} for user_id={user_id}")
-                        return resident_id
-                    else:
-                        logger.warning(f"No resident found for user_id={user_id}")
-                        return None
-                else:
-                    logger.warning(f"Failed to fetch resident_id for user_id={user_id}, status={resp.status}")
-                    return None
+        # Ключ - user_id, а не tg_id: привязка к резиденту не сбрасывается вместе с данными пользователя
+        resident_id = await identity_cache.get("resident_id", user_id, load, tg_id=lambda _: None)
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching resident_id for user_id={user_id}: {e}")
         return None
+    if resident_id is None:
+        logger.warning(f"No resident found for user_id={user_id}")
+    return resident_id
 
 
 async def get_user_id_by_tg_id(tg_id: int) -> int | None:
-    """Получение user_id по tg_id через API."""
-    headers = {"X-Bot-Api-Key": config_settings.BOT_API_KEY.get_secret_value()}
+    """Получение user_id по tg_id через API (с кэшем идентификаторов)."""
+    async def load() -> int | None:
+        async with backend_client.get(url_users, params={"tg_id": tg_id}) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+        if isinstance(data, dict):
+            data = data.get("results")
+        if data and isinstance(data, list):
+            user_id = data[0].get('id')
+            logger.info(f"Successfully fetched user_id={user_id} for tg_id={tg_id}")
+            return user_id
+        return None
+
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            async with session.get(f"{url_users}?tg_id={tg_id}", headers=headers) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data and isinstance(data, list) and len(data) > 0:
-                        user_id = data[0].get('id')
-                        logger.info(f"Successfully fetched user_id={user_id} for tg_id={tg_id}")
-                        return user_id
-                    else:
-                        logger.warning(f"No user found for tg_id={tg_id}")
-                        return None
-                else:
-                    logger.warning(f"Failed to fetch user_id for tg_id={tg_id}, status={resp.status}")
-                    return None
+        user_id = await identity_cache.get("user_id", tg_id, load)
     except aiohttp.ClientError as e:
         logger.error(f"Error fetching user_id for tg_id={tg_id}: {e}")
         return None
+    if user_id is None:
+        logger.warning(f"No user found for tg_id={tg_id}")
+    return user_id
+
+
+class CustomerLookup:
+    """Результат поиска покупателя на кассе.
+
+    Атрибуты:
+        by (str): Чем искали - "phone" или "card".
+        user (dict | None): tg_id, имя, фамилия и телефон; None - пользователь не найден.
+        card_number (str | None): Номер карты.
+        card_id (int | None): ID карты для начисления.
+        card_image (bytes | None): Изображение карты.
+        user_id (int | None): ID пользователя в API.
+    """
+
+    def __init__(
+        self,
+        by: str,
+        user: dict | None = None,
+        card_number: str | None = None,
+        card_id: int | None = None,
+        card_image: bytes | None = None,
+        user_id: int | None = None,
+    ):
+        self.by = by
+        self.user = user
+        self.card_number = card_number
+        self.card_id = card_id
+        self.card_image = card_image
+        self.user_id = user_id
+
+    @property
+    def found(self) -> bool:
+        """Найдены пользователь, карта и её изображение - можно проводить операцию."""
+        return bool(self.user and self.card_number and self.card_id is not None and self.card_image)
+
+    def __repr__(self) -> str:
+        return (
+            f"CustomerLookup(by={self.by!r}, tg_id={(self.user or {}).get('tg_id')}, "
+            f"card_number={self.card_number!r}, card_id={self.card_id}, user_id={self.user_id}, "
+            f"card_image={'yes' if self.card_image else 'no'})"
+        )
+
+
+async def lookup_customer(phone_or_card: str) -> CustomerLookup:
+    """
+    Находит покупателя по телефону или номеру карты со всеми данными для кассы.
+    Аргументы:
+        phone_or_card (str): Ввод кассира: телефон (79998887766, +79998887766) или номер карты (123 456).
+    Возвращает:
+        CustomerLookup: Пользователь, номер и ID карты, изображение карты и user_id;
+        ненайденные части равны None.
+    Исключения:
+        ValueError: Если ввод не похож ни на телефон, ни на номер карты.
+    Примечания:
+        Ввод нормализуется один раз. После того как известен tg_id, номер карты,
+        ID карты, изображение и user_id запрашиваются одновременно, поэтому
+        задержка - два последовательных запроса вместо пяти. Соответствия
+        идентификаторов берутся из identity_cache, изображение карты (в нём
+        баланс) запрашивается каждый раз.
+    """
+    text = phone_or_card.strip()
+    if PHONE_PATTERN.match(text):
+        by = "phone"
+        user = await find_user_by_phone(text.replace('+', ''))
+        card_number = None
+    elif CARD_NUMBER_PATTERN.match(text):
+        by = "card"
+        card_number = text.replace(' ', '')
+        user = await find_user_by_card_number(card_number)
+    else:
+        raise ValueError(f"Not a phone or card number: {phone_or_card!r}")
+
+    if not user or not user.get('tg_id'):
+        return CustomerLookup(by)
+
+    tg_id = user['tg_id']
+    lookups = [get_card_id_by_tg_id(tg_id), fetch_loyalty_card(tg_id), get_user_id_by_tg_id(tg_id)]
+    if card_number is None:
+        lookups.append(get_card_number_by_user(tg_id))
+    card_id, card, user_id, *found_card_number = await asyncio.gather(*lookups)
+    if found_card_number:
+        card_number = found_card_number[0]
+    result = CustomerLookup(
+        by,
+        user=user,
+        card_number=card_number,
+        card_id=card_id,
+        card_image=card.get('card_image') if card else None,
+        user_id=user_id,
+    )
+    logger.info(f"Customer lookup {by}: {result}")
+    return result
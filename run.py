@@ -1,7 +1,6 @@
 import asyncio
 import logging
 import os
-import sys
 
 from aiogram import Bot, Dispatcher, types
 
@@ -16,6 +15,10 @@ from admin.handlers.mailing_handler import admin_mailing_router
 from admin.handlers.event_handler import admin_event_router
 from admin.handlers.approve_reject_promo import admin_promotion_router
 from admin.handlers.points_system_settings import admin_points_settings_router
+from admin.services.export_jobs import export_jobs
+from admin.services.mailing_scheduler import mailing_scheduler
+from admin.services.mailing_worker import mailing_worker
+from admin.services.mailing_store import mailing_store
 from cmds.bot_cmds_list import bot_cmds_list
 from client.handlers.profile_handler import profile_router
 from client.handlers.start_handler import start_router
@@ -24,6 +27,9 @@ from resident_admin.handlers.RA_promotion_handler import RA_promotion_router
 from resident_admin.handlers.res_admin_handler import res_admin_router
 from resident_admin.handlers.RA_bonus_handler import RA_bonus_router
 from utils.services import notify_restart
+from utils.backend import backend_client
+from utils.health import health_monitor
+from utils.outbound import outbound_scheduler, setup_outbound
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -36,17 +42,19 @@ PROPERTIES = DefaultBotProperties(parse_mode=ParseMode.HTML)
 
 bot = Bot(token=config_settings.TOKEN.get_secret_value(),
           default=PROPERTIES)
+setup_outbound(bot)
 
 
 async def startup(dispatcher: Dispatcher):
     logger.info("Starting bot...")
     await notify_restart(bot, "работает")
+    await mailing_worker.start(bot)
+    await mailing_scheduler.start()
 
 
 async def shutdown(dispatcher: Dispatcher):
     logger.info("Shutting down...")
     await notify_restart(bot, "остановлен")
-    sys.exit(0)
 
 
 def setup_routers(dp: Dispatcher) -> None:
@@ -74,20 +82,32 @@ def setup_routers(dp: Dispatcher) -> None:
 
 
 async def main():
-    dp = Dispatcher()
+    await backend_client.start()
+    try:
+        # Всё, что открывается здесь, закрывается в finally, даже если запуск не удался
+        await health_monitor.start(config_settings.HEALTH_HOST, config_settings.HEALTH_PORT)
+        await mailing_store.open()
+        dp = Dispatcher(backend=backend_client)
 
-    await bot.set_my_commands(commands=bot_cmds_list,
-                              scope=types.BotCommandScopeAllPrivateChats())
-    setup_routers(dp) # Загрузка роутеров
-    dp.startup.register(startup)
-    dp.shutdown.register(shutdown)
+        await bot.set_my_commands(commands=bot_cmds_list,
+                                  scope=types.BotCommandScopeAllPrivateChats())
+        setup_routers(dp) # Загрузка роутеров
+        dp.startup.register(startup)
+        dp.shutdown.register(shutdown)
 
-    try:
         await dp.start_polling(bot)
     except Exception as e:
         logger.critical(f"Bot crashed: {e}")
     finally:
         logger.info("Bot stopped")
+        # Прогресс рассылок уже сохранён, после запуска они продолжатся
+        await mailing_scheduler.stop()
+        await mailing_worker.stop()
+        await export_jobs.stop()
+        logger.info(f"Outbound queue stats: {outbound_scheduler.stats()}")
+        await mailing_store.close()
+        await health_monitor.stop()
+        await backend_client.close()
         await bot.session.close()
 
 
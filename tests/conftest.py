@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Настройки, без которых не импортируется data.config; реальные токены тестам не нужны
+os.environ.setdefault("TOKEN", "123456:TEST-token-for-unit-tests-only")
+os.environ.setdefault("ADMIN_CHAT_ID", "-100")
+os.environ.setdefault("RESIDENT_ADMIN_CHAT_ID", "-200")
+os.environ.setdefault("base_url", "http://127.0.0.1:9/api")
+os.environ.setdefault("BOT_API_KEY", "test")
+os.environ.setdefault("APP_URL", "http://localhost")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from aiohttp import ClientResponseError, RequestInfo
+from yarl import URL
+
+from admin.services import audience
+from admin.services.audience import AudienceUnavailableError, collect_audience, estimate_audience
+
+
+def not_found() -> ClientResponseError:
+    info = RequestInfo(URL("http://backend/api/subscriptions/5/users/"), "GET", {}, URL("http://backend"))
+    return ClientResponseError(info, (), status=404)
+
+
+async def missing_user_pages(**kwargs):
+    raise not_found()
+    yield
+
+
+async def missing_count(**kwargs):
+    raise not_found()
+
+
+class SubscriptionAudienceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_collect_reports_missing_subscription_endpoint(self):
+        with mock.patch.object(audience, "iter_user_pages", missing_user_pages):
+            with self.assertRaises(AudienceUnavailableError) as raised:
+                await collect_audience([5])
+        self.assertEqual(raised.exception.subscription_id, 5)
+
+    async def test_estimate_reports_missing_subscription_endpoint(self):
+        with mock.patch.object(audience, "count_users", missing_count):
+            with self.assertRaises(AudienceUnavailableError):
+                await estimate_audience([5])
+
+    async def test_all_users_error_is_not_an_audience_error(self):
+        with mock.patch.object(audience, "count_users", missing_count):
+            self.assertEqual(await estimate_audience([]), (None, False))
+
+    def test_subscription_users_url(self):
+        self.assertTrue(audience.subscription_users_url(5).endswith("/subscriptions/5/users/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from admin.services import utils as admin_utils
+from admin.services.export_jobs import RESIDENTS_EXPORT, ExportCache, ExportJobs
+from utils.backend import BackendClient
+
+
+def resident(resident_id: int, name: str, categories: list[str]) -> dict:
+    fields = (
+        "description", "info", "working_time", "email", "phone_number", "official_website",
+        "address", "building", "entrance", "floor", "office", "photo", "pin_code",
+    )
+    return {
+        "id": resident_id,
+        "name": name,
+        **dict.fromkeys(fields, ""),
+        "categories": [{"name": category} for category in categories],
+    }
+
+
+class FakeProgress:
+    def update(self, text: str) -> None:
+        pass
+
+
+class ResidentsExportTest(unittest.IsolatedAsyncioTestCase):
+    """Выгрузка резидентов пересобирается, как только бэкенд вернул другие данные."""
+
+    async def asyncSetUp(self):
+        self.residents = [resident(1, "Кофейня", ["Еда"])]
+        app = web.Application()
+        app.router.add_get("/api/residents/", self.handle_residents)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        base_url = str(self.server.make_url("/api"))
+        self.client = BackendClient(base_url, "test")
+        url_patch = mock.patch.object(admin_utils, "url_resident", f"{base_url}/residents/")
+        client_patch = mock.patch.object(admin_utils, "backend_client", self.client)
+        url_patch.start()
+        client_patch.start()
+        self.addAsyncCleanup(self.server.close)
+        self.addAsyncCleanup(self.client.close)
+        self.addCleanup(url_patch.stop)
+        self.addCleanup(client_patch.stop)
+
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.jobs = ExportJobs(ExportCache(self.cache_dir.name))
+
+    async def handle_residents(self, request):
+        return web.json_response(self.residents)
+
+    async def prepare(self):
+        return await self.jobs._prepare("residents-csv", RESIDENTS_EXPORT, "csv", FakeProgress())
+
+    async def test_changed_backend_response_builds_new_file(self):
+        first, cached = await self.prepare()
+        self.assertFalse(cached)
+
+        same, cached = await self.prepare()
+        self.assertTrue(cached)
+        self.assertEqual(same["digest"], first["digest"])
+
+        self.residents = self.residents + [resident(2, "Аптека", [])]
+        changed, cached = await self.prepare()
+        self.assertFalse(cached)
+        self.assertNotEqual(changed["digest"], first["digest"])
+        self.assertEqual(changed["rows"], 2)
+
+    async def test_export_ignores_cached_resident_list(self):
+        # Список резидентов, закэшированный для меню, не должен попадать в выгрузку
+        await self.client.get_json(admin_utils.url_resident, ttl=3600, stale_ttl=3600)
+        self.residents = [resident(3, "Пекарня", [])]
+
+        pages = [page async for page in admin_utils.iter_resident_pages()]
+        self.assertEqual(pages, [self.residents])
+
+
+if __name__ == "__main__":
+    unittest.main()
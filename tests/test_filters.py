@@ -0,0 +1,46 @@
+import unittest
+from datetime import datetime
+
+from aiogram.types import CallbackQuery, Chat, ChatMemberAdministrator, ChatMemberMember, Message, User
+
+from utils.filters import ChatTypeFilter, IsGroupAdmin
+
+ADMIN_CHAT = -100
+USER = User(id=7, is_bot=False, first_name="Тест")
+
+
+class FakeBot:
+    def __init__(self, admin: bool):
+        self.admin = admin
+
+    async def get_chat_member(self, chat_id, user_id):
+        if self.admin:
+            return ChatMemberAdministrator(
+                user=USER, can_be_edited=False, is_anonymous=False, can_manage_chat=True,
+                can_delete_messages=True, can_manage_video_chats=True, can_restrict_members=True,
+                can_promote_members=False, can_change_info=True, can_invite_users=True,
+                can_post_stories=False, can_edit_stories=False, can_delete_stories=False,
+            )
+        return ChatMemberMember(user=USER)
+
+
+def callback(chat_type: str = "private") -> CallbackQuery:
+    message = Message(message_id=1, date=datetime.now(), chat=Chat(id=7, type=chat_type), from_user=USER)
+    return CallbackQuery(id="1", from_user=USER, chat_instance="1", message=message, data="mailing_pause:1")
+
+
+class CallbackAdminFilterTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_admin_callback_passes(self):
+        self.assertTrue(await IsGroupAdmin([ADMIN_CHAT], show_message=False)(callback(), FakeBot(admin=True)))
+
+    async def test_non_admin_callback_is_rejected(self):
+        self.assertFalse(await IsGroupAdmin([ADMIN_CHAT], show_message=False)(callback(), FakeBot(admin=False)))
+
+    async def test_chat_type_of_callback_message(self):
+        self.assertTrue(await ChatTypeFilter("private")(callback()))
+        self.assertFalse(await ChatTypeFilter("private")(callback("group")))
+
+
+if __name__ == "__main__":
+    unittest.main()
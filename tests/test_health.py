@@ -0,0 +1,36 @@
+import asyncio
+import socket
+import unittest
+
+from utils.health import HealthMonitor
+
+
+class HealthMonitorTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_busy_port_does_not_stop_startup(self):
+        busy = socket.socket()
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        self.addCleanup(busy.close)
+        port = busy.getsockname()[1]
+
+        monitor = HealthMonitor("http://127.0.0.1:9/api", interval=60)
+        await monitor.start("127.0.0.1", port)
+        self.addAsyncCleanup(monitor.stop)
+
+        self.assertIsNone(monitor._runner)
+        self.assertIsNotNone(monitor._task)
+
+    async def test_check_reports_available_backend(self):
+        server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        port = server.sockets[0].getsockname()[1]
+
+        monitor = HealthMonitor(f"http://127.0.0.1:{port}/api", timeout=1)
+        self.assertTrue(await monitor.check())
+        self.assertEqual(monitor.status()["status"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
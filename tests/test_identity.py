@@ -0,0 +1,47 @@
+import unittest
+
+from utils.identity import IdentityCache
+
+
+class IdentityCacheTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cache = IdentityCache(ttl=60, missing_ttl=60, maxsize=3)
+        self.calls = 0
+
+    def loader(self, value):
+        async def load():
+            self.calls += 1
+            return value
+        return load
+
+    async def test_invalidate_user_drops_owned_and_missing_entries(self):
+        await self.cache.get("user_id", 1, self.loader(101))
+        await self.cache.get("phone", "+70000000001", self.loader({"tg_id": 1}), tg_id=lambda user: user["tg_id"])
+        await self.cache.get("phone", "+70000000002", self.loader(None))
+
+        self.cache.invalidate_user(1)
+        self.assertEqual(len(self.cache._cache), 0)
+
+        await self.cache.get("user_id", 1, self.loader(101))
+        self.assertEqual(self.calls, 4)
+
+    async def test_invalidate_user_keeps_other_users(self):
+        await self.cache.get("user_id", 1, self.loader(101))
+        await self.cache.get("user_id", 2, self.loader(102))
+
+        self.cache.invalidate_user(1)
+
+        self.assertEqual(await self.cache.get("user_id", 2, self.loader(0)), 102)
+        self.assertEqual(self.calls, 2)
+
+    async def test_size_is_bounded_by_maxsize(self):
+        for tg_id in range(100):
+            await self.cache.get("user_id", tg_id, self.loader(tg_id))
+            await self.cache.get("card_id", tg_id, self.loader(None))
+
+        self.assertEqual(len(self.cache._cache), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from admin.services import mailing
+from admin.services.audience import RecipientSet
+from admin.services.mailing import MailingControl, collect_recipients
+from admin.services.mailing_store import JOB_CANCELLED, JOB_COLLECTING, JOB_PAUSED, JOB_RUNNING, MailingStore
+
+
+class CollectRecipientsTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = MailingStore(os.path.join(directory.name, "mailings.sqlite3"))
+        await self.store.open()
+        self.addAsyncCleanup(self.store.close)
+        patcher = mock.patch.object(mailing, "mailing_store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.job_id = await self.store.create_job("Текст", None, None, admin_chat_id=1, admin_user_id=1)
+        self.during_collection = None
+
+    async def fake_collect_audience(self, audience, stop=None):
+        if self.during_collection:
+            await self.during_collection()
+        recipients = RecipientSet()
+        recipients.add_many([10, 20, 30])
+        return recipients, 0
+
+    async def collect(self, control=None) -> bool:
+        with mock.patch.object(mailing, "collect_audience", self.fake_collect_audience):
+            return await collect_recipients(self.job_id, None, control)
+
+    async def status(self) -> str:
+        return (await self.store.get_job(self.job_id))["status"]
+
+    async def test_collected_job_starts_running(self):
+        self.assertTrue(await self.collect(MailingControl()))
+        self.assertEqual(await self.status(), JOB_RUNNING)
+        self.assertEqual(await self.store.pending_batch(self.job_id, 10), [10, 20, 30])
+
+    async def test_pause_in_store_during_collection_is_kept(self):
+        async def pause():
+            await self.store.set_status(self.job_id, JOB_PAUSED, (JOB_COLLECTING,))
+        self.during_collection = pause
+
+        self.assertFalse(await self.collect(MailingControl()))
+        job = await self.store.get_job(self.job_id)
+        self.assertEqual(job["status"], JOB_PAUSED)
+        # Получатели сохранены: после снятия с паузы рассылка продолжит отправку
+        self.assertEqual(job["total"], 3)
+
+    async def test_control_stop_during_collection(self):
+        control = MailingControl()
+
+        async def cancel():
+            control.request(JOB_CANCELLED)
+        self.during_collection = cancel
+
+        self.assertFalse(await self.collect(control))
+        job = await self.store.get_job(self.job_id)
+        self.assertEqual(job["status"], JOB_COLLECTING)
+        self.assertEqual(job["total"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import CopyMessages
+from aiogram.types import MessageId
+
+from admin.services.mailing import source_available
+
+JOB = {"id": 1, "admin_chat_id": 10, "source_chat_id": 10, "source_message_ids": [5, 6]}
+
+
+class FakeBot:
+    def __init__(self, copies=None, error=None):
+        self.copies = copies
+        self.error = error
+        self.deleted = []
+
+    async def copy_messages(self, chat_id, from_chat_id, message_ids, **kwargs):
+        if self.error:
+            raise self.error
+        return [MessageId(message_id=message_id) for message_id in self.copies]
+
+    async def delete_messages(self, chat_id, message_ids):
+        self.deleted.extend(message_ids)
+
+
+def bad_request(text: str) -> TelegramBadRequest:
+    method = CopyMessages(chat_id=10, from_chat_id=10, message_ids=[5, 6])
+    return TelegramBadRequest(method, f"Bad Request: {text}")
+
+
+class SourceAvailableTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_existing_source_is_checked_and_copy_removed(self):
+        bot = FakeBot(copies=[100, 101])
+        self.assertTrue(await source_available(bot, JOB))
+        self.assertEqual(bot.deleted, [100, 101])
+
+    async def test_deleted_source(self):
+        bot = FakeBot(error=bad_request("message to copy not found"))
+        self.assertFalse(await source_available(bot, JOB))
+
+    async def test_partly_deleted_album(self):
+        bot = FakeBot(copies=[100])
+        self.assertFalse(await source_available(bot, JOB))
+        self.assertEqual(bot.deleted, [100])
+
+    async def test_other_errors_are_raised(self):
+        bot = FakeBot(error=bad_request("chat not found"))
+        with self.assertRaises(TelegramBadRequest):
+            await source_available(bot, JOB)
+
+    async def test_content_without_source_needs_no_check(self):
+        bot = FakeBot(error=AssertionError("must not be called"))
+        self.assertTrue(await source_available(bot, {**JOB, "source_message_ids": None}))
+
+
+if __name__ == "__main__":
+    unittest.main()
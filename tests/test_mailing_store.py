@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from admin.services.mailing_store import JOB_SCHEDULED, MailingStore
+
+
+class MailingStoreTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = MailingStore(os.path.join(directory.name, "mailings.sqlite3"))
+        await self.store.open()
+        self.addAsyncCleanup(self.store.close)
+
+    async def test_fresh_database_has_every_job_column(self):
+        job_id = await self.store.create_job(
+            "Текст", None, None, admin_chat_id=-100, admin_user_id=1,
+            audience=[1, 2], source_chat_id=-100, source_message_ids=[5, 6],
+            entities=[{"type": "bold", "offset": 0, "length": 5}],
+            scheduled_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        )
+        await self.store.update_job(job_id, total=3, skipped=1, excluded=1)
+
+        job = await self.store.get_job(job_id)
+        self.assertEqual(job["status"], JOB_SCHEDULED)
+        self.assertEqual(job["audience"], [1, 2])
+        self.assertEqual(job["source_message_ids"], [5, 6])
+        self.assertEqual(job["excluded"], 1)
+
+        pages = [page async for page in self.store.iter_jobs()]
+        self.assertEqual([row["id"] for page in pages for row in page], [job_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
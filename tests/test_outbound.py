@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from utils.outbound import OutboundScheduler
+
+_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """Время, которое двигается только в asyncio.sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float, result=None):
+        self.now += max(delay, 0)
+        await _sleep(0)
+        return result
+
+
+class ChatRetryAfterTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("utils.outbound.asyncio.sleep", self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = OutboundScheduler(chat_rate=1, chat_burst=3, clock=self.clock)
+
+    async def send_times(self, chat_id: int, count: int) -> list[float]:
+        times = []
+        for _ in range(count):
+            await self.scheduler._wait_chat(chat_id)
+            times.append(self.clock.now)
+        return times
+
+    async def test_short_retry_after_is_not_covered_by_burst(self):
+        self.scheduler.retry_after(42, 1.5)
+        self.assertEqual(await self.send_times(42, 3), [1.5, 2.5, 3.5])
+
+    async def test_long_retry_after_waits_full_pause(self):
+        await self.send_times(42, 3)
+        self.scheduler.retry_after(42, 10)
+        self.assertEqual(await self.send_times(42, 2), [10.0, 11.0])
+
+    async def test_pause_does_not_affect_other_chats(self):
+        self.scheduler.retry_after(42, 10)
+        self.assertEqual(await self.send_times(43, 3), [0.0, 0.0, 0.0])
+
+    async def test_burst_without_retry_after(self):
+        self.assertEqual(await self.send_times(42, 4), [0.0, 0.0, 0.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import EditMessageText
+
+from tests.test_outbound import FakeClock
+from utils.progress import ProgressReporter
+
+
+class FakeBot:
+    """Бот, который отвечает флуд-контролем на первые `retry_after_times` правок."""
+
+    def __init__(self, retry_after_times: int = 0):
+        self.retry_after_times = retry_after_times
+        self.texts: list[str] = []
+
+    async def edit_message_text(self, text: str, chat_id: int, message_id: int, reply_markup=None):
+        if self.retry_after_times:
+            self.retry_after_times -= 1
+            method = EditMessageText(text=text, chat_id=chat_id, message_id=message_id)
+            raise TelegramRetryAfter(method=method, message="Too Many Requests", retry_after=5)
+        self.texts.append(text)
+
+
+class ProgressFinishTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("utils.progress.asyncio.sleep", self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_finish_retries_after_flood_control(self):
+        bot = FakeBot(retry_after_times=2)
+        progress = ProgressReporter(bot, chat_id=1, message_id=2, interval=3, clock=self.clock)
+        await progress.finish("Готово")
+        self.assertEqual(bot.texts, ["Готово"])
+        self.assertEqual(self.clock.now, 10.0)
+
+    async def test_finish_does_not_wait_interval(self):
+        bot = FakeBot()
+        progress = ProgressReporter(bot, chat_id=1, message_id=2, interval=3, clock=self.clock)
+        progress._latest = "50%"
+        await progress._flush()
+        await progress.finish("Готово")
+        self.assertEqual(bot.texts, ["50%", "Готово"])
+        self.assertEqual(self.clock.now, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
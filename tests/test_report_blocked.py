@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from admin.services import mailing
+from admin.services.broadcast import ERROR_BLOCKED
+from admin.services.mailing_store import MailingStore
+
+
+class ReportBlockedChatsTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = MailingStore(os.path.join(directory.name, "mailings.sqlite3"))
+        await self.store.open()
+        self.addAsyncCleanup(self.store.close)
+
+        job_id = await self.store.create_job("Текст", None, None, admin_chat_id=-100, admin_user_id=1)
+        await self.store.checkpoint(job_id, [], [(chat_id, ERROR_BLOCKED) for chat_id in range(1, 26)])
+
+        self.calls = []
+        self.failing = {3, 17}
+        for patcher in (
+            mock.patch.object(mailing, "mailing_store", self.store),
+            mock.patch.object(mailing, "deactivate_user", self.deactivate_user),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def deactivate_user(self, chat_id: int) -> bool:
+        self.calls.append(chat_id)
+        return chat_id not in self.failing
+
+    async def test_failed_entries_are_tried_once_per_run_and_dropped(self):
+        self.assertEqual(await mailing.report_blocked_chats(), 23)
+        self.assertEqual(sorted(self.calls), list(range(1, 26)))
+
+        for _ in range(mailing.REPORT_BLOCKED_MAX_ATTEMPTS + 2):
+            self.calls.clear()
+            await mailing.report_blocked_chats()
+            self.assertLessEqual(len(self.calls), 2)
+
+        self.assertEqual(self.calls, [])
+        # Из реестра получатели не пропадают - рассылки их по-прежнему пропускают
+        self.assertEqual(len(await self.store.blocked_chat_ids()), 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
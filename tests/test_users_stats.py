@@ -0,0 +1,64 @@
+import contextlib
+import unittest
+from unittest import mock
+
+from client.services import user
+from data.url import url_users
+
+
+class FakeResponse:
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self.data
+
+
+class CountUsersTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.requests = []
+        self.responses = {}
+        patcher = mock.patch.object(user.backend_client, "get", self.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user._unpaginated_endpoints.clear()
+        self.addCleanup(user._unpaginated_endpoints.clear)
+
+    @contextlib.asynccontextmanager
+    async def get(self, url, params=None):
+        self.requests.append((url, params))
+        yield FakeResponse(self.responses[url])
+
+    async def test_paginated_count(self):
+        self.responses[url_users] = {"count": 42, "results": [{"id": 1}]}
+        self.assertEqual(await user.count_users(), 42)
+
+    async def test_plain_list_is_not_counted_and_not_requested_again(self):
+        self.responses[url_users] = [{"id": i} for i in range(10)]
+        self.assertIsNone(await user.count_users())
+        self.assertIsNone(await user.count_users(is_active="true"))
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_active_equal_to_total_is_not_shown(self):
+        counts = {None: 10, "true": 10}
+
+        async def count_users(endpoint=url_users, **filters):
+            return counts[filters.get("is_active")]
+
+        with mock.patch.object(user.backend_client, "get_json", mock.AsyncMock(return_value=[])), \
+                mock.patch.object(user, "count_users", count_users):
+            stats = await user._count_users_stats()
+            self.assertEqual(stats["total"], 10)
+            self.assertIsNone(stats["active"])
+
+            counts["true"] = 7
+            self.assertEqual((await user._count_users_stats())["active"], 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
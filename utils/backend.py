@@ -0,0 +1,334 @@
+import asyncio
+import json
+import logging
+import re
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode, urlsplit
+
+import aiohttp
+
+from data.config import config_settings
+from utils.cache import MISSING, TTLCache
+from utils.resilience import CircuitBreaker, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class BackendClient:
+    """Долгоживущий HTTP-клиент для API бэкенда.
+
+    Держит одну `aiohttp.ClientSession` с ограниченным пулом keep-alive соединений
+    и DNS-кэшем, поэтому запросы к `base_url` не открывают новое TCP/TLS-соединение
+    на каждый вызов. Заголовок `X-Bot-Api-Key`, таймауты и сборка URL задаются здесь.
+    Ответы справочных GET-запросов можно кэшировать через `get_json(..., ttl=...)`;
+    одинаковые одновременные `get_json` объединяются в один запрос к бэкенду.
+    Все запросы проходят через политику повторов и автомат (circuit breaker) адреса.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        *,
+        timeout: float = 10,
+        limit: int = 100,
+        limit_per_host: int = 30,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+        cache_maxsize: int = 256,
+        retry_policy: RetryPolicy | None = None,
+        breaker_threshold: int = 5,
+        breaker_recovery: float = 30,
+    ):
+        """
+        Args:
+            base_url: Базовый адрес API (config_settings.base_url).
+            api_key: Значение заголовка X-Bot-Api-Key.
+            timeout: Общий таймаут запроса в секундах.
+            limit: Максимум одновременных соединений в пуле.
+            limit_per_host: Максимум соединений к одному хосту.
+            keepalive_timeout: Сколько секунд держать простаивающее соединение.
+            dns_cache_ttl: Время жизни DNS-кэша в секундах.
+            cache_maxsize: Максимум закэшированных ответов.
+            retry_policy: Политика повторов идемпотентных запросов.
+            breaker_threshold: Число ошибок подряд, после которого адрес временно отключается.
+            breaker_recovery: Через сколько секунд пробовать отключённый адрес снова.
+        """
+        self.base_url = base_url.rstrip("/")
+        self._api_key = api_key
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._session: aiohttp.ClientSession | None = None
+        self.cache = TTLCache(maxsize=cache_maxsize)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._background: set[asyncio.Task] = set()
+        self._generation = 0
+        self.coalesced = 0
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._breaker_threshold = breaker_threshold
+        self._breaker_recovery = breaker_recovery
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.retries = 0
+
+    async def start(self) -> None:
+        """Открывает сессию с пулом соединений (повторный вызов ничего не делает)."""
+        self._get_session()
+        logger.info(f"Backend client started for {self.base_url}")
+
+    async def close(self) -> None:
+        """Закрывает сессию и все соединения пула."""
+        for task in list(self._background):
+            task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info(
+                f"Backend client closed, cache stats: {self.cache.stats()}, "
+                f"coalesced requests: {self.coalesced}, resilience: {self.resilience_stats()}"
+            )
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self._dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout,
+                headers={"X-Bot-Api-Key": self._api_key},
+            )
+        return self._session
+
+    def url(self, endpoint: str, *parts) -> str:
+        """Собирает URL запроса.
+
+        Args:
+            endpoint: Адрес из data/url.py (например, url_users) или путь относительно base_url.
+            *parts: Дополнительные сегменты пути (id, действие и т.п.).
+
+        Returns:
+            str: Полный URL; если переданы сегменты, он заканчивается слэшем.
+
+        Example:
+            backend_client.url(url_loyalty, tg_id, "card-image") -> ".../loyalty-cards/<tg_id>/card-image/"
+        """
+        if endpoint.startswith(("http://", "https://")):
+            url = endpoint
+        else:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if parts:
+            url = url.rstrip("/") + "".join(f"/{part}" for part in parts) + "/"
+        return url
+
+    @staticmethod
+    def endpoint_key(url: str) -> str:
+        """Ключ автомата: путь без идентификаторов (`/users/123/` -> `/users/{id}/`)."""
+        parts = urlsplit(url)
+        path = re.sub(r"/[^/]*\d[^/]*(?=/|$)", "/{id}", parts.path)
+        return f"{parts.netloc}{path}"
+
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        key = self.endpoint_key(url)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, self._breaker_threshold, self._breaker_recovery)
+            self._breakers[key] = breaker
+        return breaker
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        """Выполняет запрос через общую сессию.
+
+        Используется так же, как `session.request`: `async with backend_client.get(url) as resp: ...`.
+        GET-запросы повторяются при ошибках соединения, таймаутах и 502/503/504;
+        после серии ошибок адрес отключается автоматом.
+
+        Raises:
+            CircuitOpenError: Если автомат адреса разомкнут (запрос не отправлялся).
+            aiohttp.ClientError, asyncio.TimeoutError: Если все попытки завершились ошибкой.
+        """
+        url = self.url(url)
+        breaker = self._breaker_for(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.before_request()
+            try:
+                resp = await self._get_session().request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                if not self.retry_policy.can_retry(method, attempt):
+                    raise
+                logger.warning(f"{method} {url} failed ({e}), retry {attempt}/{self.retry_policy.attempts - 1}")
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                if resp.status not in RetryPolicy.RETRY_STATUSES:
+                    breaker.record_success()
+                    break
+                breaker.record_failure()
+                if not self.retry_policy.can_retry(method, attempt):
+                    break
+                resp.release()
+                logger.warning(f"{method} {url} returned {resp.status}, retry {attempt}/{self.retry_policy.attempts - 1}")
+
+            self.retries += 1
+            await asyncio.sleep(self.retry_policy.delay(attempt))
+
+        try:
+            yield resp
+        finally:
+            resp.release()
+
+    def resilience_stats(self) -> dict:
+        """Состояние автоматов по адресам и число повторов - для логов и мониторинга."""
+        return {
+            "retries": self.retries,
+            "breakers": {key: breaker.stats() for key, breaker in self._breakers.items()},
+        }
+
+    def _cache_key(self, method: str, url: str, params: dict | None = None) -> str:
+        key = f"{method} {self.url(url)}"
+        if params:
+            key += "?" + urlencode(sorted((k, str(v)) for k, v in params.items()))
+        return key
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        params: dict | None = None,
+        ttl: float | None = None,
+        stale_ttl: float = 0,
+    ):
+        """GET-запрос с разбором JSON и необязательным кэшированием ответа.
+
+        Args:
+            url: Адрес или путь запроса.
+            params: Параметры строки запроса.
+            ttl: Сколько секунд хранить ответ в кэше; None или 0 - не кэшировать.
+            stale_ttl: Сколько секунд после истечения ttl ещё отдавать устаревший ответ
+                (stale-while-revalidate). Устаревшая копия возвращается сразу, а свежая
+                запрашивается в фоне; если бэкенд недоступен, копия отдаётся до конца этого срока.
+
+        Returns:
+            Разобранный JSON. Из кэша каждый раз возвращается новый объект,
+            поэтому вызывающий код может его изменять.
+
+        Raises:
+            aiohttp.ClientResponseError: Если бэкенд ответил статусом 4xx/5xx.
+            aiohttp.ClientError: При ошибке соединения.
+        """
+        key = self._cache_key("GET", url, params)
+        if ttl:
+            body, fresh = self.cache.get_stale(key, MISSING)
+            if body is not MISSING:
+                if not fresh:
+                    self._revalidate(key, url, params, ttl, stale_ttl)
+                return json.loads(body)
+
+        generation = self._generation
+        body = await self._fetch_shared(key, url, params)
+        if ttl and generation == self._generation:
+            self.cache.set(key, body, ttl, stale_ttl)
+        return json.loads(body)
+
+    def _revalidate(self, key: str, url: str, params: dict | None, ttl: float, stale_ttl: float) -> None:
+        """Запускает фоновое обновление устаревшей записи (не чаще одного на ключ)."""
+        if key in self._inflight:
+            return
+        generation = self._generation
+        fetch = self._start_fetch(key, url, params)
+
+        async def refresh():
+            try:
+                body = await fetch
+            except Exception as e:
+                logger.warning(f"Background refresh of {key} failed, serving stale copy: {e}")
+                return
+            if generation == self._generation:
+                self.cache.set(key, body, ttl, stale_ttl)
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _start_fetch(self, key: str, url: str, params: dict | None) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_body(url, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(key, t))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalesced request {key}")
+        return task
+
+    async def _fetch_shared(self, key: str, url: str, params: dict | None) -> str:
+        """Single-flight: одновременные запросы с одинаковым ключом ждут один и тот же запрос.
+
+        Запрос выполняется отдельной задачей, поэтому отмена одного из ожидающих
+        не прерывает его для остальных. Ошибка передаётся всем ожидающим.
+        """
+        return await asyncio.shield(self._start_fetch(key, url, params))
+
+    def _finish_inflight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Помечаем исключение как полученное, даже если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch_body(self, url: str, params: dict | None) -> str:
+        async with self.get(url, params=params) as resp:
+            resp.raise_for_status()
+            return await resp.text()
+
+    def invalidate(self, *endpoints: str) -> None:
+        """Сбрасывает закэшированные ответы по адресам (включая вложенные пути и параметры).
+
+        Вызывается после операций, изменяющих справочник, например
+        `backend_client.invalidate(url_category)` после создания категории.
+        """
+        # Ответы запросов, начатых до сброса, в кэш уже не попадут
+        self._generation += 1
+        for endpoint in endpoints:
+            removed = self.cache.invalidate(f"GET {self.url(endpoint)}")
+            logger.debug(f"Cache invalidated for {endpoint}: {removed} entries")
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+backend_client = BackendClient(
+    base_url=config_settings.base_url,
+    api_key=config_settings.BOT_API_KEY.get_secret_value(),
+    timeout=config_settings.BACKEND_TIMEOUT,
+    limit=config_settings.BACKEND_POOL_LIMIT,
+    limit_per_host=config_settings.BACKEND_POOL_LIMIT_PER_HOST,
+    cache_maxsize=config_settings.BACKEND_CACHE_MAXSIZE,
+    retry_policy=RetryPolicy(
+        attempts=config_settings.BACKEND_RETRY_ATTEMPTS,
+        base_delay=config_settings.BACKEND_RETRY_BASE_DELAY,
+        max_delay=config_settings.BACKEND_RETRY_MAX_DELAY,
+    ),
+    breaker_threshold=config_settings.BACKEND_BREAKER_THRESHOLD,
+    breaker_recovery=config_settings.BACKEND_BREAKER_RECOVERY,
+)
@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+MISSING = object()
+
+
+class TTLCache:
+    """Ограниченный по размеру LRU-кэш с временем жизни записей.
+
+    Используется для справочных данных бэкенда (подписки, категории, настройки
+    баллов), которые читаются на каждое нажатие кнопки, а меняются редко.
+    При переполнении вытесняется давно не использованная запись.
+
+    Запись может жить дольше своего ttl (параметр stale_ttl в set()): такая
+    устаревшая копия не возвращается из get(), но доступна через get_stale(),
+    чтобы отдать её пользователю, пока данные обновляются в фоне.
+    """
+
+    def __init__(self, maxsize: int = 256, default_ttl: float = 60, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize: Максимальное количество записей.
+            default_ttl: Время жизни записи в секундах, если ttl не передан в set().
+            clock: Источник монотонного времени (подменяется при отладке).
+        """
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, float, Any]] = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Возвращает значение по ключу или default, если записи нет или она устарела."""
+        value, fresh = self.get_stale(key, default, count=False)
+        if not fresh:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable, default: Any = None, count: bool = True) -> tuple[Any, bool]:
+        """Возвращает значение вместе с признаком свежести.
+
+        Returns:
+            tuple[Any, bool]: (значение, True) для свежей записи, (значение, False)
+            для устаревшей, но ещё хранимой, и (default, False), если записи нет.
+        """
+        entry = self._data.get(key)
+        now = self._clock()
+        if entry is None or entry[1] <= now:
+            if entry is not None:
+                del self._data[key]
+            if count:
+                self.misses += 1
+            return default, False
+        fresh_until, _, value = entry
+        self._data.move_to_end(key)
+        fresh = fresh_until > now
+        if count:
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return value, fresh
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, stale_ttl: float = 0) -> None:
+        """Сохраняет значение.
+
+        Args:
+            key: Ключ записи.
+            value: Значение.
+            ttl: Сколько секунд запись считается свежей (по умолчанию default_ttl).
+            stale_ttl: Сколько секунд после этого хранить устаревшую копию для get_stale().
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        now = self._clock()
+        self._data[key] = (now + ttl, now + ttl + stale_ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, prefix: str = "") -> int:
+        """Удаляет записи, строковый ключ которых начинается с prefix.
+
+        Args:
+            prefix: Префикс ключа; пустая строка очищает весь кэш.
+
+        Returns:
+            int: Количество удалённых записей.
+        """
+        keys = [key for key in self._data if str(key).startswith(prefix)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Удаляет записи, для которых predicate(key, value) истинно.
+
+        Returns:
+            int: Количество удалённых записей.
+        """
+        keys = [key for key, (_, _, value) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def discard(self, key: Hashable) -> bool:
+        """Удаляет запись по ключу.
+
+        Returns:
+            bool: True, если запись была.
+        """
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Счётчики попаданий/промахов для логов и мониторинга."""
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.stale_hits) / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,338 @@
+import asyncio
+import gzip
+import io
+import logging
+from io import BytesIO
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet необязателен: без pyarrow доступны xlsx и CSV
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# Ширина колонки ограничена: длинные значения (описания, адреса) переносятся
+MAX_COLUMN_WIDTH = 60
+
+HEADER_FONT = Font(bold=True)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+HEADER_FILL = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
+HEADER_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+
+def yes_no(series: pd.Series) -> pd.Series:
+    """Булева колонка -> "Да"/"Нет" (пустые значения - "Нет")."""
+    return pd.Series(
+        np.where(series.notna() & series.astype(bool), 'Да', 'Нет'),
+        index=series.index
+    )
+
+
+def format_datetime(series: pd.Series) -> pd.Series:
+    """ISO-дата со временем из API -> "ГГГГ-ММ-ДД ЧЧ:ММ:СС"; не строки становятся пустыми."""
+    if series.dtype != object:
+        return pd.Series(None, index=series.index, dtype=object)
+    return series.str.slice(0, 19).str.replace('T', ' ', regex=False)
+
+
+def non_empty_strings(series: pd.Series) -> pd.Series:
+    """Оставляет непустые строки, остальные значения становятся пустыми."""
+    if series.dtype != object:
+        return pd.Series(None, index=series.index, dtype=object)
+    return series.where(series.str.len() > 0)
+
+
+def join_names(series: pd.Series, key: str = 'name', sep: str = ", ") -> pd.Series:
+    """Список вложенных объектов в каждой строке -> их key через sep.
+
+    Все списки разворачиваются одним explode и собираются обратно группировкой
+    по индексу строки, без поиска строки для каждого объекта.
+
+    Args:
+        series: Колонка со списками словарей (например, категории резидента).
+        key: Поле вложенного объекта.
+        sep: Разделитель.
+
+    Returns:
+        pd.Series: Строки с тем же индексом; пустой список даёт пустую строку.
+    """
+    exploded = series.explode()
+    names = exploded.str.get(key).dropna().astype(str)
+    return names.groupby(level=0).agg(sep.join).reindex(series.index, fill_value="")
+
+
+def column_widths(frame: pd.DataFrame, scale: float = 1.0) -> list[float]:
+    """Считает ширину колонок по длине заголовка и значений.
+
+    Длины строк считаются векторно по колонке (Series.str.len), без обхода ячеек.
+
+    Args:
+        frame: Данные с итоговыми заголовками колонок.
+        scale: Множитель ширины.
+
+    Returns:
+        list[float]: Ширина каждой колонки, не больше MAX_COLUMN_WIDTH.
+    """
+    widths = []
+    for column in frame.columns:
+        values = frame[column].dropna()
+        longest = int(values.astype(str).str.len().max()) if len(values) else 0
+        widths.append(min((max(longest, len(str(column))) + 2) * scale, MAX_COLUMN_WIDTH))
+    return widths
+
+
+class TableExport:
+    """Основа потоковых выгрузок таблицы в файл.
+
+    Порции (DataFrame) дописываются по мере загрузки из API и сразу
+    сериализуются, вся таблица в памяти не собирается. Запись выполняется
+    в отдельном потоке (asyncio.to_thread) и не блокирует цикл событий; пока
+    пишется одна порция, можно загружать следующую.
+
+    Колонки определяются первой порцией; в следующих порциях лишние колонки
+    отбрасываются, а недостающие остаются пустыми.
+
+    Пример:
+        export = ExcelExport("Пользователи")
+        async for page in iter_user_pages():
+            await export.write(pd.DataFrame(page))
+        output = await export.close()
+    """
+
+    # Расширение файла выгрузки
+    extension = ""
+
+    def __init__(self, title: str):
+        """
+        Args:
+            title: Название таблицы (лист книги, строка в логах).
+        """
+        self.title = title
+        self.columns: Optional[list[str]] = None
+        self.rows = 0
+        self._lock = asyncio.Lock()
+
+    async def write(self, frame: pd.DataFrame) -> None:
+        """Дописывает строки в файл."""
+        if frame.empty:
+            return
+        # Порции пишутся строго по очереди, даже если write() вызвали без ожидания предыдущей
+        async with self._lock:
+            await asyncio.to_thread(self._write, frame)
+
+    def _write(self, frame: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = [str(column) for column in frame.columns]
+            self._start(frame)
+        else:
+            frame = frame.reindex(columns=self.columns)
+        self._append(frame)
+        self.rows += len(frame)
+
+    def _start(self, frame: pd.DataFrame) -> None:
+        """Вызывается перед записью первой порции (заголовок, схема)."""
+
+    def _append(self, frame: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> Optional[BytesIO]:
+        """Завершает файл.
+
+        Returns:
+            Optional[BytesIO]: Содержимое файла или None, если не было записано ни одной строки.
+        """
+        async with self._lock:
+            return await asyncio.to_thread(self._close)
+
+    def _close(self) -> Optional[BytesIO]:
+        if self.columns is None:
+            return None
+        output = self._finish()
+        output.seek(0)
+        logger.info(
+            f"{type(self).__name__} '{self.title}': {self.rows} rows, {output.getbuffer().nbytes} bytes"
+        )
+        return output
+
+    def _finish(self) -> BytesIO:
+        raise NotImplementedError
+
+
+class ExcelExport(TableExport):
+    """Потоковая выгрузка таблицы в xlsx.
+
+    Книга openpyxl открывается в режиме write_only: строки сразу сериализуются,
+    поэтому память не растёт с числом строк, а стили задаются только заголовку,
+    без обхода всех ячеек.
+
+    Ширина колонок в write_only задаётся до первой строки, поэтому она
+    считается по первой порции данных.
+    """
+
+    extension = ".xlsx"
+
+    def __init__(self, sheet_title: str, width_scale: float = 1.0, auto_filter: bool = False, wrap_text: bool = False):
+        """
+        Args:
+            sheet_title: Название листа.
+            width_scale: Множитель ширины колонок.
+            auto_filter: Включить автофильтр по заголовкам.
+            wrap_text: Переносить текст в колонках, ширина которых упёрлась в MAX_COLUMN_WIDTH.
+                Стиль задаётся только ячейкам этих колонок: стилизованная ячейка
+                пишется в несколько раз медленнее обычного значения.
+        """
+        super().__init__(sheet_title)
+        self.width_scale = width_scale
+        self.auto_filter = auto_filter
+        self.wrap_text = wrap_text
+        self._wrap_columns: list[int] = []
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet_title)
+        self._alignment = Alignment(vertical='center', wrap_text=True)
+
+    def _append(self, frame: pd.DataFrame) -> None:
+        # NaN и None превращаются в пустые ячейки, как в DataFrame.to_excel
+        values = frame.astype(object).to_numpy()
+        values[pd.isna(values)] = None
+        for row in values.tolist():
+            for index in self._wrap_columns:
+                row[index] = self._cell(row[index])
+            self._sheet.append(row)
+
+    def _cell(self, value) -> WriteOnlyCell:
+        cell = WriteOnlyCell(self._sheet, value)
+        cell.alignment = self._alignment
+        return cell
+
+    def _start(self, frame: pd.DataFrame) -> None:
+        for index, width in enumerate(column_widths(frame, self.width_scale)):
+            self._sheet.column_dimensions[get_column_letter(index + 1)].width = width
+            if self.wrap_text and width >= MAX_COLUMN_WIDTH:
+                self._wrap_columns.append(index)
+
+        header = []
+        for column in self.columns:
+            cell = WriteOnlyCell(self._sheet, column)
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGNMENT
+            cell.border = HEADER_BORDER
+            cell.fill = HEADER_FILL
+            header.append(cell)
+        self._sheet.append(header)
+
+    def _finish(self) -> BytesIO:
+        if self.auto_filter:
+            self._sheet.auto_filter.ref = f"A1:{get_column_letter(len(self.columns))}{self.rows + 1}"
+        output = BytesIO()
+        self._workbook.save(output)
+        return output
+
+
+class CsvExport(TableExport):
+    """Потоковая выгрузка в CSV, сжатый gzip (UTF-8, разделитель - запятая).
+
+    Каждая порция сразу проходит через DataFrame.to_csv в поток gzip, поэтому
+    в памяти лежит только сжатый результат.
+    """
+
+    extension = ".csv.gz"
+
+    def __init__(self, title: str, compresslevel: int = 6):
+        """
+        Args:
+            title: Название таблицы (для логов).
+            compresslevel: Степень сжатия gzip (1-9).
+        """
+        super().__init__(title)
+        self._output = BytesIO()
+        self._gzip = gzip.GzipFile(fileobj=self._output, mode='wb', compresslevel=compresslevel)
+        self._text = io.TextIOWrapper(self._gzip, encoding='utf-8', newline='')
+
+    def _append(self, frame: pd.DataFrame) -> None:
+        frame.to_csv(self._text, header=self.rows == 0, index=False)
+
+    def _finish(self) -> BytesIO:
+        # Закрывает gzip, но не BytesIO, переданный через fileobj
+        self._text.close()
+        return self._output
+
+
+class ParquetExport(TableExport):
+    """Потоковая выгрузка в Parquet (нужен pyarrow).
+
+    Каждая порция записывается отдельной группой строк. Схема берётся из
+    первой порции; текстовые колонки всегда пишутся строками, чтобы тип
+    колонки не зависел от того, какие значения попали в первую порцию.
+    """
+
+    extension = ".parquet"
+
+    def __init__(self, title: str, compression: str = 'zstd'):
+        """
+        Args:
+            title: Название таблицы (для логов).
+            compression: Кодек сжатия колонок.
+
+        Raises:
+            RuntimeError: Если pyarrow не установлен.
+        """
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow")
+        super().__init__(title)
+        self.compression = compression
+        self._output = BytesIO()
+        self._schema: Optional["pa.Schema"] = None
+        self._writer: Optional["pq.ParquetWriter"] = None
+
+    @staticmethod
+    def _strings(frame: pd.DataFrame) -> pd.DataFrame:
+        # Колонки object могут содержать числа вперемешку со строками
+        frame = frame.copy()
+        for column in frame.columns[frame.dtypes == object]:
+            values = frame[column]
+            frame[column] = values.where(values.isna(), values.astype(str))
+        return frame
+
+    def _start(self, frame: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(self._strings(frame), preserve_index=False)
+        # Колонка, пустая в первой порции, получает тип null - такие пишем строками
+        self._schema = pa.schema([
+            pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+            for field in table.schema
+        ])
+        self._writer = pq.ParquetWriter(self._output, self._schema, compression=self.compression)
+
+    def _append(self, frame: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(self._strings(frame), schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def _finish(self) -> BytesIO:
+        self._writer.close()
+        return self._output
+
+
+# Форматы выгрузки: ключ -> (класс, подпись кнопки)
+EXPORT_FORMATS = {
+    'xlsx': (ExcelExport, "Excel (.xlsx)"),
+    'csv': (CsvExport, "CSV (.csv.gz)"),
+    'parquet': (ParquetExport, "Parquet"),
+}
+
+
+def available_formats() -> list[str]:
+    """Форматы, доступные в текущем окружении (Parquet - только с pyarrow)."""
+    return [name for name in EXPORT_FORMATS if name != 'parquet' or pa is not None]
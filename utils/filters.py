@@ -1,6 +1,6 @@
 import os
 from aiogram.filters import BaseFilter
-from aiogram.types import Message
+from aiogram.types import CallbackQuery, Message
 from typing import Union
 from aiogram import Bot
 from dotenv import load_dotenv
@@ -23,8 +23,9 @@ class ChatTypeFilter(BaseFilter):
         """
         self.chat_types = [chat_types] if isinstance(chat_types, str) else chat_types
 
-    async def __call__(self, message: Message) -> bool:
-        return message.chat.type in self.chat_types
+    async def __call__(self, event: Union[Message, CallbackQuery]) -> bool:
+        chat = _event_chat(event)
+        return chat is not None and chat.type in self.chat_types
 
 
 class IsGroupAdmin(BaseFilter):
@@ -32,18 +33,33 @@ class IsGroupAdmin(BaseFilter):
         self.admin_chat_ids = admin_chat_ids
         self.show_message = show_message
 
-    async def __call__(self, message: Message, bot: Bot) -> bool:
-        if message.chat.type == "private":
+    async def __call__(self, event: Union[Message, CallbackQuery], bot: Bot) -> bool:
+        chat = _event_chat(event)
+        if chat is not None and chat.type == "private":
             try:
                 for chat_id in self.admin_chat_ids:
-                    member = await bot.get_chat_member(chat_id, message.from_user.id)
+                    member = await bot.get_chat_member(chat_id, event.from_user.id)
                     if member.status in ["creator", "administrator"]:
                         return True
                 if self.show_message:
-                    await message.answer("🚫 Доступ только для админов!")
+                    await _answer(event, "🚫 Доступ только для админов!")
                 return False
             except Exception as e:
                 if self.show_message:
-                    await message.answer("⚠️ Ошибка проверки прав доступа")
+                    await _answer(event, "⚠️ Ошибка проверки прав доступа")
                 return False
         return False
+
+
+def _event_chat(event: Union[Message, CallbackQuery]):
+    """Чат сообщения или сообщения с кнопкой; None, если сообщение недоступно."""
+    if isinstance(event, CallbackQuery):
+        return event.message.chat if event.message else None
+    return event.chat
+
+
+async def _answer(event: Union[Message, CallbackQuery], text: str) -> None:
+    if isinstance(event, CallbackQuery):
+        await event.answer(text, show_alert=True)
+    else:
+        await event.answer(text)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from data.config import config_settings
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Фоновая проверка доступности бэкенда.
+
+    Раз в `interval` секунд открывает TCP-соединение с хостом бэкенда (без
+    блокировки цикла событий) и запоминает результат. Обработчики читают
+    закэшированный статус мгновенно, не дожидаясь сети. Пока бэкенд недоступен,
+    проверка повторяется втрое чаще, чтобы быстрее заметить восстановление.
+    Тот же статус отдаётся по HTTP на локальном /healthz.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        interval: float = 15,
+        timeout: float = 3,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            url: Адрес бэкенда; проверяется хост и порт (по умолчанию по схеме).
+            interval: Интервал проверок в секундах.
+            timeout: Таймаут подключения в секундах.
+            clock: Источник времени (для отметки checked_at).
+        """
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.interval = interval
+        self.timeout = timeout
+        self._clock = clock
+        self.started_at = clock()
+        # None - проверок ещё не было
+        self.healthy: Optional[bool] = None
+        self.latency: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def available(self) -> bool:
+        """Можно ли обращаться к бэкенду; до первой проверки считается доступным."""
+        return self.healthy is not False
+
+    async def check(self) -> bool:
+        """Проверяет бэкенд один раз и обновляет статус.
+
+        Returns:
+            bool: Доступен ли бэкенд.
+        """
+        started = time.monotonic()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            if self.healthy is not False:
+                logger.error(f"Backend {self.host}:{self.port} is unavailable: {e!r}")
+            self.healthy = False
+            self.latency = None
+            self.error = repr(e)
+            self.failures += 1
+        else:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            if self.healthy is False:
+                logger.info(f"Backend {self.host}:{self.port} is available again after {self.failures} failed checks")
+            self.healthy = True
+            self.latency = time.monotonic() - started
+            self.error = None
+            self.failures = 0
+        self.checked_at = self._clock()
+        return self.healthy
+
+    def status(self) -> dict:
+        """Текущий статус для /healthz и логов."""
+        return {
+            "status": {None: "unknown", True: "ok", False: "unavailable"}[self.healthy],
+            "backend": f"{self.host}:{self.port}",
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error": self.error,
+            "failures": self.failures,
+            "checked_at": self.checked_at,
+            "uptime": round(self._clock() - self.started_at),
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Запускает периодическую проверку и, если задан port, HTTP-эндпоинт /healthz.
+
+        Если порт занят (например, вторым экземпляром бота), эндпоинт не поднимается,
+        а ошибка только логируется: проверка бэкенда и сам бот продолжают работать.
+
+        Args:
+            host: Адрес, на котором слушает /healthz.
+            port: Порт /healthz; 0 - эндпоинт не поднимается.
+        """
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="health-monitor")
+        if port:
+            app = web.Application()
+            app.router.add_get("/healthz", self._handle_healthz)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            try:
+                await web.TCPSite(self._runner, host, port).start()
+            except OSError as e:
+                logger.error(f"Health endpoint is disabled, cannot listen on {host}:{port}: {e}")
+                await self._runner.cleanup()
+                self._runner = None
+                return
+            logger.info(f"Health endpoint listening on http://{host}:{port}/healthz")
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval if self.healthy else self.interval / 3)
+
+    async def _handle_healthz(self, request: web.Request) -> web.Response:
+        return web.json_response(self.status(), status=503 if self.healthy is False else 200)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+health_monitor = HealthMonitor(
+    config_settings.base_url,
+    interval=config_settings.HEALTH_CHECK_INTERVAL,
+    timeout=config_settings.HEALTH_CHECK_TIMEOUT,
+)
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from data.config import config_settings
+from utils.cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Значение в кэше для ответа "не найдено"
+NOT_FOUND = object()
+
+
+class IdentityCache:
+    """Кэш соответствий идентификаторов: tg_id -> user_id, ID и номер карты,
+    user_id -> resident_id, телефон и номер карты -> пользователь.
+
+    Соответствия почти не меняются, поэтому хранятся долго (ttl). Ответ
+    "не найдено" тоже кэшируется, но коротко (missing_ttl): повторный ввод
+    того же номера кассиром не идёт в API, а новый пользователь или карта
+    находятся быстро. Ошибки API не кэшируются. Одновременные запросы одного
+    ключа объединяются в один запрос.
+
+    После регистрации пользователя или изменения его данных (телефон, карта)
+    вызывается invalidate_user(tg_id).
+    """
+
+    def __init__(self, ttl: float = 86400, missing_ttl: float = 30, maxsize: int = 10000):
+        """
+        Args:
+            ttl: Время жизни найденного соответствия в секундах.
+            missing_ttl: Время жизни ответа "не найдено" в секундах.
+            maxsize: Максимальное количество записей.
+        """
+        self.missing_ttl = missing_ttl
+        self._cache = TTLCache(maxsize=maxsize, default_ttl=ttl)
+        self._inflight: dict[tuple[str, Hashable], asyncio.Task] = {}
+        # Растёт при каждом сбросе: загрузки, начатые раньше, не пишут результат в кэш
+        self._generation = 0
+
+    async def get(
+        self,
+        kind: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        tg_id: Optional[Callable[[Any], Optional[int]]] = None,
+    ) -> Any:
+        """Возвращает соответствие из кэша или загружает его.
+
+        Args:
+            kind: Вид соответствия (user_id, card_id, phone, ...).
+            key: Исходный идентификатор.
+            loader: Загружает значение из API; None - "не найдено",
+                исключение - ошибка, которая не кэшируется.
+            tg_id: Извлекает tg_id из найденного значения, чтобы запись сбрасывалась
+                вместе с данными этого пользователя (для поиска по телефону и карте).
+                По умолчанию tg_id считается сам key.
+
+        Returns:
+            Any: Значение или None, если не найдено.
+        """
+        cache_key = (kind, key)
+        entry = self._cache.get(cache_key, MISSING)
+        if entry is not MISSING:
+            value = entry[1]
+            return None if value is NOT_FOUND else value
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._load(cache_key, loader, tg_id))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda t: self._finish_inflight(cache_key, t))
+        # Отмена одного из ожидающих не прерывает загрузку для остальных
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        cache_key: tuple[str, Hashable],
+        loader: Callable[[], Awaitable[Any]],
+        tg_id: Optional[Callable[[Any], Optional[int]]],
+    ) -> Any:
+        generation = self._generation
+        value = await loader()
+        if generation != self._generation:
+            return value
+        # Запись хранится вместе с tg_id владельца: по нему её находит invalidate_user,
+        # а вытесненные и устаревшие записи уходят из кэша без дополнительных индексов
+        if value is None:
+            self._cache.set(cache_key, (None, NOT_FOUND), ttl=self.missing_ttl)
+            return None
+
+        owner = tg_id(value) if tg_id else cache_key[1]
+        self._cache.set(cache_key, (owner, value))
+        return value
+
+    def _finish_inflight(self, cache_key: tuple[str, Hashable], task: asyncio.Task) -> None:
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # Помечаем исключение как полученное, даже если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate_user(self, tg_id: int) -> None:
+        """Сбрасывает соответствия пользователя и все ответы "не найдено".
+
+        Вызывается после регистрации пользователя и изменения его данных: новый
+        телефон или выпущенная карта должны находиться сразу, а не через missing_ttl.
+        Просматривает все записи кэша (не больше maxsize), поэтому дополнительных
+        индексов по tg_id не нужно.
+        """
+        removed = self._cache.invalidate_where(
+            lambda cache_key, entry: entry[1] is NOT_FOUND or entry[0] == tg_id
+        )
+        # Загрузки, начатые до изменения, могли получить старые данные
+        self._generation += 1
+        self._inflight.clear()
+        logger.debug(f"Identity cache invalidated for tg_id={tg_id}: {removed} entries")
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+identity_cache = IdentityCache(
+    ttl=config_settings.CACHE_TTL_IDENTITY,
+    missing_ttl=config_settings.CACHE_TTL_IDENTITY_MISSING,
+    maxsize=config_settings.IDENTITY_CACHE_MAXSIZE,
+)
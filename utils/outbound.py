@@ -0,0 +1,252 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from data.config import config_settings
+
+logger = logging.getLogger(__name__)
+
+# Классы приоритета исходящих сообщений: меньше - важнее
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ADMIN = 1
+PRIORITY_BULK = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_ADMIN: "admin",
+    PRIORITY_BULK: "bulk",
+}
+
+# Методы Bot API, которые расходуют лимит сообщений
+THROTTLED_PREFIXES = ("send", "copy", "forward", "edit")
+UNTHROTTLED_METHODS = frozenset({"sendChatAction"})
+
+# Сколько записей о чатах держать, прежде чем удалять устаревшие
+CHAT_SLOTS_CLEANUP = 10_000
+
+_priority: ContextVar[Optional[int]] = ContextVar("outbound_priority", default=None)
+
+
+@contextmanager
+def outbound_priority(priority: int):
+    """Задаёт приоритет исходящих запросов внутри блока.
+
+    Пример:
+        with outbound_priority(PRIORITY_ADMIN):
+            await bot.send_message(...)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class OutboundScheduler:
+    """Общая очередь исходящих сообщений Telegram с классами приоритета.
+
+    Следит за тремя лимитами Telegram:
+    - общий лимит бота (`rate` сообщений в секунду) - токены выдаются строго
+      по приоритету, поэтому рассылка не задерживает ответ пользователю;
+    - личный чат - `chat_rate` сообщений в секунду с небольшим запасом `chat_burst`;
+    - группа - `group_per_minute` сообщений в минуту.
+    """
+
+    def __init__(
+        self,
+        rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: int = 3,
+        group_per_minute: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate: Общий лимит сообщений в секунду на бота.
+            chat_rate: Лимит сообщений в секунду в один личный чат.
+            chat_burst: Сколько сообщений подряд можно отправить в личный чат без ожидания.
+            group_per_minute: Лимит сообщений в минуту в одну группу.
+            clock: Источник монотонного времени.
+        """
+        self.rate = rate
+        self.chat_interval = 1 / chat_rate
+        self.chat_burst = chat_burst
+        self.group_interval = 60 / group_per_minute
+        self.group_burst = group_per_minute
+        self._clock = clock
+        self._tokens = float(rate)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._pump: Optional[asyncio.Task] = None
+        # chat_id -> теоретическое время следующей отправки (GCRA)
+        self._chat_slots: dict[int | str, float] = {}
+        # chat_id -> до какого времени Telegram запретил отправки в чат (TelegramRetryAfter)
+        self._chat_paused_until: dict[int | str, float] = {}
+        self._waited = {priority: [0, 0.0] for priority in PRIORITY_NAMES}
+
+    async def acquire(self, chat_id: int | str | None, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Ждёт, пока можно отправить сообщение в чат chat_id.
+
+        Сначала выдерживается лимит чата, затем запрос встаёт в общую очередь:
+        из неё первыми выходят запросы с более высоким приоритетом.
+        """
+        started = self._clock()
+        if chat_id is not None:
+            await self._wait_chat(chat_id)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._run_pump())
+        await future
+
+        waited = self._waited[priority]
+        waited[0] += 1
+        waited[1] += self._clock() - started
+
+    def _chat_limits(self, chat_id: int | str) -> tuple[float, int]:
+        """Интервал между отправками и запас подряд идущих отправок для чата."""
+        if isinstance(chat_id, int) and chat_id > 0:
+            return self.chat_interval, self.chat_burst
+        return self.group_interval, self.group_burst
+
+    async def _wait_chat_pause(self, chat_id: int | str) -> None:
+        """Выдерживает паузу после TelegramRetryAfter целиком, без запаса burst."""
+        while chat_id in self._chat_paused_until:
+            paused = self._chat_paused_until[chat_id] - self._clock()
+            if paused <= 0:
+                del self._chat_paused_until[chat_id]
+                break
+            await asyncio.sleep(paused)
+
+    async def _wait_chat(self, chat_id: int | str) -> None:
+        interval, burst = self._chat_limits(chat_id)
+        await self._wait_chat_pause(chat_id)
+
+        now = self._clock()
+        slot = max(self._chat_slots.get(chat_id, now), now)
+        self._chat_slots[chat_id] = slot + interval
+        if len(self._chat_slots) > CHAT_SLOTS_CLEANUP:
+            self._chat_slots = {key: value for key, value in self._chat_slots.items() if value > now}
+            self._chat_paused_until = {
+                key: value for key, value in self._chat_paused_until.items() if value > now
+            }
+
+        delay = slot - now - (burst - 1) * interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+            # Пока ждали свою очередь, Telegram мог приостановить отправки в чат
+            await self._wait_chat_pause(chat_id)
+
+    async def _run_pump(self) -> None:
+        while self._waiters:
+            now = self._clock()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+
+    def retry_after(self, chat_id: int | str | None, seconds: float) -> None:
+        """Учитывает TelegramRetryAfter: откладывает отправки в этот чат,
+        а если чат неизвестен - все отправки бота.
+
+        Отправки в чат возобновляются не раньше, чем через seconds, и после паузы
+        идут с интервалом лимита чата, без накопленного запаса burst.
+        """
+        until = self._clock() + seconds
+        if chat_id is None:
+            self._paused_until = max(self._paused_until, until)
+            return
+
+        interval, burst = self._chat_limits(chat_id)
+        self._chat_paused_until[chat_id] = max(self._chat_paused_until.get(chat_id, 0), until)
+        # Первая отправка после паузы - в until, следующие - через interval
+        self._chat_slots[chat_id] = max(self._chat_slots.get(chat_id, 0), until + (burst - 1) * interval)
+
+    def stats(self) -> dict:
+        """Количество отправок и среднее ожидание в очереди по классам приоритета."""
+        return {
+            PRIORITY_NAMES[priority]: {
+                "sent": count,
+                "avg_wait": round(total / count, 3) if count else 0.0,
+            }
+            for priority, (count, total) in self._waited.items()
+        }
+
+
+class OutboundMiddleware(BaseRequestMiddleware):
+    """Пропускает исходящие сообщения бота через OutboundScheduler.
+
+    Приоритет запроса: значение из outbound_priority(), иначе PRIORITY_ADMIN для
+    служебных чатов (admin_chats), иначе default_priority.
+    """
+
+    def __init__(
+        self,
+        scheduler: OutboundScheduler,
+        default_priority: int = PRIORITY_INTERACTIVE,
+        admin_chats: Iterable[int] = (),
+    ):
+        self.scheduler = scheduler
+        self.default_priority = default_priority
+        self.admin_chats = frozenset(admin_chats)
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        api_method = method.__api_method__
+        if not api_method.startswith(THROTTLED_PREFIXES) or api_method in UNTHROTTLED_METHODS:
+            return await make_request(bot, method)
+
+        chat_id = getattr(method, "chat_id", None)
+        priority = _priority.get()
+        if priority is None:
+            priority = PRIORITY_ADMIN if chat_id in self.admin_chats else self.default_priority
+
+        await self.scheduler.acquire(chat_id, priority)
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as e:
+            self.scheduler.retry_after(chat_id, e.retry_after)
+            raise
+
+
+outbound_scheduler = OutboundScheduler(
+    rate=config_settings.OUTBOUND_RATE_LIMIT,
+    chat_rate=config_settings.OUTBOUND_CHAT_RATE,
+    chat_burst=config_settings.OUTBOUND_CHAT_BURST,
+    group_per_minute=config_settings.OUTBOUND_GROUP_PER_MINUTE,
+)
+
+
+def setup_outbound(bot: Bot, default_priority: int = PRIORITY_INTERACTIVE) -> None:
+    """Подключает общую очередь исходящих сообщений к экземпляру бота."""
+    bot.session.middleware(OutboundMiddleware(
+        outbound_scheduler,
+        default_priority=default_priority,
+        admin_chats=(config_settings.ADMIN_CHAT_ID, config_settings.RESIDENT_ADMIN_CHAT_ID),
+    ))
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup
+
+from data.config import config_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Сообщение с прогрессом длительной операции (рассылка, выгрузка отчёта).
+
+    update() можно вызывать сколько угодно часто: изменения объединяются, и
+    сообщение редактируется не чаще раза в `interval` секунд, причём всегда
+    показывается последний переданный текст. Если текст не изменился, запрос
+    к Telegram не отправляется. finish() сразу показывает итоговое состояние,
+    а при флуд-контроле дожидается retry_after и повторяет правку.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        chat_id: int,
+        message_id: Optional[int],
+        interval: Optional[float] = None,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            bot: Экземпляр бота.
+            chat_id: Чат с сообщением прогресса.
+            message_id: ID сообщения прогресса; None - прогресс не показывается.
+            interval: Минимальный интервал между правками в секундах
+                (по умолчанию config_settings.PROGRESS_UPDATE_INTERVAL).
+            reply_markup: Клавиатура под сообщением прогресса (например, кнопки управления).
+            clock: Источник монотонного времени.
+        """
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.interval = interval if interval is not None else config_settings.PROGRESS_UPDATE_INTERVAL
+        self.reply_markup = reply_markup
+        self._clock = clock
+        self._latest: Optional[str] = None
+        self._shown: Optional[str] = None
+        self._next_edit_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.edits = 0
+
+    def update(self, text: str) -> None:
+        """Запоминает новый текст прогресса и планирует правку сообщения."""
+        self._latest = text
+        if self.message_id is None or text == self._shown:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later())
+
+    async def finish(self, text: Optional[str] = None, reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+        """Показывает итоговое состояние без ожидания интервала.
+
+        Args:
+            text: Итоговый текст; по умолчанию - последний переданный в update().
+            reply_markup: Клавиатура итогового сообщения; по умолчанию клавиатура убирается.
+        """
+        self.reply_markup = reply_markup
+        if text is not None:
+            self._latest = text
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        # Итог показывается без ожидания интервала; после TelegramRetryAfter
+        # _flush_later выждет паузу и повторит правку, пока итог не будет показан
+        self._next_edit_at = 0.0
+        await self._flush_later()
+
+    def cancel(self) -> None:
+        """Отменяет запланированную правку (например, при остановке бота)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _flush_later(self) -> None:
+        while self._latest != self._shown:
+            delay = self._next_edit_at - self._clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if not await self._flush():
+                return
+
+    async def _flush(self) -> bool:
+        """Редактирует сообщение последним текстом.
+
+        Returns:
+            bool: False, если правку стоит прекратить (сообщение недоступно).
+        """
+        text = self._latest
+        if self.message_id is None or text is None or text == self._shown:
+            return True
+        self._next_edit_at = self._clock() + self.interval
+        try:
+            await self.bot.edit_message_text(text=text, chat_id=self.chat_id, message_id=self.message_id,
+                                             reply_markup=self.reply_markup)
+        except TelegramRetryAfter as e:
+            self._next_edit_at = self._clock() + e.retry_after
+            return True
+        except TelegramBadRequest as e:
+            if "message is not modified" in e.message:
+                self._shown = text
+                return True
+            logger.warning(f"Не удалось обновить прогресс в чате {self.chat_id}: {e.message}")
+            return False
+        except Exception as e:
+            logger.warning(f"Не удалось обновить прогресс в чате {self.chat_id}: {e}")
+            return False
+        self._shown = text
+        self.edits += 1
+        return True
@@ -0,0 +1,133 @@
+import logging
+import random
+import time
+from typing import Callable
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """Запрос не отправлен: автомат для этого адреса разомкнут.
+
+    Наследуется от `aiohttp.ClientConnectionError`, поэтому существующие
+    обработчики `except aiohttp.ClientError` обрабатывают её как недоступность бэкенда.
+    """
+
+    def __init__(self, endpoint: str, retry_after: float):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {endpoint}, retry after {retry_after:.1f}s")
+
+
+class RetryPolicy:
+    """Повторы идемпотентных запросов с экспоненциальной задержкой и джиттером.
+
+    Повторяются только безопасные методы (GET/HEAD/OPTIONS) при ошибках
+    соединения, таймаутах и ответах 502/503/504.
+    """
+
+    RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+    RETRY_STATUSES = frozenset({502, 503, 504})
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0):
+        """
+        Args:
+            attempts: Общее число попыток, включая первую.
+            base_delay: Базовая задержка перед повтором в секундах.
+            max_delay: Верхняя граница задержки в секундах.
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """Можно ли повторить запрос после попытки с номером attempt (с единицы)."""
+        return method.upper() in self.RETRY_METHODS and attempt < self.attempts
+
+    def delay(self, attempt: int) -> float:
+        """Задержка перед следующей попыткой ("full jitter")."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Автомат для одного адреса бэкенда.
+
+    closed - запросы идут как обычно; после `failure_threshold` ошибок подряд
+    переходит в open и сразу отклоняет запросы `recovery_timeout` секунд.
+    Затем half_open - пропускается один пробный запрос: успех замыкает автомат,
+    ошибка снова размыкает.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_request(self) -> None:
+        """Проверяет, можно ли отправить запрос.
+
+        Raises:
+            CircuitOpenError: Если автомат разомкнут или пробный запрос уже выполняется.
+        """
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.recovery_timeout - self._clock()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.endpoint, remaining)
+            self._set_state(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.endpoint, 0)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self._probe_in_flight = False
+        self.failures = 0
+        if self.state != self.CLOSED:
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self._opened_at = self._clock()
+            self.times_opened += 1
+            self._set_state(self.OPEN)
+
+    def release(self) -> None:
+        """Снимает признак пробного запроса, если он завершился без результата (например, отменён)."""
+        self._probe_in_flight = False
+
+    def _set_state(self, state: str) -> None:
+        log = logger.info if state == self.CLOSED else logger.warning
+        log(f"Circuit breaker {self.endpoint}: {self.state} -> {state} (failures={self.failures})")
+        self.state = state
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }